@@ -14,6 +14,7 @@ import os
 from datetime import datetime, timezone
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
+from observability.timing import timed
 
 
 def create_intake_agent(model: str = "gemini-2.0-flash-lite") -> LlmAgent:
@@ -27,6 +28,7 @@ def create_intake_agent(model: str = "gemini-2.0-flash-lite") -> LlmAgent:
         LlmAgent configured as IntakeAgent
     """
     
+    @timed("tool.validate_document")
     def validate_document(document_path: str) -> dict:
         """
         Validate document and extract metadata.
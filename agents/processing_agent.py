@@ -8,31 +8,410 @@ This agent orchestrates the complete document processing pipeline:
 4. Post-vendor security verification
 5. Final result compilation
 
+The pipeline order is fixed, so it is orchestrated in code by default: the
+stages run directly and hand their outputs to each other through session
+state. Document texts stay in the artifact store and only references to
+them are kept in state. No model call is made on the ministry side - the only
+LLM involved is the vendor's translation model behind the A2A boundary. The
+original instruction-driven LlmAgent is still available with
+orchestration="llm".
+
 This agent demonstrates the A2A boundary between internal government systems
 and external vendor services.
 """
 
-from google.adk.agents import LlmAgent
+import os
+import re
+import time
+from typing import AsyncGenerator, Dict, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.models.google_llm import Gemini
+from google.genai import types
+
 from tools.ocr_tool import ocr_tool
+from tools.artifact_store import ArtifactStore, get_artifact_store
+from observability.timing import record, timed
+from tools.circuit_breaker import CircuitBreaker, get_circuit_breaker
 from security.policy import security_filter
+from pipeline.stages import (
+    StageError,
+    vendor_unavailable_result,
+    extract_text,
+    load_text,
+    pre_filter,
+    post_verify,
+    store_text_field,
+    compile_result,
+)
+from pipeline.checkpoint import CheckpointStore, derive_document_id
+
+# Prompt fields the pipeline understands, e.g. "Document type: birth_certificate"
+_PROMPT_FIELDS = {
+    "document_type": r"document\s+type\s*:\s*([A-Za-z_]+)",
+    "target_language": r"target\s+language\s*:\s*([A-Za-z]+)",
+}
+
+# Language names accepted in prompts, mapped to ISO 639-1 codes
+_LANGUAGE_CODES = {
+    "english": "en",
+    "spanish": "es",
+    "polish": "pl",
+    "hebrew": "he",
+    "ukrainian": "uk",
+    "russian": "ru",
+    "french": "fr",
+    "german": "de",
+    "italian": "it",
+}
+
+
+def _content_text(content: Optional[types.Content]) -> str:
+    """Join the text parts of a Content object."""
+    if not content or not content.parts:
+        return ""
+    return "\n".join(part.text for part in content.parts if part.text)
+
+
+def _find_document_path(prompt: str) -> Optional[str]:
+    """Return the first token in the prompt that is an existing file path."""
+    for token in prompt.split():
+        candidate = token.strip("\"'`,;:()[]")
+        if candidate.endswith("."):
+            candidate = candidate[:-1]
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _read_prompt_field(prompt: str, field: str) -> Optional[str]:
+    """Read a "Field: value" line from the prompt."""
+    match = re.search(_PROMPT_FIELDS[field], prompt, re.IGNORECASE)
+    if not match:
+        return None
+    value = match.group(1).strip()
+    if field == "target_language":
+        return _LANGUAGE_CODES.get(value.lower(), value.lower())
+    return value
+
+
+class ProcessingPipelineAgent(BaseAgent):
+    """
+    Code-orchestrated ProcessingAgent.
+
+    Runs the five pipeline stages in a fixed order and passes artifact
+    references between them through session state. The vendor sub-agent is
+    invoked directly with the masked text, so the document never enters a
+    ministry-side model context.
+
+    Inputs are read from session state ("document_path", "document_id",
+    "document_type", "target_language") and fall back to the user prompt.
+
+    With a checkpoint store, each stage result is persisted per document ID;
+    with resume=True, completed stages are skipped (e.g., after a vendor
+    outage only the vendor call and later stages run again).
+
+    With a circuit breaker, the vendor stage fails fast while the breaker is
+    open: the document is parked with status "vendor_unavailable" instead of
+    waiting for the vendor call to time out.
+    """
+
+    vendor_agent: BaseAgent
+    circuit_breaker: Optional[CircuitBreaker] = None
+    artifact_store: Optional[ArtifactStore] = None
+    checkpoint_store: Optional[CheckpointStore] = None
+    resume: bool = False
+    default_document_type: str = "general"
+    default_target_language: str = "en"
+
+    def __init__(self, vendor_agent: BaseAgent, **kwargs):
+        super().__init__(
+            vendor_agent=vendor_agent,
+            sub_agents=[vendor_agent],
+            **kwargs
+        )
+
+    def _status_event(
+        self,
+        ctx: InvocationContext,
+        text: str,
+        state_delta: Optional[dict] = None
+    ) -> Event:
+        """Build an audit-trail event, optionally carrying a state update."""
+        return Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta=state_delta or {})
+        )
+
+    def _resume(
+        self,
+        document_id: Optional[str],
+        stage: str,
+        store: ArtifactStore,
+        options: Dict[str, str]
+    ) -> Optional[dict]:
+        """Return a checkpointed stage result when resuming, else None."""
+        if not (self.checkpoint_store and self.resume):
+            return None
+        return self.checkpoint_store.get_stage(document_id, stage, store, options)
+
+    def _checkpoint(
+        self,
+        document_id: Optional[str],
+        stage: str,
+        result: dict,
+        store: ArtifactStore,
+        options: Dict[str, str]
+    ) -> None:
+        """Persist a stage result if checkpointing is enabled."""
+        if self.checkpoint_store:
+            self.checkpoint_store.save_stage(document_id, stage, result, store, options)
+
+    async def _call_vendor(
+        self,
+        ctx: InvocationContext,
+        masked_text: str,
+        source_language: str,
+        target_language: str,
+        document_type: str
+    ) -> AsyncGenerator[Event, None]:
+        """Send the masked text to the vendor sub-agent and relay its events."""
+        request = (
+            f"Translate this {document_type} from {source_language} "
+            f"to {target_language}. Keep masked PII patterns unchanged.\n\n"
+            f"{masked_text}"
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="user", parts=[types.Part(text=request)])
+        )
+        async for event in self.vendor_agent.run_async(ctx):
+            yield event
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        store = self.artifact_store or get_artifact_store()
+        prompt = _content_text(ctx.user_content)
+
+        document_path = state.get("document_path") or _find_document_path(prompt)
+        document_type = (
+            state.get("document_type")
+            or _read_prompt_field(prompt, "document_type")
+            or self.default_document_type
+        )
+        target_language = (
+            state.get("target_language")
+            or _read_prompt_field(prompt, "target_language")
+            or self.default_target_language
+        )
+
+        if not document_path:
+            yield self._status_event(
+                ctx,
+                "Processing failed: no document path found in session state or prompt",
+                {"processing_result": {
+                    "status": "error",
+                    "error_message": "No document path provided"
+                }}
+            )
+            return
+
+        document_id = state.get("document_id")
+        if document_id is None and self.checkpoint_store:
+            document_id = derive_document_id(document_path)
+        options = {"target_language": target_language, "document_type": document_type}
+
+        try:
+            # Stage 1: OCR extraction
+            ocr_result = self._resume(document_id, "ocr", store, options)
+            if ocr_result is None:
+                with timed("stage.ocr"):
+                    ocr_result = extract_text(document_path, store)
+                self._checkpoint(document_id, "ocr", ocr_result, store, options)
+            yield self._status_event(
+                ctx,
+                f"[1/5] OCR extracted {ocr_result['word_count']} words "
+                f"(language: {ocr_result['detected_language']})",
+                {"ocr_result": ocr_result}
+            )
+
+            # Stage 2: Pre-vendor PII masking
+            filter_result = self._resume(document_id, "pre_filter", store, options)
+            if filter_result is None:
+                with timed("stage.pre_filter"):
+                    filter_result = pre_filter(ocr_result["text_ref"], store)
+                self._checkpoint(document_id, "pre_filter", filter_result, store, options)
+            yield self._status_event(
+                ctx,
+                f"[2/5] Masked {filter_result['masked_count']} PII instances "
+                f"before the A2A boundary",
+                {"pre_filter_result": filter_result}
+            )
+
+            # Stage 3: External vendor translation (A2A boundary)
+            vendor_result = self._resume(document_id, "vendor", store, options)
+            breaker = self.circuit_breaker
+            if vendor_result is None and breaker and not breaker.allow_request():
+                retry_after = breaker.retry_after()
+                yield self._status_event(
+                    ctx,
+                    f"[3/5] Vendor unavailable (circuit open) - document parked, "
+                    f"retry after {retry_after:.0f}s",
+                    {"processing_result": vendor_unavailable_result(
+                        document_path,
+                        f"Vendor unavailable (circuit open): {breaker.name}",
+                        retry_after,
+                        document_id
+                    )}
+                )
+                return
+
+            if vendor_result is None:
+                masked_text = load_text(filter_result["filtered_text_ref"], store, "vendor")
+                translated_text = ""
+                vendor_start = time.perf_counter()
+                try:
+                    async for event in self._call_vendor(
+                        ctx,
+                        masked_text,
+                        ocr_result["detected_language"],
+                        target_language,
+                        document_type
+                    ):
+                        if event.author == self.vendor_agent.name and not event.partial:
+                            text = _content_text(event.content)
+                            if text:
+                                translated_text = text
+                        yield event
+                except Exception as e:
+                    if breaker:
+                        breaker.record_failure(str(e))
+                    raise StageError("vendor", str(e)) from e
+                except BaseException:
+                    if breaker:
+                        breaker.release()
+                    raise
+                finally:
+                    vendor_latency = time.perf_counter() - vendor_start
+                    record("stage.vendor", vendor_latency)
+
+                if not translated_text:
+                    if breaker:
+                        breaker.record_failure("no translation")
+                    raise StageError("vendor", "vendor returned no translation")
+                if breaker:
+                    breaker.record_success(vendor_latency)
+
+                vendor_result = store_text_field(
+                    {"translated_text": translated_text},
+                    "translated_text", "translated_text_ref", store
+                )
+                self._checkpoint(document_id, "vendor", vendor_result, store, options)
+
+            translated_text_ref = vendor_result["translated_text_ref"]
+            yield self._status_event(
+                ctx,
+                f"[3/5] Vendor returned "
+                f"{vendor_result['translated_text_size_bytes']} bytes",
+                {"vendor_result": vendor_result}
+            )
+
+            # Stage 4: Post-vendor verification
+            verification = self._resume(document_id, "post_verify", store, options)
+            if verification is None:
+                with timed("stage.post_verify"):
+                    verification = post_verify(translated_text_ref, store)
+                self._checkpoint(document_id, "post_verify", verification, store, options)
+            yield self._status_event(
+                ctx,
+                f"[4/5] Vendor response verification: {verification['status']}",
+                {"post_verify_result": verification}
+            )
+
+            # Stage 5: Compile final result
+            with timed("stage.compile"):
+                result = compile_result(
+                    document_path=document_path,
+                    ocr_result=ocr_result,
+                    filter_result=filter_result,
+                    translated_text_ref=translated_text_ref,
+                    verification=verification,
+                    target_language=target_language,
+                    document_type=document_type,
+                    document_id=document_id
+                )
+                translated_text = load_text(translated_text_ref, store, "compile")
+
+        except StageError as e:
+            yield self._status_event(
+                ctx,
+                f"Processing failed at stage '{e.stage}': {e}",
+                {"processing_result": {
+                    "status": "error",
+                    "failed_stage": e.stage,
+                    "error_message": str(e)
+                }}
+            )
+            return
+
+        yield self._status_event(
+            ctx,
+            f"[5/5] Processing complete ({result['status']}). "
+            f"Translated {document_type} "
+            f"({result['source_language']} -> {target_language}):\n\n"
+            f"{translated_text}",
+            {"processing_result": result}
+        )
 
 
 def create_processing_agent(
     remote_vendor_agent,
-    model: str = "gemini-2.0-flash-lite"
-) -> LlmAgent:
+    model: str = "gemini-2.0-flash-lite",
+    orchestration: str = "code",
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False
+) -> BaseAgent:
     """
     Create the ProcessingAgent for document processing pipeline.
-    
+
     Args:
         remote_vendor_agent: RemoteA2aAgent for Docs Translator vendor
-        model: Gemini model to use (default: gemini-2.0-flash-lite)
-    
+        model: Gemini model to use when orchestration="llm"
+            (default: gemini-2.0-flash-lite)
+        orchestration: "code" to run the stages directly (default), or
+            "llm" to let a Gemini model drive the pipeline via tool calls
+        checkpoint_dir: Directory for per-stage checkpoints
+            (default: PIPELINE_CHECKPOINT_DIR env, disabled if unset)
+        resume: Skip stages that already have a checkpoint
+
     Returns:
-        LlmAgent configured as ProcessingAgent
+        ProcessingPipelineAgent, or LlmAgent when orchestration="llm"
     """
-    
+    if orchestration == "code":
+        checkpoint_dir = checkpoint_dir or os.getenv("PIPELINE_CHECKPOINT_DIR")
+        # Shared with translate_via_vendor and the health prober for this vendor
+        vendor_url = getattr(remote_vendor_agent, "_vendor_url", None)
+        return ProcessingPipelineAgent(
+            name="processing_agent",
+            description="Government document processing agent with multi-step pipeline and vendor integration",
+            vendor_agent=remote_vendor_agent,
+            circuit_breaker=get_circuit_breaker(vendor_url) if vendor_url else None,
+            checkpoint_store=CheckpointStore(checkpoint_dir) if checkpoint_dir else None,
+            resume=resume
+        )
+
+    if orchestration != "llm":
+        raise ValueError(f"Invalid orchestration: {orchestration}")
+
     # Create the ProcessingAgent with all tools and vendor access
     agent = LlmAgent(
         model=Gemini(model=model),
@@ -40,43 +419,43 @@ def create_processing_agent(
         description="Government document processing agent with multi-step pipeline and vendor integration",
         instruction="""
         You are the ProcessingAgent for a government ministry's document processing system.
-        
+
         Your pipeline (ALWAYS follow this order):
-        
+
         1. **OCR Extraction** (Internal Tool)
            - Call ocr_tool(document_path) to extract text from the document
            - Verify extraction was successful
-        
+
         2. **Pre-Vendor Security Filter** (Internal Tool)
            - Call security_filter(text, stage="pre") on the extracted text
            - This masks PII before sending to external vendor
            - Use the filtered_text for the next step
-        
+
         3. **External Vendor Translation** (A2A Sub-Agent)
            - Delegate to the docs_translator_vendor sub-agent
            - Pass the filtered text for translation
            - Request translation from detected source language to English
            - This is the A2A BOUNDARY - vendor is external!
-        
+
         4. **Post-Vendor Security Filter** (Internal Tool)
            - Call security_filter(vendor_response, stage="post")
            - Verify vendor response doesn't contain unexpected sensitive data
-        
+
         5. **Compile Final Result**
            - Combine all results into a comprehensive report
            - Include: original text, filtered text, translation, detected language, security metadata
-        
+
         IMPORTANT SECURITY NOTES:
         - NEVER send unfiltered text to external vendor
         - ALWAYS use pre-filtered text for vendor calls
         - ALWAYS verify vendor responses with post-filter
         - Log each step clearly for audit trail
-        
+
         Be thorough, secure, and professional in your processing.
         """,
         tools=[ocr_tool, security_filter],
         sub_agents=[remote_vendor_agent],
         output_key="processing_result"
     )
-    
+
     return agent
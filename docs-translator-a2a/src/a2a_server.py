@@ -10,25 +10,50 @@ Endpoints:
 - GET  /.well-known/agent-card.json  (Agent Card - "front door")
 - POST /invoke                         (Non-streaming invocation)
 - POST /stream                         (Streaming invocation with SSE)
+- POST /invoke_batch                   (Many documents in one request)
+- POST /jobs, GET /jobs/{id}[/events]  (Asynchronous jobs, see jobs.py)
 - GET  /health                         (Health check)
+
+Request and response bodies may be gzip/zstd compressed (Content-Encoding /
+Accept-Encoding); the agent card advertises the supported encodings.
 """
 
 import os
 import json
+import hashlib
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 from agent_card import AGENT_CARD
-from crew_agent import translate_document_crew
-from transformers import a2a_to_crewai, crewai_to_a2a, validate_a2a_request
+from content_encoding import ContentEncodingMiddleware
+from jobs import JobQueueFullError, get_job_manager
+from translation_cache import get_translation_cache
+from translation_memory import get_translation_memory
+from tools.backends import get_translation_backend
+from tools.openai_clients import close_openai_clients, warm_up_openai_clients
+from tools.retry import get_retry_stats
+from tools.token_budget import get_token_usage
+from crew_agent import (
+    translate_document_crew,
+    stream_translate_document_crew,
+    build_translation_result
+)
+from transformers import (
+    a2a_to_crewai,
+    crewai_to_a2a,
+    validate_a2a_batch,
+    validate_a2a_request
+)
 
 # Load environment variables
 load_dotenv()
@@ -57,6 +82,68 @@ class A2AResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Response metadata")
 
 
+class A2ABatchRequest(BaseModel):
+    """A2A batch request: one capability, many parameter sets."""
+    capability: str = Field("translate_document", description="Capability name to invoke for every item")
+    items: List[Dict[str, Any]] = Field(..., description="Parameter sets, one per document")
+    context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
+
+
+class A2ABatchItemResult(BaseModel):
+    """Result of one batch item."""
+    index: int = Field(..., description="Position of the item in the request")
+    status: str = Field(..., description="Item status: success or error")
+    result: Optional[Dict[str, Any]] = Field(None, description="Result data")
+    error: Optional[str] = Field(None, description="Error message if status is error")
+
+
+class A2ABatchResponse(BaseModel):
+    """A2A batch response: per-item results in request order."""
+    status: str = Field(..., description="success, partial (some items failed) or error")
+    results: List[A2ABatchItemResult] = Field(default_factory=list, description="Per-item results")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Response metadata")
+
+
+# Translation makes a blocking OpenAI call; it runs in this bounded thread
+# pool so the event loop keeps serving other requests (including /health)
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "8"))
+
+# Batch limits: items per request, and items of one batch translated at once
+BATCH_MAX_ITEMS = AGENT_CARD["metadata"]["max_batch_items"]
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+_translation_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_translation_executor() -> ThreadPoolExecutor:
+    """Return the translation thread pool, creating it on first use."""
+    global _translation_executor
+    if _translation_executor is None:
+        _translation_executor = ThreadPoolExecutor(
+            max_workers=TRANSLATION_WORKERS,
+            thread_name_prefix="translate"
+        )
+    return _translation_executor
+
+
+async def run_translation(crew_inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run translate_document_crew in the translation thread pool.
+
+    Requests beyond TRANSLATION_WORKERS wait for a free worker.
+
+    Args:
+        crew_inputs: Inputs from a2a_to_crewai
+
+    Returns:
+        CrewAI translation result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_translation_executor(),
+        functools.partial(translate_document_crew, **crew_inputs)
+    )
+
+
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -67,15 +154,30 @@ async def lifespan(app: FastAPI):
     logger.info(f"   Framework: CrewAI")
     logger.info(f"   Vendor: {AGENT_CARD['vendor']['name']}")
     logger.info(f"   Capabilities: {[cap['name'] for cap in AGENT_CARD['capabilities']]}")
+    logger.info(f"   Translation workers: {TRANSLATION_WORKERS}")
+    backend = get_translation_backend()
+    logger.info(f"   Translation backend: {backend.name} ({backend.model})")
+
+    if backend.name == "openai":
+        # Check required environment variables
+        if not os.getenv("OPENAI_API_KEY"):
+            logger.warning("⚠️  OPENAI_API_KEY not set - translations will fail!")
+
+        # Open pooled OpenAI connections before the first translation
+        await warm_up_openai_clients()
 
-    # Check required environment variables
-    if not os.getenv("OPENAI_API_KEY"):
-        logger.warning("⚠️  OPENAI_API_KEY not set - translations will fail!")
+    get_job_manager().start()
 
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down Docs Translator A2A service")
+    await get_job_manager().stop()
+    global _translation_executor
+    if _translation_executor is not None:
+        _translation_executor.shutdown(wait=False, cancel_futures=True)
+        _translation_executor = None
+    await close_openai_clients()
 
 
 # Create FastAPI app
@@ -95,35 +197,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/zstd request bodies and responses (see content_encoding.py)
+app.add_middleware(ContentEncodingMiddleware)
+
+
+# Agent card validators: consumers cache the card and revalidate with
+# If-None-Match, so an unchanged card costs a 304 without a body
+AGENT_CARD_ETAG = '"{}"'.format(
+    hashlib.sha256(json.dumps(AGENT_CARD, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+)
+AGENT_CARD_MAX_AGE = int(os.getenv("AGENT_CARD_MAX_AGE", "300"))
+
 
 # ============================================================================
 # A2A Protocol Endpoints
 # ============================================================================
 
 @app.get("/.well-known/agent-card.json")
-async def get_agent_card():
+async def get_agent_card(request: Request):
     """
     A2A Protocol: Agent Card endpoint.
 
     This is the "front door" for A2A - ADK RemoteA2aAgent reads this first
     to discover the agent's capabilities, parameters, and endpoints.
 
+    Supports conditional requests: a matching If-None-Match returns
+    304 Not Modified.
+
     Returns:
         Agent Card JSON
     """
+    headers = {
+        "ETag": AGENT_CARD_ETAG,
+        "Cache-Control": f"public, max-age={AGENT_CARD_MAX_AGE}",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if AGENT_CARD_ETAG in [tag.strip() for tag in if_none_match.split(",")]:
+        logger.info("📋 Agent Card not modified")
+        return Response(status_code=304, headers=headers)
+
     logger.info("📋 Agent Card requested")
-    return JSONResponse(content=AGENT_CARD)
+    return JSONResponse(content=AGENT_CARD, headers=headers)
+
+
+def use_translation_cache(http_request: Request) -> bool:
+    """Return False if the client sent "Cache-Control: no-cache" to bypass the translation cache."""
+    return "no-cache" not in http_request.headers.get("cache-control", "").lower()
 
 
 @app.post("/invoke", response_model=A2AResponse)
-async def invoke(request: A2ARequest):
+async def invoke(request: A2ARequest, http_request: Request, response: Response):
     """
     A2A Protocol: Non-streaming invocation endpoint.
 
     Executes the requested capability and returns the result synchronously.
+    The X-Translation-Cache response header reports hit, miss or bypass.
 
     Args:
         request: A2A request with capability and parameters
+        http_request: Raw request (for the cache bypass header)
+        response: Response (for the cache status header)
 
     Returns:
         A2A response with result or error
@@ -141,10 +274,14 @@ async def invoke(request: A2ARequest):
         if request.capability == "translate_document":
             # Transform A2A parameters -> CrewAI inputs
             crew_inputs = a2a_to_crewai(request.parameters)
+            crew_inputs["use_cache"] = use_translation_cache(http_request)
 
-            # Execute CrewAI translation
+            # Execute CrewAI translation (off the event loop)
             logger.info("🤖 Executing CrewAI translation...")
-            crew_result = translate_document_crew(**crew_inputs)
+            crew_result = await run_translation(crew_inputs)
+            cache_status = crew_result.get("cache")
+            if cache_status:
+                response.headers["X-Translation-Cache"] = cache_status
 
             # Transform CrewAI result -> A2A response
             a2a_result = crewai_to_a2a(crew_result)
@@ -157,7 +294,8 @@ async def invoke(request: A2ARequest):
                 metadata={
                     "vendor": "Docs Translator",
                     "framework": "CrewAI",
-                    "model": os.getenv("OPENAI_MODEL", "gpt-4o")
+                    "model": get_translation_backend().model,
+                    "cache": cache_status
                 }
             )
 
@@ -181,25 +319,120 @@ async def invoke(request: A2ARequest):
         )
 
 
+@app.post("/invoke_batch", response_model=A2ABatchResponse)
+async def invoke_batch(request: A2ABatchRequest, http_request: Request):
+    """
+    A2A Protocol: Batch invocation endpoint.
+
+    Validates all items up front, translates the valid ones with at most
+    BATCH_CONCURRENCY running at once, and returns per-item results and
+    errors in request order. An invalid or failed item does not fail the
+    batch.
+
+    With "Accept: application/x-ndjson", results are streamed as one JSON
+    line per item (in request order) as soon as they are ready.
+
+    Args:
+        request: Batch request with capability and parameter sets
+        http_request: Raw request (for content negotiation and the cache bypass header)
+
+    Returns:
+        A2A batch response, or an NDJSON StreamingResponse
+
+    Raises:
+        HTTPException: If the capability is invalid or the batch is empty or too large
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch has no items")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(request.items)} items. Maximum: {BATCH_MAX_ITEMS}"
+        )
+    try:
+        errors = validate_a2a_batch(request.capability, request.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"📥 A2A batch request: {request.capability}, {len(request.items)} items")
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    use_cache = use_translation_cache(http_request)
+
+    async def run_item(index: int, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        if index in errors:
+            return {"index": index, "status": "error", "error": errors[index]}
+        async with semaphore:
+            try:
+                crew_inputs = a2a_to_crewai(parameters)
+                crew_inputs["use_cache"] = use_cache
+                crew_result = await run_translation(crew_inputs)
+                return {"index": index, "status": "success", "result": crewai_to_a2a(crew_result)}
+            except Exception as e:
+                logger.error(f"❌ Batch item {index} failed: {e}")
+                return {"index": index, "status": "error", "error": str(e)}
+
+    tasks = [
+        asyncio.ensure_future(run_item(index, parameters))
+        for index, parameters in enumerate(request.items)
+    ]
+
+    if "application/x-ndjson" in http_request.headers.get("accept", ""):
+        async def ndjson_generator():
+            try:
+                for task in tasks:
+                    yield json.dumps(await task) + "\n"
+            finally:
+                # Client went away: stop translating the rest
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson_generator(), media_type="application/x-ndjson")
+
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    failed = sum(1 for item in results if item["status"] != "success")
+    logger.info(f"✅ Batch completed: {len(results) - failed} succeeded, {failed} failed")
+    return A2ABatchResponse(
+        status="success" if failed == 0 else ("error" if failed == len(results) else "partial"),
+        results=results,
+        metadata={
+            "vendor": "Docs Translator",
+            "framework": "CrewAI",
+            "model": get_translation_backend().model,
+            "succeeded": len(results) - failed,
+            "failed": failed
+        }
+    )
+
+
 @app.post("/stream")
-async def stream(request: A2ARequest):
+async def stream(request: A2ARequest, http_request: Request):
     """
     A2A Protocol: Streaming invocation endpoint.
 
     Executes the requested capability and streams results using
-    Server-Sent Events (SSE).
+    Server-Sent Events (SSE). Translated text is relayed as the model
+    produces it; the final event carries the complete A2A result.
 
     Args:
         request: A2A request with capability and parameters
+        http_request: Raw request (for the cache bypass header)
 
     Returns:
         StreamingResponse with SSE events
 
     Event format:
         data: {"status": "processing"}
+        data: {"status": "delta", "delta": "..."}       (repeated)
         data: {"status": "success", "result": {...}}
         data: {"status": "error", "error": "..."}
     """
+    use_cache = use_translation_cache(http_request)
+
     async def event_generator():
         """Generate SSE events for streaming response."""
         try:
@@ -219,8 +452,19 @@ async def stream(request: A2ARequest):
                 # Send progress update
                 yield f"data: {json.dumps({'status': 'processing', 'message': 'Executing CrewAI agent...'})}\n\n"
 
-                # Execute CrewAI (currently synchronous - would need async version for true streaming)
-                crew_result = translate_document_crew(**crew_inputs)
+                # Relay translated text as the model produces it
+                deltas = []
+                async for delta in stream_translate_document_crew(**crew_inputs, use_cache=use_cache):
+                    deltas.append(delta)
+                    yield f"data: {json.dumps({'status': 'delta', 'delta': delta})}\n\n"
+
+                crew_result = build_translation_result(
+                    crew_inputs["text"],
+                    "".join(deltas).strip(),
+                    crew_inputs["source_lang"],
+                    crew_inputs["target_lang"],
+                    crew_inputs["doc_type"]
+                )
                 a2a_result = crewai_to_a2a(crew_result)
 
                 # Send success with result
@@ -245,6 +489,89 @@ async def stream(request: A2ARequest):
     )
 
 
+# ============================================================================
+# Asynchronous Jobs
+# ============================================================================
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: A2ARequest, http_request: Request):
+    """
+    Queue a translation job and return its id immediately.
+
+    Poll GET /jobs/{id} or follow GET /jobs/{id}/events for progress and
+    the result, instead of holding a connection open for the translation.
+
+    Args:
+        request: A2A request with capability and parameters
+        http_request: Raw request (for the cache bypass header)
+
+    Returns:
+        Job record with status "queued" (202 Accepted)
+
+    Raises:
+        HTTPException: 400 if the request is invalid, 503 if the queue is full
+    """
+    try:
+        validate_a2a_request(request.capability, request.parameters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = await get_job_manager().submit(
+            request.capability, request.parameters, use_cache=use_translation_cache(http_request)
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    job_url = f"/jobs/{job['job_id']}"
+    job["links"] = {"self": job_url, "events": f"{job_url}/events"}
+    return JSONResponse(content=job, status_code=202, headers={"Location": job_url})
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Return a job's status, progress and, once finished, result or error.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired
+    """
+    job = get_job_manager().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Stream a job's status changes as Server-Sent Events.
+
+    Sends the job record on every change and closes after the final
+    (succeeded or failed) record. Comment lines are sent while nothing
+    changes, so proxies do not drop the idle connection.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired
+    """
+    manager = get_job_manager()
+    if manager.store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    async def event_generator():
+        async for job in manager.watch(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
+    )
+
+
 # ============================================================================
 # Utility Endpoints
 # ============================================================================
@@ -257,13 +584,19 @@ async def health():
     Returns:
         Health status and service information
     """
+    memory = get_translation_memory()
     return {
         "status": "healthy",
         "service": "docs-translator-a2a",
         "version": "1.0.0",
         "framework": "CrewAI",
         "a2a_enabled": True,
-        "openai_configured": bool(os.getenv("OPENAI_API_KEY"))
+        "openai_configured": bool(os.getenv("OPENAI_API_KEY")),
+        "translation_backend": get_translation_backend().name,
+        "translation_cache": get_translation_cache().stats(),
+        "translation_memory": memory.stats() if memory is not None else None,
+        "token_usage": get_token_usage().stats(),
+        "upstream_retries": get_retry_stats().stats()
     }
 
 
@@ -278,6 +611,8 @@ async def root():
         "endpoints": {
             "invoke": "/invoke",
             "stream": "/stream",
+            "invoke_batch": "/invoke_batch",
+            "jobs": "/jobs",
             "health": "/health"
         },
         "vendor": AGENT_CARD["vendor"]
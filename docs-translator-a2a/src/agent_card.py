@@ -10,6 +10,8 @@ Based on Day 5a: Agent-to-Agent Communication from Kaggle AI Agents Intensive.
 import os
 from typing import Dict, Any
 
+from content_encoding import SUPPORTED_ENCODINGS
+
 def get_agent_card() -> Dict[str, Any]:
     """
     Generate Agent Card JSON for A2A protocol.
@@ -111,7 +113,13 @@ def get_agent_card() -> Dict[str, Any]:
 
         "endpoints": {
             "invoke": "/invoke",
-            "stream": "/stream"
+            "stream": "/stream",
+            # POST {"capability", "items": [parameters, ...]}; per-item
+            # results in order, NDJSON with Accept: application/x-ndjson
+            "invoke_batch": "/invoke_batch",
+            # POST an invoke request, get a job id; GET /jobs/{id} or
+            # /jobs/{id}/events for progress and the result
+            "jobs": "/jobs"
         },
 
         "authentication": {
@@ -131,7 +139,14 @@ def get_agent_card() -> Dict[str, Any]:
             "pii_handling": "Preserves masked PII patterns unchanged",
             "supported_formats": ["text"],
             "max_text_length": 50000,
-            "typical_response_time_ms": 3000
+            "max_batch_items": int(os.getenv("BATCH_MAX_ITEMS", "500")),
+            "typical_response_time_ms": 3000,
+            # Request bodies may be sent compressed with these encodings;
+            # responses are compressed per Accept-Encoding
+            "content_encodings": {
+                "request": list(SUPPORTED_ENCODINGS),
+                "response": list(SUPPORTED_ENCODINGS)
+            }
         }
     }
 
@@ -0,0 +1,260 @@
+"""
+HTTP body compression for the A2A service.
+
+Documents of up to 50,000 characters travel as JSON in both directions, and
+the Render-hosted service sits behind slow links. ContentEncodingMiddleware
+handles both directions:
+
+- Requests: a body sent with Content-Encoding gzip or zstd is decompressed
+  before FastAPI sees it (unsupported encodings get 415, oversized or corrupt
+  bodies get 413/400)
+- Responses: bodies of at least COMPRESSION_MIN_BYTES are compressed with
+  the best encoding the client lists in Accept-Encoding. SSE and NDJSON
+  streams are left alone so events are delivered as they are produced
+
+zstd is used when the optional `zstandard` package is installed; gzip is
+always available. The supported encodings are advertised in the agent card
+metadata (content_encodings).
+
+Configuration (environment):
+    COMPRESSION_MIN_BYTES        Smallest response body worth compressing (default: 1024)
+    MAX_DECOMPRESSED_BODY_BYTES  Request body limit after decompression (default: 10 MB)
+"""
+
+import os
+import json
+import zlib
+import logging
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: gzip only
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+MAX_DECOMPRESSED_BODY_BYTES = int(os.getenv("MAX_DECOMPRESSED_BODY_BYTES", str(10 * 1024 * 1024)))
+
+# Streamed responses: a compressor would hold events back until it flushes
+STREAMING_CONTENT_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+# Preference order: zstd compresses better and faster than gzip
+SUPPORTED_ENCODINGS: List[str] = (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+class BodyTooLargeError(ValueError):
+    """Raised when a request body decompresses to more than the limit."""
+
+
+def decompress(data: bytes, encoding: str, max_size: int = MAX_DECOMPRESSED_BODY_BYTES) -> bytes:
+    """
+    Decompress a request body.
+
+    Args:
+        data: Compressed body
+        encoding: "gzip" or "zstd"
+        max_size: Largest decompressed size accepted
+
+    Returns:
+        Decompressed body
+
+    Raises:
+        BodyTooLargeError: If the body decompresses to more than max_size
+        ValueError: If the body is not valid for the encoding
+    """
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            body = decompressor.decompress(data, max_size + 1)
+        except zlib.error as e:
+            raise ValueError(f"Invalid gzip body: {e}") from e
+        if not decompressor.eof and len(body) <= max_size:
+            raise ValueError("Invalid gzip body: truncated")
+    elif encoding == "zstd" and zstandard is not None:
+        try:
+            reader = zstandard.ZstdDecompressor().stream_reader(data)
+            body = reader.read(max_size + 1)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Invalid zstd body: {e}") from e
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+
+    if len(body) > max_size:
+        raise BodyTooLargeError(f"Request body exceeds {max_size} bytes after decompression")
+    return body
+
+
+def _compressor(encoding: str):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        The preferred supported encoding the client accepts, or None
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name)
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class ContentEncodingMiddleware:
+    """
+    ASGI middleware: decompress request bodies and compress responses.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.lower(): v for k, v in scope["headers"]}
+        content_encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+
+        if content_encoding and content_encoding != "identity":
+            if content_encoding not in SUPPORTED_ENCODINGS:
+                await self._error(send, 415, f"Unsupported Content-Encoding: {content_encoding}")
+                return
+            data = await self._read_body(receive)
+            try:
+                body = decompress(data, content_encoding)
+            except BodyTooLargeError as e:
+                await self._error(send, 413, str(e))
+                return
+            except ValueError as e:
+                await self._error(send, 400, str(e))
+                return
+            logger.debug(f"Decompressed {content_encoding} request body: {len(data)} -> {len(body)} bytes")
+
+            scope = dict(scope)
+            scope["headers"] = [
+                (k, v) for k, v in scope["headers"]
+                if k.lower() not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+            receive = self._replay(body, receive)
+
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    @staticmethod
+    async def _error(send, status: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"accept-encoding", ", ".join(SUPPORTED_ENCODINGS).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class _CompressingSend:
+    """Wraps ASGI send to compress one response."""
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = {k.lower(): v for k, v in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"")
+            self.passthrough = (
+                b"content-encoding" in headers
+                or content_type.startswith(STREAMING_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(self.start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.compressor = _compressor(self.encoding)
+            headers = [
+                (k, v) for k, v in self.start.get("headers", [])
+                if k.lower() not in (b"content-length", b"vary")
+            ]
+            vary = dict((k.lower(), v) for k, v in self.start.get("headers", [])).get(b"vary")
+            headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            await self.send({**self.start, "headers": headers})
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
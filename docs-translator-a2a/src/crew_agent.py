@@ -5,9 +5,14 @@ This implements a CrewAI agent specifically for the A2A protocol,
 separate from the production Docs Translator SaaS.
 """
 
+import asyncio
 import logging
-from tools.real_translation import translate_text
+from typing import AsyncIterator, Optional
+
+from tools.backends import get_translation_backend, translate_text, stream_translate_text
 from tools.validation import validate_translation
+from translation_cache import BYPASS, HIT, MISS, get_translation_cache, translation_cache_key
+from translation_memory import SegmentMatch, get_translation_memory
 
 logger = logging.getLogger(__name__)
 
@@ -26,23 +31,142 @@ def create_translation_agent():
     return None
 
 
+def _cache_key(text: str, source_lang: str, target_lang: str, doc_type: str) -> str:
+    backend = get_translation_backend()
+    return translation_cache_key(
+        text, source_lang, target_lang, doc_type, backend.model, backend.prompt_version
+    )
+
+
+def _memory_lookup(text: str, source_lang: str, target_lang: str, use_memory: bool) -> Optional[SegmentMatch]:
+    memory = get_translation_memory()
+    if memory is None:
+        return None
+    backend = get_translation_backend()
+    match = memory.lookup(
+        text, source_lang, target_lang, backend.model, backend.prompt_version, use_memory=use_memory
+    )
+    if match.hits:
+        logger.info(f"Translation memory: {match.hits}/{match.segments} segments reused")
+    return match
+
+
+def _translate_with_memory(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str,
+    use_memory: bool = True
+) -> str:
+    """
+    Translate a document, sending only segments missing from the translation memory.
+
+    Args:
+        text: Document text to translate
+        source_lang: Source language code
+        target_lang: Target language code
+        doc_type: Document type
+        use_memory: Reuse remembered segments (False: translate everything,
+            but still learn the segments)
+
+    Returns:
+        Translated text
+    """
+    match = _memory_lookup(text, source_lang, target_lang, use_memory)
+    if match is not None and match.segments and match.complete:
+        return match.assemble()
+
+    if match is not None and match.hits:
+        partial = translate_text(
+            text=match.request_text(),
+            source_lang=source_lang,
+            target_lang=target_lang,
+            doc_type=doc_type
+        )
+        if get_translation_memory().learn(match, partial, match.missing):
+            return match.assemble()
+
+    translated_text = translate_text(
+        text=text,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        doc_type=doc_type
+    )
+    if match is not None and not match.hits:
+        get_translation_memory().learn(match, translated_text, match.missing)
+    return translated_text
+
+
+async def _stream_with_memory(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str,
+    use_memory: bool = True
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of _translate_with_memory.
+
+    A document with no remembered segments is streamed as the model produces
+    it. When only some segments are sent to the model, the translation is
+    yielded once reassembled. Translation memory reads and writes (SQLite)
+    run in a worker thread, off the event loop.
+    """
+    match = await asyncio.to_thread(_memory_lookup, text, source_lang, target_lang, use_memory)
+    if match is not None and match.segments and match.complete:
+        yield match.assemble()
+        return
+
+    if match is not None and match.hits:
+        partial = "".join([
+            delta async for delta in stream_translate_text(
+                text=match.request_text(),
+                source_lang=source_lang,
+                target_lang=target_lang,
+                doc_type=doc_type
+            )
+        ])
+        if await asyncio.to_thread(get_translation_memory().learn, match, partial, match.missing):
+            yield match.assemble()
+            return
+
+    deltas = []
+    async for delta in stream_translate_text(
+        text=text,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        doc_type=doc_type
+    ):
+        deltas.append(delta)
+        yield delta
+    if match is not None and not match.hits:
+        await asyncio.to_thread(get_translation_memory().learn, match, "".join(deltas), match.missing)
+
+
 def translate_document_crew(
     text: str,
     source_lang: str,
     target_lang: str,
-    doc_type: str = "general"
+    doc_type: str = "general",
+    use_cache: bool = True
 ) -> dict:
     """
     Execute translation workflow (direct translation).
 
     This is the main entry point for translation.
-    Uses OpenAI directly without CrewAI orchestration for simplicity.
+    Uses the configured translation backend (OpenAI by default) without
+    CrewAI orchestration for simplicity.
+    Translations are served from and stored in the translation cache;
+    on a miss, segments found in the translation memory are not sent to
+    the model again.
 
     Args:
         text: Document text to translate
         source_lang: Source language code (e.g., "es")
         target_lang: Target language code (e.g., "en")
         doc_type: Document type (birth_certificate, passport, etc.)
+        use_cache: Look the translation up in the cache and the translation
+            memory first
 
     Returns:
         Dictionary with translation results:
@@ -51,7 +175,8 @@ def translate_document_crew(
             "source_language": str,
             "target_language": str,
             "document_type": str,
-            "confidence": float
+            "confidence": float,
+            "cache": "hit" | "miss" | "bypass"
         }
     """
     try:
@@ -60,43 +185,122 @@ def translate_document_crew(
             f"doc_type={doc_type}"
         )
 
-        # Direct translation using OpenAI
-        translated_text = translate_text(
-            text=text,
-            source_lang=source_lang,
-            target_lang=target_lang,
-            doc_type=doc_type
-        )
-
-        # Validate translation quality
-        validation = validate_translation(
-            original_text=text,
-            translated_text=translated_text,
-            source_lang=source_lang,
-            target_lang=target_lang
-        )
-
-        # Build response
-        response = {
-            "translated_text": translated_text,
-            "source_language": source_lang,
-            "target_language": target_lang,
-            "document_type": doc_type,
-            "confidence": 0.95  # High confidence with GPT-4o
-        }
+        cache = get_translation_cache()
+        key = _cache_key(text, source_lang, target_lang, doc_type)
+        if use_cache:
+            translated_text = cache.get(key)
+            cache_status = HIT if translated_text is not None else MISS
+        else:
+            cache.record_bypass()
+            translated_text, cache_status = None, BYPASS
 
-        logger.info(
-            f"Translation completed: {len(text)} chars -> "
-            f"{len(translated_text)} chars"
-        )
+        if translated_text is None:
+            # Direct translation with the backend (unseen segments only)
+            translated_text = _translate_with_memory(text, source_lang, target_lang, doc_type, use_cache)
+            cache.set(key, translated_text)
 
-        return response
+        result = build_translation_result(text, translated_text, source_lang, target_lang, doc_type)
+        result["cache"] = cache_status
+        return result
 
     except Exception as e:
         logger.error(f"Translation error: {e}", exc_info=True)
         raise RuntimeError(f"Translation failed: {str(e)}")
 
 
+async def stream_translate_document_crew(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str = "general",
+    use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    Execute translation workflow with token-level streaming.
+
+    Yields the translated text as the model produces it; pass the joined
+    deltas to build_translation_result for the final result. A cached
+    translation is yielded as a single delta; a completed stream is cached.
+    Cache reads and writes (SQLite) run in a worker thread, off the event
+    loop.
+
+    Args:
+        text: Document text to translate
+        source_lang: Source language code (e.g., "es")
+        target_lang: Target language code (e.g., "en")
+        doc_type: Document type (birth_certificate, passport, etc.)
+        use_cache: Look the translation up in the cache and the translation
+            memory first
+
+    Yields:
+        Translated text deltas
+    """
+    logger.info(
+        f"Starting streaming translation: {source_lang} -> {target_lang}, "
+        f"doc_type={doc_type}"
+    )
+    cache = get_translation_cache()
+    key = _cache_key(text, source_lang, target_lang, doc_type)
+    if use_cache:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            yield cached
+            return
+    else:
+        cache.record_bypass()
+
+    deltas = []
+    async for delta in _stream_with_memory(text, source_lang, target_lang, doc_type, use_cache):
+        deltas.append(delta)
+        yield delta
+    await asyncio.to_thread(cache.set, key, "".join(deltas).strip())
+
+
+def build_translation_result(
+    text: str,
+    translated_text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str = "general"
+) -> dict:
+    """
+    Validate a finished translation and build the translation result.
+
+    Args:
+        text: Original document text
+        translated_text: Complete translated text
+        source_lang: Source language code
+        target_lang: Target language code
+        doc_type: Document type
+
+    Returns:
+        Dictionary with translation results (see translate_document_crew)
+    """
+    # Validate translation quality
+    validation = validate_translation(
+        original_text=text,
+        translated_text=translated_text,
+        source_lang=source_lang,
+        target_lang=target_lang
+    )
+
+    # Build response
+    response = {
+        "translated_text": translated_text,
+        "source_language": source_lang,
+        "target_language": target_lang,
+        "document_type": doc_type,
+        "confidence": 0.95  # High confidence with GPT-4o
+    }
+
+    logger.info(
+        f"Translation completed: {len(text)} chars -> "
+        f"{len(translated_text)} chars"
+    )
+
+    return response
+
+
 def validate_crew_translation(
     original_text: str,
     translated_text: str,
@@ -0,0 +1,389 @@
+"""
+Asynchronous translation jobs for the A2A service.
+
+A long document keeps an /invoke connection open for the whole translation,
+which proxies with 30-60s idle timeouts (Render's, for one) cut off. The job
+API instead returns a job id at once:
+
+    POST /jobs                 Queue a translation, returns 202 + job id
+    GET  /jobs/{id}            Job status, progress and (when done) result
+    GET  /jobs/{id}/events     SSE feed of status changes (with keep-alives)
+
+A pool of worker tasks takes queued jobs in order. Workers stream the
+translation, so progress reports the characters translated so far.
+
+Job state lives in memory (JobStore). With a SQLite path, status changes and
+results are also written to SQLite, so finished jobs can still be read after
+a restart; jobs that were queued or running when the process stopped are
+marked failed on startup (their parameters are kept in memory only). SQLite
+writes run in a worker thread, off the event loop.
+
+If the workers are started again on a new event loop (the app lifespan ran
+again in the same process), jobs that were still queued or running on the
+old loop are queued again.
+
+Configuration (environment):
+    JOB_WORKERS       Worker tasks (default: 4)
+    JOBS_MAX_PENDING  Queued jobs accepted before POST /jobs returns 503 (default: 1000)
+    JOB_TTL_SECONDS   How long finished jobs are kept (default: 3600)
+    JOBS_DB_PATH      SQLite file for the persistent tier (default: unset, memory only)
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from crew_agent import stream_translate_document_crew, build_translation_result
+from transformers import a2a_to_crewai, crewai_to_a2a
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+# Minimum seconds between progress updates while a job translates
+PROGRESS_INTERVAL = 0.5
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many jobs are already queued."""
+
+
+class JobStore:
+    """
+    Job records in memory, with optional write-through to SQLite.
+
+    Records are plain dicts (see JobManager.submit for the fields).
+    Parameters are kept in memory only.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            db_path: SQLite file for the persistent tier (None: memory only)
+            ttl_seconds: How long finished jobs are kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, status TEXT, data TEXT, updated_at REAL)"
+            )
+            # Parameters of unfinished jobs were lost with the previous process
+            interrupted = self._db.execute(
+                "SELECT job_id, data FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            for job_id, data in interrupted:
+                job = json.loads(data)
+                job.update(status=FAILED, error="Interrupted by a service restart",
+                           finished_at=time.time())
+                self._write(job)
+            if interrupted:
+                logger.warning(f"Marked {len(interrupted)} interrupted jobs as failed")
+            self._db.commit()
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        record = {k: v for k, v in job.items() if k != "parameters"}
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, data, updated_at) VALUES (?, ?, ?, ?)",
+            (job["job_id"], job["status"], json.dumps(record), time.time())
+        )
+
+    def add(self, job: Dict[str, Any]) -> None:
+        """Store a new job."""
+        with self._lock:
+            self._evict()
+            self._jobs[job["job_id"]] = job
+            if self._db is not None:
+                self._write(job)
+                self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job (without its parameters), or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None and self._db is not None:
+                row = self._db.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                return json.loads(row[0]) if row else None
+        if job is None:
+            return None
+        return {k: v for k, v in job.items() if k != "parameters"}
+
+    def parameters(self, job_id: str) -> Dict[str, Any]:
+        """Return a queued job's capability parameters."""
+        with self._lock:
+            return self._jobs[job_id]["parameters"]
+
+    def use_cache(self, job_id: str) -> bool:
+        """Return whether a queued job may be served from the translation cache."""
+        with self._lock:
+            return self._jobs[job_id].get("use_cache", True)
+
+    def update(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Update a job's fields.
+
+        Status changes are written to SQLite; progress-only updates are not.
+
+        Returns:
+            dict: The updated job record
+        """
+        with self._lock:
+            job = self._jobs[job_id]
+            status_changed = fields.get("status", job["status"]) != job["status"]
+            job.update(fields)
+            if job["status"] in FINISHED:
+                job.pop("parameters", None)  # the document text is no longer needed
+            if status_changed and self._db is not None:
+                self._write(job)
+                self._db.commit()
+            return job
+
+    def requeue(self) -> List[str]:
+        """
+        Reset unfinished jobs to queued, for workers started on a new loop.
+
+        The jobs' status in SQLite is left as is: should the process stop
+        first, they are failed on restart either way.
+
+        Returns:
+            list: IDs of the unfinished jobs, oldest first
+        """
+        with self._lock:
+            unfinished = sorted(
+                (job for job in self._jobs.values() if job["status"] not in FINISHED),
+                key=lambda job: job["created_at"]
+            )
+            for job in unfinished:
+                job.update(status=QUEUED, started_at=None)
+            return [job["job_id"] for job in unfinished]
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in FINISHED and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self._db is not None and expired:
+            self._db.execute("DELETE FROM jobs WHERE updated_at < ? AND status IN (?, ?)",
+                             (cutoff, SUCCEEDED, FAILED))
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class JobManager:
+    """
+    Queue of translation jobs processed by a pool of worker tasks.
+
+    Workers start on first use in the running event loop (or via start()).
+    """
+
+    def __init__(self, store: JobStore, workers: int = 4, max_pending: int = 1000):
+        """
+        Args:
+            store: Job store
+            workers: Number of worker tasks
+            max_pending: Queued jobs accepted before submit() refuses more
+        """
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._version = 0  # bumped on every job update, for watchers
+        self._tasks = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Start the worker tasks in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        # Jobs left on a previous loop's queue (or cut off mid-run) would never finish
+        requeued = self.store.requeue()
+        for job_id in requeued:
+            self._queue.put_nowait(job_id)
+        self._tasks = [loop.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers")
+        if requeued:
+            logger.warning(f"Re-queued {len(requeued)} unfinished jobs from a previous event loop")
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    async def submit(
+        self,
+        capability: str,
+        parameters: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Queue a job.
+
+        Args:
+            capability: Validated capability name
+            parameters: Validated capability parameters
+            use_cache: Serve the translation from the translation cache if present
+
+        Returns:
+            dict: The new job record (without parameters)
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued
+        """
+        self.start()
+        if self._queue.qsize() >= self.max_pending:
+            raise JobQueueFullError(f"Job queue full ({self.max_pending} jobs pending)")
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "capability": capability,
+            "parameters": parameters,
+            "use_cache": use_cache,
+            "progress": {"source_chars": len(parameters.get("text", "")), "translated_chars": 0},
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        await asyncio.to_thread(self.store.add, job)
+        self._queue.put_nowait(job["job_id"])
+        logger.info(f"📥 Job {job['job_id']} queued ({self._queue.qsize()} pending)")
+        return self.store.get(job["job_id"])
+
+    async def _update(self, job_id: str, **fields: Any) -> None:
+        # Status changes commit to SQLite: keep the write off the event loop
+        await asyncio.to_thread(self.store.update, job_id, **fields)
+        async with self._changed:
+            self._version += 1
+            self._changed.notify_all()
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"❌ Job {job_id} failed: {e}")
+                await self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        await self._update(job_id, status=RUNNING, started_at=time.time())
+        crew_inputs = a2a_to_crewai(self.store.parameters(job_id))
+        source_chars = len(crew_inputs["text"])
+
+        deltas = []
+        translated_chars = 0
+        last_progress = time.monotonic()
+        use_cache = self.store.use_cache(job_id)
+        async for delta in stream_translate_document_crew(**crew_inputs, use_cache=use_cache):
+            deltas.append(delta)
+            translated_chars += len(delta)
+            if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                await self._update(
+                    job_id,
+                    progress={"source_chars": source_chars, "translated_chars": translated_chars}
+                )
+
+        crew_result = build_translation_result(
+            crew_inputs["text"],
+            "".join(deltas).strip(),
+            crew_inputs["source_lang"],
+            crew_inputs["target_lang"],
+            crew_inputs["doc_type"]
+        )
+        await self._update(
+            job_id,
+            status=SUCCEEDED,
+            progress={"source_chars": source_chars, "translated_chars": translated_chars},
+            result=crewai_to_a2a(crew_result),
+            finished_at=time.time()
+        )
+        logger.info(f"✅ Job {job_id} completed")
+
+    async def watch(self, job_id: str, keepalive: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the job on every change until it finishes.
+
+        Yields None after keepalive seconds without a change, so the caller
+        can keep an idle connection open.
+
+        Args:
+            job_id: Job to watch
+            keepalive: Seconds between None yields while nothing changes
+        """
+        self.start()
+        last = None
+        while True:
+            seen = self._version
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            if job != last:
+                last = job
+                yield job
+                if job["status"] in FINISHED:
+                    return
+            try:
+                async with self._changed:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: self._version != seen),
+                        timeout=keepalive
+                    )
+            except asyncio.TimeoutError:
+                yield None
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """
+    Return the process-wide job manager, configured from the environment.
+
+    Returns:
+        JobManager (workers start on first use)
+    """
+    global _manager
+    if _manager is None:
+        _manager = JobManager(
+            JobStore(
+                db_path=os.getenv("JOBS_DB_PATH") or None,
+                ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", "3600"))
+            ),
+            workers=int(os.getenv("JOB_WORKERS", "4")),
+            max_pending=int(os.getenv("JOBS_MAX_PENDING", "1000"))
+        )
+    return _manager
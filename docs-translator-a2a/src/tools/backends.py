@@ -0,0 +1,423 @@
+"""
+Translation Backends: The engine behind translate_document, selected by config.
+
+Translation was hardwired to OpenAI, so throughput, concurrency and caching
+could only be measured against the live API (with its cost, rate limits and
+latency noise), and not at all without a network.
+
+A backend translates a document (translate) and streams a translation
+(stream). Two are built in:
+- "openai": RealTranslationTool (chunking, placeholders, retries)
+- "local": a deterministic dictionary and rule engine with configurable
+  latency and errors, for offline load tests and benchmarks
+
+The local backend swaps words it knows from LOCAL_LEXICON (civil document
+vocabulary in en/es/fr/de/it) and keeps everything else: names, numbers,
+masked PII, placeholders, punctuation and layout. The same input always
+gives the same output, and output length follows input length. Each request
+waits LOCAL_BACKEND_LATENCY_MS plus LOCAL_BACKEND_MS_PER_TOKEN per token of
+input, scaled by a log-normal jitter, and may fail with a synthetic 429,
+503 or timeout (real OpenAI exception types, so retry.py retries them as
+it would for the API).
+
+Other backends can be added with register_backend. The backend's model and
+prompt_version are part of the translation cache and translation memory
+keys, so translations from different backends are never mixed.
+
+Configuration (environment):
+    TRANSLATION_BACKEND          openai or local (default: openai)
+    LOCAL_BACKEND_LATENCY_MS     Fixed latency per request (default: 0)
+    LOCAL_BACKEND_MS_PER_TOKEN   Latency per input token (default: 0)
+    LOCAL_BACKEND_JITTER         Sigma of the log-normal latency factor (default: 0)
+    LOCAL_BACKEND_ERROR_RATES    Error probabilities per request, e.g.
+                                 "429=0.02,503=0.01,timeout=0.005" (default: none)
+    LOCAL_BACKEND_SEED           Seed for latency and errors (default: random)
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+import threading
+import functools
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+
+from .real_translation import PROMPT_VERSION
+from .real_translation import stream_translate_text as openai_stream_translate_text
+from .real_translation import translate_text as openai_translate_text
+from .retry import acall_with_retry, call_with_retry
+from .token_budget import count_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "openai"
+
+
+class TranslationBackend(ABC):
+    """Base class for translation engines."""
+
+    name = ""
+
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Model identifier, used in cache keys and response metadata."""
+
+    @property
+    @abstractmethod
+    def prompt_version(self) -> str:
+        """Version of the backend's output for the same input (cache keys)."""
+
+    @abstractmethod
+    def translate(self, text: str, source_lang: str, target_lang: str, doc_type: str = "general") -> str:
+        """
+        Translate a document.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            doc_type: Document type
+
+        Returns:
+            Translated text
+
+        Raises:
+            RuntimeError: If the translation fails
+        """
+
+    async def stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str = "general"
+    ) -> AsyncIterator[str]:
+        """
+        Translate a document, yielding the translation in deltas.
+
+        Backends without streaming yield the whole translation at once.
+        """
+        yield await asyncio.to_thread(self.translate, text, source_lang, target_lang, doc_type)
+
+
+class OpenAIBackend(TranslationBackend):
+    """Translation with the OpenAI chat completions API."""
+
+    name = "openai"
+
+    @property
+    def model(self) -> str:
+        return os.getenv("OPENAI_MODEL", "gpt-4o")
+
+    @property
+    def prompt_version(self) -> str:
+        return PROMPT_VERSION
+
+    def translate(self, text: str, source_lang: str, target_lang: str, doc_type: str = "general") -> str:
+        return openai_translate_text(text, source_lang, target_lang, doc_type)
+
+    async def stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str = "general"
+    ) -> AsyncIterator[str]:
+        async for delta in openai_stream_translate_text(text, source_lang, target_lang, doc_type):
+            yield delta
+
+
+# One row per term: the same word in each language
+LOCAL_LEXICON: List[Dict[str, str]] = [
+    {"en": "certificate", "es": "certificado", "fr": "certificat", "de": "Urkunde", "it": "certificato"},
+    {"en": "birth", "es": "nacimiento", "fr": "naissance", "de": "Geburt", "it": "nascita"},
+    {"en": "marriage", "es": "matrimonio", "fr": "mariage", "de": "Ehe", "it": "matrimonio"},
+    {"en": "death", "es": "defunción", "fr": "décès", "de": "Tod", "it": "morte"},
+    {"en": "passport", "es": "pasaporte", "fr": "passeport", "de": "Reisepass", "it": "passaporto"},
+    {"en": "document", "es": "documento", "fr": "document", "de": "Dokument", "it": "documento"},
+    {"en": "registry", "es": "registro", "fr": "registre", "de": "Register", "it": "registro"},
+    {"en": "civil", "es": "civil", "fr": "civil", "de": "zivil", "it": "civile"},
+    {"en": "name", "es": "nombre", "fr": "nom", "de": "Name", "it": "nome"},
+    {"en": "surname", "es": "apellido", "fr": "patronyme", "de": "Nachname", "it": "cognome"},
+    {"en": "surnames", "es": "apellidos", "fr": "patronymes", "de": "Nachnamen", "it": "cognomi"},
+    {"en": "date", "es": "fecha", "fr": "date", "de": "Datum", "it": "data"},
+    {"en": "place", "es": "lugar", "fr": "lieu", "de": "Ort", "it": "luogo"},
+    {"en": "father", "es": "padre", "fr": "père", "de": "Vater", "it": "padre"},
+    {"en": "mother", "es": "madre", "fr": "mère", "de": "Mutter", "it": "madre"},
+    {"en": "sex", "es": "sexo", "fr": "sexe", "de": "Geschlecht", "it": "sesso"},
+    {"en": "male", "es": "masculino", "fr": "masculin", "de": "männlich", "it": "maschile"},
+    {"en": "female", "es": "femenino", "fr": "féminin", "de": "weiblich", "it": "femminile"},
+    {"en": "nationality", "es": "nacionalidad", "fr": "nationalité", "de": "Staatsangehörigkeit", "it": "nazionalità"},
+    {"en": "address", "es": "domicilio", "fr": "adresse", "de": "Anschrift", "it": "indirizzo"},
+    {"en": "number", "es": "número", "fr": "numéro", "de": "Nummer", "it": "numero"},
+    {"en": "issued", "es": "expedido", "fr": "délivré", "de": "ausgestellt", "it": "rilasciato"},
+    {"en": "expiry", "es": "caducidad", "fr": "expiration", "de": "Ablauf", "it": "scadenza"},
+    {"en": "signature", "es": "firma", "fr": "signature", "de": "Unterschrift", "it": "firma"},
+    {"en": "official", "es": "oficial", "fr": "officiel", "de": "amtlich", "it": "ufficiale"},
+    {"en": "seal", "es": "sello", "fr": "sceau", "de": "Siegel", "it": "timbro"},
+    {"en": "section", "es": "sección", "fr": "section", "de": "Abschnitt", "it": "sezione"},
+    {"en": "line", "es": "línea", "fr": "ligne", "de": "Zeile", "it": "riga"},
+    {"en": "page", "es": "página", "fr": "page", "de": "Seite", "it": "pagina"},
+    {"en": "email", "es": "correo", "fr": "courriel", "de": "E-Mail", "it": "email"},
+    {"en": "phone", "es": "teléfono", "fr": "téléphone", "de": "Telefon", "it": "telefono"},
+    {"en": "and", "es": "y", "fr": "et", "de": "und", "it": "e"},
+    {"en": "of", "es": "de", "fr": "de", "de": "von", "it": "di"},
+    {"en": "the", "es": "el", "fr": "le", "de": "der", "it": "il"},
+    {"en": "the", "es": "la", "fr": "la", "de": "die", "it": "la"},
+    {"en": "in", "es": "en", "fr": "en", "de": "in", "it": "in"},
+    {"en": "with", "es": "con", "fr": "avec", "de": "mit", "it": "con"},
+    {"en": "for", "es": "para", "fr": "pour", "de": "für", "it": "per"},
+]
+
+# Whitespace-separated pieces containing these are copied unchanged
+PROTECTED_PATTERN = re.compile(r"[*@\d]|\[\[")
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+LOCAL_ERRORS = ("429", "503", "timeout")
+_SYNTHETIC_REQUEST = httpx.Request("POST", "http://local-backend/v1/chat/completions")
+
+
+@functools.lru_cache(maxsize=64)
+def _lexicon(source_lang: str, target_lang: str) -> Dict[str, str]:
+    """Word map for a language pair; the first row wins for ambiguous words."""
+    words: Dict[str, str] = {}
+    for row in LOCAL_LEXICON:
+        if source_lang in row and target_lang in row:
+            words.setdefault(row[source_lang].lower(), row[target_lang])
+    return words
+
+
+def _match_case(word: str, translation: str) -> str:
+    if word.isupper() and len(word) > 1:
+        return translation.upper()
+    if word[0].isupper():
+        return translation[0].upper() + translation[1:]
+    return translation
+
+
+def local_translate(text: str, source_lang: str, target_lang: str) -> str:
+    """
+    Translate text word by word with LOCAL_LEXICON.
+
+    Args:
+        text: Text to translate
+        source_lang: Source language code
+        target_lang: Target language code
+
+    Returns:
+        The text with known words replaced; unknown words, numbers, masked
+        PII, placeholders, punctuation and whitespace are unchanged
+    """
+    words = _lexicon(source_lang, target_lang)
+    if not words:
+        return text
+
+    def word(match: "re.Match") -> str:
+        translation = words.get(match.group(0).lower())
+        return _match_case(match.group(0), translation) if translation else match.group(0)
+
+    return "".join(
+        piece if piece.isspace() or PROTECTED_PATTERN.search(piece) else WORD_PATTERN.sub(word, piece)
+        for piece in re.split(r"(\s+)", text)
+    )
+
+
+def parse_error_rates(value: str) -> List[Tuple[str, float]]:
+    """
+    Parse LOCAL_BACKEND_ERROR_RATES.
+
+    Args:
+        value: Comma-separated kind=probability pairs (kinds: 429, 503, timeout)
+
+    Returns:
+        [(kind, probability), ...]
+
+    Raises:
+        ValueError: For unknown kinds or malformed probabilities
+    """
+    rates = []
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        kind, _, probability = item.partition("=")
+        if kind not in LOCAL_ERRORS:
+            raise ValueError(f"Unknown local backend error '{kind}' (use {', '.join(LOCAL_ERRORS)})")
+        rates.append((kind, float(probability)))
+    return rates
+
+
+def _synthetic_error(kind: str) -> Exception:
+    if kind == "timeout":
+        return openai.APITimeoutError(request=_SYNTHETIC_REQUEST)
+    response = httpx.Response(int(kind), request=_SYNTHETIC_REQUEST)
+    if kind == "429":
+        return openai.RateLimitError("Local backend: simulated rate limit", response=response, body=None)
+    return openai.InternalServerError("Local backend: simulated server error", response=response, body=None)
+
+
+class LocalBackend(TranslationBackend):
+    """Deterministic offline translation with simulated latency and errors."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        ms_per_token: float = 0,
+        jitter: float = 0,
+        error_rates: Optional[List[Tuple[str, float]]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the local backend.
+
+        Args:
+            latency_ms: Fixed latency per request in milliseconds
+            ms_per_token: Latency per input token in milliseconds
+            jitter: Sigma of the log-normal factor on the latency (0: none)
+            error_rates: [(kind, probability), ...] with kinds 429, 503, timeout
+            seed: Seed for latency jitter and errors (None: random)
+        """
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.jitter = jitter
+        self.error_rates = error_rates or []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> str:
+        return "local-dictionary"
+
+    @property
+    def prompt_version(self) -> str:
+        return "1"
+
+    def _attempt(self, text: str) -> Tuple[float, Optional[Exception]]:
+        """Draw one request's latency in seconds and its error, if any."""
+        with self._lock:
+            factor = self._random.lognormvariate(0, self.jitter) if self.jitter else 1.0
+            roll = self._random.random()
+        latency = (self.latency_ms + self.ms_per_token * count_tokens(text)) * factor / 1000
+        for kind, probability in self.error_rates:
+            if roll < probability:
+                # Rate limits are rejected before any work is done
+                return (0.0 if kind == "429" else latency), _synthetic_error(kind)
+            roll -= probability
+        return latency, None
+
+    def translate(self, text: str, source_lang: str, target_lang: str, doc_type: str = "general") -> str:
+        def request() -> str:
+            latency, error = self._attempt(text)
+            time.sleep(latency)
+            if error is not None:
+                raise error
+            return local_translate(text, source_lang, target_lang)
+
+        try:
+            return call_with_retry(request)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            raise RuntimeError(f"Translation failed: {str(e)}")
+
+    async def stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str = "general"
+    ) -> AsyncIterator[str]:
+        async def request() -> float:
+            latency, error = self._attempt(text)
+            if error is not None:
+                await asyncio.sleep(latency)
+                raise error
+            return latency
+
+        try:
+            latency = await acall_with_retry(request)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            raise RuntimeError(f"Translation failed: {str(e)}")
+
+        # Spread the latency over the lines, like a model generating them
+        lines = text.splitlines(keepends=True) or [text]
+        for line in lines:
+            await asyncio.sleep(latency * len(line) / max(len(text), 1))
+            yield local_translate(line, source_lang, target_lang)
+
+
+def _local_backend_from_env() -> LocalBackend:
+    seed = os.getenv("LOCAL_BACKEND_SEED")
+    return LocalBackend(
+        latency_ms=float(os.getenv("LOCAL_BACKEND_LATENCY_MS", "0")),
+        ms_per_token=float(os.getenv("LOCAL_BACKEND_MS_PER_TOKEN", "0")),
+        jitter=float(os.getenv("LOCAL_BACKEND_JITTER", "0")),
+        error_rates=parse_error_rates(os.getenv("LOCAL_BACKEND_ERROR_RATES", "")),
+        seed=int(seed) if seed else None
+    )
+
+
+_factories: Dict[str, Callable[[], TranslationBackend]] = {
+    "openai": OpenAIBackend,
+    "local": _local_backend_from_env,
+}
+_backends: Dict[str, TranslationBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], TranslationBackend]) -> None:
+    """
+    Make a backend selectable with TRANSLATION_BACKEND=name.
+
+    Args:
+        name: Backend name
+        factory: Called once, on first use, to create the backend
+    """
+    with _backends_lock:
+        _factories[name] = factory
+        _backends.pop(name, None)
+
+
+def get_translation_backend() -> TranslationBackend:
+    """
+    Return the backend selected by TRANSLATION_BACKEND.
+
+    Returns:
+        Shared backend instance
+
+    Raises:
+        ValueError: If TRANSLATION_BACKEND names no registered backend
+    """
+    name = os.getenv("TRANSLATION_BACKEND", DEFAULT_BACKEND).lower()
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            if name not in _factories:
+                raise ValueError(
+                    f"Unknown TRANSLATION_BACKEND '{name}' (available: {', '.join(sorted(_factories))})"
+                )
+            backend = _backends[name] = _factories[name]()
+            logger.info(f"Translation backend: {name} ({backend.model})")
+        return backend
+
+
+def translate_text(text: str, source_lang: str, target_lang: str, doc_type: str = "general") -> str:
+    """Translate text with the configured backend (see TranslationBackend.translate)."""
+    return get_translation_backend().translate(text, source_lang, target_lang, doc_type)
+
+
+async def stream_translate_text(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str = "general"
+) -> AsyncIterator[str]:
+    """Stream a translation from the configured backend (see TranslationBackend.stream)."""
+    async for delta in get_translation_backend().stream(text, source_lang, target_lang, doc_type):
+        yield delta
@@ -0,0 +1,152 @@
+"""
+OpenAI Clients: Shared pooled OpenAI clients for all translations.
+
+translate_text built a new RealTranslationTool for every translation, and
+with it a new OpenAI client with its own connection pool, so every
+translation paid for a TCP and TLS handshake and concurrent translations
+opened a socket each.
+
+This module keeps one OpenAI client (used by run() in the translation thread
+pool) and one AsyncOpenAI client (used by stream()) per API key and base URL,
+with:
+- a bounded connection pool with keep-alive
+- separate connect and read timeouts
+- no SDK retries (completions are retried in retry.py)
+- warm-up at server startup (warm_up_openai_clients, called from the
+  lifespan hook), which opens the first keep-alive connections
+
+Configuration (environment):
+    OPENAI_BASE_URL          API base URL (default: https://api.openai.com/v1)
+    OPENAI_MAX_CONNECTIONS   Pool size per client (default: 50)
+    OPENAI_MAX_KEEPALIVE     Idle connections kept open (default: 20)
+    OPENAI_KEEPALIVE_EXPIRY  Idle connection lifetime in seconds (default: 60)
+    OPENAI_CONNECT_TIMEOUT   Connect timeout in seconds (default: 10)
+    OPENAI_TIMEOUT_SECONDS   Read timeout in seconds (default: 120)
+    OPENAI_WARMUP            Open connections at startup (default: true)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+_clients: Dict[Tuple[Optional[str], str], OpenAI] = {}
+_async_clients: Dict[Tuple[Optional[str], str], AsyncOpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def _client_key(api_key: Optional[str], base_url: Optional[str]) -> Tuple[Optional[str], str]:
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    base_url = str(base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+    return api_key, base_url
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120")),
+        connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10")),
+    )
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> OpenAI:
+    """
+    Return the shared OpenAI client for an API key and base URL.
+
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY)
+        base_url: API base URL (default: OPENAI_BASE_URL or the OpenAI API)
+
+    Returns:
+        OpenAI client with a pooled keep-alive HTTP client (do not close it)
+    """
+    key = _client_key(api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = OpenAI(
+                api_key=key[0],
+                base_url=key[1],
+                http_client=DefaultHttpxClient(limits=_limits(), timeout=_timeout()),
+                max_retries=0,  # Retried with backoff and a deadline in retry.py
+            )
+        return client
+
+
+def get_async_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for an API key and base URL.
+
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY)
+        base_url: API base URL (default: OPENAI_BASE_URL or the OpenAI API)
+
+    Returns:
+        AsyncOpenAI client with a pooled keep-alive HTTP client (do not close it)
+    """
+    key = _client_key(api_key, base_url)
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = _async_clients[key] = AsyncOpenAI(
+                api_key=key[0],
+                base_url=key[1],
+                http_client=DefaultAsyncHttpxClient(limits=_limits(), timeout=_timeout()),
+                max_retries=0,
+            )
+        return client
+
+
+async def warm_up_openai_clients() -> None:
+    """
+    Create the default clients and open their first keep-alive connections.
+
+    Does nothing without OPENAI_API_KEY. Sends one models.list() request
+    per client unless OPENAI_WARMUP is false. Failures are logged, not
+    raised: a translation opens its own connection if warm-up did not.
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        return
+    client = get_openai_client()
+    async_client = get_async_openai_client()
+    if os.getenv("OPENAI_WARMUP", "true").lower() not in ("1", "true", "yes"):
+        return
+
+    results = await asyncio.gather(
+        asyncio.to_thread(client.with_options(max_retries=0).models.list),
+        async_client.with_options(max_retries=0).models.list(),
+        return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        logger.warning(f"⚠️  OpenAI connection warm-up failed: {failures[0]}")
+    else:
+        logger.info(f"   OpenAI connections warmed up ({client.base_url})")
+
+
+async def close_openai_clients() -> None:
+    """Close the shared clients and their pooled connections."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        async_clients = list(_async_clients.values())
+        _clients.clear()
+        _async_clients.clear()
+    for client in clients:
+        client.close()
+    for async_client in async_clients:
+        await async_client.close()
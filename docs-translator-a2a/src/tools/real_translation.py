@@ -3,15 +3,259 @@ Real Translation Tool using OpenAI API.
 
 This tool provides actual translation capabilities (not mocked) for CrewAI agents.
 Uses the same OpenAI GPT-4o model as the production Docs Translator SaaS.
+
+Long documents are translated in chunks: a single completion is capped at
+MAX_OUTPUT_TOKENS (longer output used to be cut off silently) and generates
+the whole document serially. Documents above TRANSLATION_CHUNK_TOKENS (or
+above the input whose predicted translation fits under the output cap, see
+token_budget.py) are split on "---" sections, then paragraphs, then lines,
+into chunks under that budget. Up to TRANSLATION_CHUNK_WORKERS chunks are
+translated at once, each with the end of the previous chunk as context, and
+the translations are joined in order with the original separators. Blocking
+translations share one process-wide pool of TRANSLATION_CHUNK_WORKERS
+threads, so concurrent documents queue for it instead of each starting its
+own threads; a streamed document runs up to that many chunk requests itself. A completion that still hits
+the output cap is an error, never a truncated translation.
+
+Each completion reserves max_tokens sized from its input tokens and the
+language pair instead of the full cap; a completion cut off at that size is
+repeated once with the full cap. The single streamed completion of a short
+document keeps the full cap, since streamed text cannot be requested again.
+
+Rate limits, 5xx errors and timeouts are retried with backoff (retry.py),
+per completion, so one failed chunk does not fail the document.
+
+Masked PII (***-**-****-X, m*************@ejemplo.es) is sent as numbered
+placeholders ([[M1]], [[M2]], ...): asterisk runs cost many tokens and the
+model sometimes altered them. The masks are put back after translation, and
+every placeholder must come back exactly once; otherwise the text is
+translated again with the masks inline.
+
+Configuration (environment):
+    TRANSLATION_CHUNK_TOKENS         Estimated tokens per chunk (default: 1500)
+    TRANSLATION_CHUNK_WORKERS        Chunks translated at once (default: 4)
+    TRANSLATION_CHUNK_CONTEXT_CHARS  Preceding text given as context (default: 300)
 """
 
 import os
+import re
+import asyncio
 import logging
-from typing import Optional
-from openai import OpenAI
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from openai import AsyncOpenAI, OpenAI
+
+from .openai_clients import get_async_openai_client, get_openai_client
+from .retry import acall_with_retry, call_with_retry
+from .token_budget import (
+    MAX_OUTPUT_TOKENS,
+    chunk_token_budget,
+    count_message_tokens,
+    count_tokens,
+    get_token_usage,
+    max_output_tokens
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever build_messages changes: cached translations are keyed by it
+PROMPT_VERSION = "3"
+
+CHUNK_TOKENS = int(os.getenv("TRANSLATION_CHUNK_TOKENS", "1500"))
+CHUNK_WORKERS = int(os.getenv("TRANSLATION_CHUNK_WORKERS", "4"))
+CHUNK_CONTEXT_CHARS = int(os.getenv("TRANSLATION_CHUNK_CONTEXT_CHARS", "300"))
+
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_chunk_executor_lock = threading.Lock()
+
+
+def get_chunk_executor() -> ThreadPoolExecutor:
+    """Return the chunk translation thread pool, creating it on first use."""
+    global _chunk_executor
+    with _chunk_executor_lock:
+        if _chunk_executor is None:
+            _chunk_executor = ThreadPoolExecutor(
+                max_workers=max(1, CHUNK_WORKERS),
+                thread_name_prefix="translate-chunk"
+            )
+        return _chunk_executor
+
+# Chunk boundaries, coarsest first: "---" sections, paragraphs, lines
+CHUNK_BOUNDARIES = [
+    re.compile(r"((?:\n[ \t]*)*\n[ \t]*-{3,}[ \t]*\n(?:[ \t]*\n)*)"),
+    re.compile(r"(\n(?:[ \t]*\n)+)"),
+    re.compile(r"(\n)"),
+]
+
+
+class ChunkTranslationError(RuntimeError):
+    """Raised when some chunks of a chunked translation failed."""
+
+    def __init__(self, failures: Dict[int, str], total: int):
+        """
+        Args:
+            failures: Error message per failed chunk index
+            total: Number of chunks in the document
+        """
+        self.failures = failures
+        self.total = total
+        details = "; ".join(f"chunk {index + 1}: {error}" for index, error in sorted(failures.items()))
+        super().__init__(f"Translation failed: {len(failures)} of {total} chunks failed ({details})")
+
+
+def split_chunks(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """
+    Split text into chunks of at most max_tokens on structural boundaries.
+
+    Args:
+        text: Document text
+        max_tokens: Token budget per chunk (see token_budget.count_tokens)
+
+    Returns:
+        [(chunk, separator), ...] where separator is the text between the
+        chunk and the next one; joining chunk + separator gives back text
+    """
+    chunks: List[List[Any]] = []
+    for piece, separator, tokens in _split_pieces(text, max_tokens, 0):
+        if chunks:
+            merged_tokens = chunks[-1][2] + count_tokens(chunks[-1][1]) + tokens
+            if merged_tokens <= max_tokens:
+                chunks[-1] = [chunks[-1][0] + chunks[-1][1] + piece, separator, merged_tokens]
+                continue
+        chunks.append([piece, separator, tokens])
+    return [(chunk, separator) for chunk, separator, _ in chunks]
+
+
+def _split_pieces(text: str, max_tokens: int, level: int) -> List[List[Any]]:
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return [[text, "", tokens]]
+    if level == len(CHUNK_BOUNDARIES):
+        # A single line over budget: split between words (at least 2 characters per token)
+        pieces = []
+        max_chars = max_tokens * 2
+        while count_tokens(text) > max_tokens:
+            cut = text.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append([text[:cut], "", count_tokens(text[:cut])])
+            text = text[cut:]
+        return pieces + [[text, "", count_tokens(text)]]
+
+    parts = CHUNK_BOUNDARIES[level].split(text)
+    pieces = []
+    for index in range(0, len(parts), 2):
+        sub_pieces = _split_pieces(parts[index], max_tokens, level + 1)
+        if index + 1 < len(parts):
+            sub_pieces[-1][1] += parts[index + 1]
+        pieces.extend(sub_pieces)
+    return pieces
+
+
+# Masked PII: a run of 3+ asterisks with the word characters, hyphens, dots
+# and @ attached to it (***-**-****-X, m****@ejemplo.es), but not brackets
+# or punctuation around it, which the model should still see and translate
+MASK_PATTERN = re.compile(r"[\w.@-]*\*{3,}(?:[\w.@*-]*[\w*])?")
+PLACEHOLDER_PATTERN = re.compile(r"\[\[M(\d+)\]\]")
+# Longest placeholder held back while streaming ("[[M9999]]")
+PLACEHOLDER_MAX_CHARS = 9
+
+
+def compress_masks(text: str) -> Tuple[str, List[str]]:
+    """
+    Replace each masked PII run with a numbered placeholder.
+
+    Args:
+        text: Text to translate
+
+    Returns:
+        (text with [[M1]], [[M2]], ... placeholders, masks in placeholder
+        order); text is returned unchanged if it already contains
+        placeholder-like tokens
+    """
+    if PLACEHOLDER_PATTERN.search(text):
+        return text, []
+    masks: List[str] = []
+
+    def placeholder(match: "re.Match") -> str:
+        masks.append(match.group(0))
+        return f"[[M{len(masks)}]]"
+
+    return MASK_PATTERN.sub(placeholder, text), masks
+
+
+def restore_masks(text: str, masks: List[str]) -> Optional[str]:
+    """
+    Put masks back in place of their placeholders.
+
+    Args:
+        text: Translated text with placeholders
+        masks: Masks returned by compress_masks
+
+    Returns:
+        Text with the masks restored, or None unless every placeholder
+        appears exactly once
+    """
+    if not masks:
+        return text
+    found = sorted(int(number) for number in PLACEHOLDER_PATTERN.findall(text))
+    if found != list(range(1, len(masks) + 1)):
+        return None
+    return PLACEHOLDER_PATTERN.sub(lambda match: masks[int(match.group(1)) - 1], text)
+
+
+class _StreamingMaskRestorer:
+    """Restores placeholders in streamed deltas, holding back split placeholders."""
+
+    def __init__(self, masks: List[str]):
+        self.masks = masks
+        self.found: List[int] = []
+        self._pending = ""
+
+    def feed(self, delta: str) -> str:
+        """Return the text of delta (and earlier held-back text) that is safe to emit."""
+        self._pending += delta
+        start = self._pending.rfind("[")
+        if start > 0 and self._pending[start - 1] == "[":
+            start -= 1
+        if start == -1 or "]]" in self._pending[start:] or len(self._pending) - start >= PLACEHOLDER_MAX_CHARS:
+            start = len(self._pending)
+        ready, self._pending = self._pending[:start], self._pending[start:]
+        return self._restore(ready)
+
+    def flush(self) -> str:
+        """Return the held-back text at the end of the stream."""
+        ready, self._pending = self._pending, ""
+        return self._restore(ready)
+
+    @property
+    def complete(self) -> bool:
+        """True if every placeholder was seen exactly once."""
+        return sorted(self.found) == list(range(1, len(self.masks) + 1))
+
+    def _restore(self, text: str) -> str:
+        def mask(match: "re.Match") -> str:
+            number = int(match.group(1))
+            if not 1 <= number <= len(self.masks):
+                return match.group(0)
+            self.found.append(number)
+            return self.masks[number - 1]
+        return PLACEHOLDER_PATTERN.sub(mask, text)
+
+
+def chunk_context(chunks: List[Tuple[str, str]], index: int) -> Optional[str]:
+    """Return the end of the chunk before index (from a line start), or None."""
+    if index == 0 or CHUNK_CONTEXT_CHARS <= 0:
+        return None
+    previous = chunks[index - 1][0]
+    if len(previous) <= CHUNK_CONTEXT_CHARS:
+        return previous.strip() or None
+    tail = previous[-CHUNK_CONTEXT_CHARS:]
+    newline = tail.find("\n")
+    if 0 <= newline < len(tail) - 1:
+        tail = tail[newline + 1:]
+    return tail.strip() or None
+
 
 class RealTranslationTool:
     """
@@ -27,10 +271,84 @@ class RealTranslationTool:
         "Use this tool when you need to translate documents."
     )
 
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, client: Optional[OpenAI] = None, async_client: Optional[AsyncOpenAI] = None):
+        """
+        Args:
+            client: OpenAI client (default: the shared client for OPENAI_API_KEY)
+            async_client: AsyncOpenAI client for stream() (default: the shared
+                client for the same API key and base URL)
+        """
+        self.client = client or get_openai_client()
+        self.async_client = async_client
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
 
+    def build_messages(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str = "general",
+        context: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a translation request.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            doc_type: Document type
+            context: Preceding source text, when text is a chunk of a longer
+                document (shown to the model, not translated)
+
+        Returns:
+            System and user messages for the chat completion
+        """
+        # Map language codes to full names for better prompt clarity
+        lang_names = {
+            "es": "Spanish",
+            "en": "English",
+            "pl": "Polish",
+            "he": "Hebrew",
+            "uk": "Ukrainian",
+            "ru": "Russian",
+            "fr": "French",
+            "de": "German",
+            "it": "Italian"
+        }
+
+        source_name = lang_names.get(source_lang, source_lang)
+        target_name = lang_names.get(target_lang, target_lang)
+
+        # Build translation prompt
+        system_prompt = f"""You are a professional document translator specializing in official government documents.
+
+Your task:
+- Translate the document from {source_name} to {target_name}
+- Preserve ALL formatting, structure, section headers, and line breaks
+- Keep masked PII patterns EXACTLY as they appear (e.g., ***-**-****-X, ESP-*****4321)
+- Keep placeholders such as [[M1]] EXACTLY as they appear, once each
+- Maintain professional, official tone appropriate for {doc_type}
+- Do NOT add explanations or comments
+- Return ONLY the translated document text"""
+
+        user_prompt = f"""Translate this {doc_type} from {source_name} to {target_name}:
+
+{text}"""
+        if context:
+            user_prompt = f"""This is a part of a longer {doc_type}. It follows this passage, which is context only (do NOT translate it or include it in your answer):
+
+{context}
+
+Translate this part of the {doc_type} from {source_name} to {target_name}:
+
+{text}"""
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
     def run(
         self,
         text: str,
@@ -41,6 +359,8 @@ class RealTranslationTool:
         """
         Translate text from source to target language.
 
+        Documents over the chunk budget are translated in concurrent chunks.
+
         Args:
             text: Text to translate
             source_lang: Source language code (e.g., "es" for Spanish)
@@ -49,6 +369,10 @@ class RealTranslationTool:
 
         Returns:
             Translated text with preserved formatting
+
+        Raises:
+            ChunkTranslationError: If some chunks failed (lists each failure)
+            RuntimeError: If the translation request fails
         """
         try:
             logger.info(
@@ -56,60 +380,254 @@ class RealTranslationTool:
                 f"length={len(text)} chars"
             )
 
-            # Map language codes to full names for better prompt clarity
-            lang_names = {
-                "es": "Spanish",
-                "en": "English",
-                "pl": "Polish",
-                "he": "Hebrew",
-                "uk": "Ukrainian",
-                "ru": "Russian",
-                "fr": "French",
-                "de": "German",
-                "it": "Italian"
-            }
-
-            source_name = lang_names.get(source_lang, source_lang)
-            target_name = lang_names.get(target_lang, target_lang)
-
-            # Build translation prompt
-            system_prompt = f"""You are a professional document translator specializing in official government documents.
+            chunks = split_chunks(text, chunk_token_budget(CHUNK_TOKENS, source_lang, target_lang))
+            if len(chunks) > 1:
+                translated_text = self._run_chunks(chunks, source_lang, target_lang, doc_type)
+            else:
+                translated_text = self._translate(text, source_lang, target_lang, doc_type)
 
-Your task:
-- Translate the document from {source_name} to {target_name}
-- Preserve ALL formatting, structure, section headers, and line breaks
-- Keep masked PII patterns EXACTLY as they appear (e.g., ***-**-****-X, ESP-*****4321)
-- Maintain professional, official tone appropriate for {doc_type}
-- Do NOT add explanations or comments
-- Return ONLY the translated document text"""
+            logger.info(
+                f"Translation completed: {len(text)} -> {len(translated_text)} chars"
+            )
 
-            user_prompt = f"""Translate this {doc_type} from {source_name} to {target_name}:
+            return translated_text
 
-{text}"""
+        except ChunkTranslationError as e:
+            logger.error(str(e))
+            raise
 
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Low temperature for consistent, accurate translation
-                max_tokens=4096
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            raise RuntimeError(f"Translation failed: {str(e)}")
+
+    def _translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str,
+        context: Optional[str] = None
+    ) -> str:
+        compressed, masks = compress_masks(text)
+        max_tokens = max_output_tokens(count_tokens(compressed, self.model), source_lang, target_lang)
+        translated_text = restore_masks(
+            self._complete(self.build_messages(compressed, source_lang, target_lang, doc_type, context), max_tokens),
+            masks
+        )
+        if translated_text is None:
+            logger.warning(f"Masked PII placeholders not preserved ({len(masks)} masks), retrying with masks inline")
+            translated_text = self._complete(
+                self.build_messages(text, source_lang, target_lang, doc_type, context), max_tokens
             )
+        return translated_text
 
-            translated_text = response.choices[0].message.content.strip()
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
+        # Call OpenAI API
+        response = call_with_retry(lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.3,  # Low temperature for consistent, accurate translation
+            max_tokens=max_tokens
+        ))
+        get_token_usage().record(
+            count_message_tokens(messages, self.model), max_tokens, getattr(response, "usage", None)
+        )
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            if max_tokens < MAX_OUTPUT_TOKENS:
+                logger.warning(f"Output reached max_tokens={max_tokens}, retrying with {MAX_OUTPUT_TOKENS}")
+                get_token_usage().record_truncation_retry()
+                return self._complete(messages, MAX_OUTPUT_TOKENS)
+            raise RuntimeError(f"output truncated at max_tokens={MAX_OUTPUT_TOKENS}")
+        return choice.message.content.strip()
 
-            logger.info(
-                f"Translation completed: {len(text)} -> {len(translated_text)} chars"
+    def _run_chunks(
+        self,
+        chunks: List[Tuple[str, str]],
+        source_lang: str,
+        target_lang: str,
+        doc_type: str
+    ) -> str:
+        logger.info(f"Translating {len(chunks)} chunks, {CHUNK_WORKERS} at a time")
+
+        def translate_chunk(index: int) -> str:
+            chunk = chunks[index][0]
+            if not chunk.strip():
+                return chunk
+            return self._translate(
+                chunk, source_lang, target_lang, doc_type, context=chunk_context(chunks, index)
             )
 
-            return translated_text
+        translations: Dict[int, str] = {}
+        failures: Dict[int, str] = {}
+        pool = get_chunk_executor()
+        futures = {pool.submit(translate_chunk, index): index for index in range(len(chunks))}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                translations[index] = future.result()
+            except Exception as e:
+                failures[index] = str(e)
+
+        if failures:
+            raise ChunkTranslationError(failures, len(chunks))
+        return "".join(translations[index] + chunks[index][1] for index in range(len(chunks))).strip()
 
+    async def stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str = "general"
+    ) -> AsyncIterator[str]:
+        """
+        Translate text, yielding the translation as the model produces it.
+
+        Documents over the chunk budget are translated in concurrent chunks,
+        each yielded whole as soon as it and the chunks before it are done.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code (e.g., "es" for Spanish)
+            target_lang: Target language code (e.g., "en" for English)
+            doc_type: Document type (birth_certificate, passport, etc.)
+
+        Yields:
+            Translated text deltas, in order
+
+        Raises:
+            ChunkTranslationError: If some chunks failed (lists each failure)
+            RuntimeError: If the translation request fails
+        """
+        logger.info(
+            f"Streaming {doc_type} translation from {source_lang} to {target_lang}, "
+            f"length={len(text)} chars"
+        )
+        if self.async_client is None:
+            self.async_client = get_async_openai_client(self.client.api_key, str(self.client.base_url))
+
+        chunks = split_chunks(text, chunk_token_budget(CHUNK_TOKENS, source_lang, target_lang))
+        if len(chunks) > 1:
+            async for delta in self._stream_chunks(chunks, source_lang, target_lang, doc_type):
+                yield delta
+            return
+
+        compressed, masks = compress_masks(text)
+        restorer = _StreamingMaskRestorer(masks)
+        messages = self.build_messages(compressed, source_lang, target_lang, doc_type)
+        try:
+            # Only opening the stream is retried: deltas already yielded cannot be taken back
+            response = await acall_with_retry(lambda: self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=MAX_OUTPUT_TOKENS,
+                stream=True,
+                stream_options={"include_usage": True}
+            ))
+            async for chunk in response:
+                if getattr(chunk, "usage", None) is not None:
+                    get_token_usage().record(
+                        count_message_tokens(messages, self.model), MAX_OUTPUT_TOKENS, chunk.usage
+                    )
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = restorer.feed(chunk.choices[0].delta.content)
+                    if delta:
+                        yield delta
+                if chunk.choices and chunk.choices[0].finish_reason == "length":
+                    raise RuntimeError(f"output truncated at max_tokens={MAX_OUTPUT_TOKENS}")
         except Exception as e:
             logger.error(f"Translation error: {e}")
             raise RuntimeError(f"Translation failed: {str(e)}")
 
+        delta = restorer.flush()
+        if delta:
+            yield delta
+        if not restorer.complete:
+            # Already streamed: flagged by the pii_preserved validation check
+            logger.warning(f"Masked PII placeholders not preserved in stream ({len(masks)} masks)")
+
+    async def _atranslate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        doc_type: str,
+        context: Optional[str] = None
+    ) -> str:
+        compressed, masks = compress_masks(text)
+        max_tokens = max_output_tokens(count_tokens(compressed, self.model), source_lang, target_lang)
+        translated_text = restore_masks(
+            await self._acomplete(
+                self.build_messages(compressed, source_lang, target_lang, doc_type, context), max_tokens
+            ),
+            masks
+        )
+        if translated_text is None:
+            logger.warning(f"Masked PII placeholders not preserved ({len(masks)} masks), retrying with masks inline")
+            translated_text = await self._acomplete(
+                self.build_messages(text, source_lang, target_lang, doc_type, context), max_tokens
+            )
+        return translated_text
+
+    async def _acomplete(self, messages: List[Dict[str, str]], max_tokens: int = MAX_OUTPUT_TOKENS) -> str:
+        response = await acall_with_retry(lambda: self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=max_tokens
+        ))
+        get_token_usage().record(
+            count_message_tokens(messages, self.model), max_tokens, getattr(response, "usage", None)
+        )
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            if max_tokens < MAX_OUTPUT_TOKENS:
+                logger.warning(f"Output reached max_tokens={max_tokens}, retrying with {MAX_OUTPUT_TOKENS}")
+                get_token_usage().record_truncation_retry()
+                return await self._acomplete(messages, MAX_OUTPUT_TOKENS)
+            raise RuntimeError(f"output truncated at max_tokens={MAX_OUTPUT_TOKENS}")
+        return choice.message.content.strip()
+
+    async def _stream_chunks(
+        self,
+        chunks: List[Tuple[str, str]],
+        source_lang: str,
+        target_lang: str,
+        doc_type: str
+    ) -> AsyncIterator[str]:
+        logger.info(f"Streaming {len(chunks)} chunks, {CHUNK_WORKERS} at a time")
+        semaphore = asyncio.Semaphore(max(1, CHUNK_WORKERS))
+
+        async def translate_chunk(index: int) -> str:
+            chunk = chunks[index][0]
+            if not chunk.strip():
+                return chunk
+            async with semaphore:
+                return await self._atranslate(
+                    chunk, source_lang, target_lang, doc_type, context=chunk_context(chunks, index)
+                )
+
+        tasks = [asyncio.ensure_future(translate_chunk(index)) for index in range(len(chunks))]
+        failures: Dict[int, str] = {}
+        try:
+            for index, task in enumerate(tasks):
+                try:
+                    translation = await task
+                except Exception as e:
+                    failures[index] = str(e)
+                    continue
+                if not failures:
+                    yield translation + chunks[index][1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if failures:
+            error = ChunkTranslationError(failures, len(chunks))
+            logger.error(str(error))
+            raise error
+
 
 # Standalone function for direct use (non-CrewAI contexts)
 def translate_text(
@@ -132,8 +650,29 @@ def translate_text(
     Returns:
         Translated text
     """
-    tool = RealTranslationTool()
-    if api_key:
-        tool.client = OpenAI(api_key=api_key)
+    tool = RealTranslationTool(get_openai_client(api_key))
 
     return tool.run(text, source_lang, target_lang, doc_type)
+
+
+async def stream_translate_text(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str = "general"
+) -> AsyncIterator[str]:
+    """
+    Standalone streaming translation function.
+
+    Args:
+        text: Text to translate
+        source_lang: Source language code
+        target_lang: Target language code
+        doc_type: Document type
+
+    Yields:
+        Translated text deltas
+    """
+    tool = RealTranslationTool()
+    async for delta in tool.stream(text, source_lang, target_lang, doc_type):
+        yield delta
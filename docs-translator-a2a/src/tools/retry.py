@@ -0,0 +1,253 @@
+"""
+Retry: Backoff and Retry-After handling for OpenAI requests.
+
+Any OpenAI error in a translation became a failed response, and A2A clients
+usually retried the whole document from scratch. A rate limit or a brief
+upstream outage cost a full round trip through the client's pipeline.
+
+Completions are now retried here, close to the model:
+- 429 rate limits wait for Retry-After (retry-after-ms or retry-after)
+  when the API sends it, else back off like other errors; an exhausted
+  quota (insufficient_quota) is not retried
+- 5xx errors, timeouts and connection errors back off exponentially with
+  full jitter (a random delay up to BASE_DELAY * 2^attempt, capped at
+  MAX_DELAY) so concurrent chunks do not retry in lockstep
+- every call has a total deadline; a wait that would overrun it is not
+  started and the last error is raised (an attempt already sent is bounded
+  by OPENAI_TIMEOUT_SECONDS, not cut off at the deadline)
+- other errors (400, 401, ...) are raised at once
+
+The OpenAI SDK's own retries are disabled on the shared clients
+(openai_clients.py) so requests are not retried twice. Retry counts per
+kind of error are exposed on /health.
+
+Configuration (environment):
+    OPENAI_RETRY_ATTEMPTS    Attempts per completion, first included (default: 4)
+    OPENAI_RETRY_BASE_DELAY  First backoff in seconds (default: 0.5)
+    OPENAI_RETRY_MAX_DELAY   Longest single wait in seconds (default: 20)
+    OPENAI_RETRY_DEADLINE    Total seconds per completion, waits included (default: 90)
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import email.utils
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRY_ATTEMPTS = int(os.getenv("OPENAI_RETRY_ATTEMPTS", "4"))
+BASE_DELAY = float(os.getenv("OPENAI_RETRY_BASE_DELAY", "0.5"))
+MAX_DELAY = float(os.getenv("OPENAI_RETRY_MAX_DELAY", "20"))
+DEADLINE_SECONDS = float(os.getenv("OPENAI_RETRY_DEADLINE", "90"))
+
+RATE_LIMIT = "rate_limit"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Return the kind of a retryable OpenAI error.
+
+    Args:
+        error: Exception raised by an OpenAI request
+
+    Returns:
+        RATE_LIMIT, SERVER_ERROR, TIMEOUT or CONNECTION; None if the error
+        is not worth retrying
+    """
+    if isinstance(error, openai.APITimeoutError):
+        return TIMEOUT
+    if isinstance(error, openai.APIConnectionError):
+        return CONNECTION
+    if isinstance(error, openai.RateLimitError):
+        return None if getattr(error, "code", None) == "insufficient_quota" else RATE_LIMIT
+    if isinstance(error, openai.APIStatusError) and error.status_code >= 500:
+        return SERVER_ERROR
+    return None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the wait the API asked for from an error response.
+
+    Args:
+        error: Exception raised by an OpenAI request
+
+    Returns:
+        Seconds from retry-after-ms, or retry-after (seconds or HTTP date);
+        None if the response has neither
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    retry_after_ms = response.headers.get("retry-after-ms")
+    retry_after = response.headers.get("retry-after")
+    try:
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+        if retry_after:
+            return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    if retry_after:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def backoff_delay(attempt: int, error: BaseException) -> float:
+    """
+    Return the wait before retrying after a failed attempt.
+
+    Args:
+        attempt: Attempts made so far (1 after the first failure)
+        error: The retryable error
+
+    Returns:
+        Retry-After for rate limits that send it (retrying sooner would
+        be rejected again), else a full-jitter exponential delay of at
+        most MAX_DELAY
+    """
+    if classify_error(error) == RATE_LIMIT:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** (attempt - 1)))
+
+
+class RetryStats:
+    """Retry counters across all OpenAI requests. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._retries = {RATE_LIMIT: 0, SERVER_ERROR: 0, TIMEOUT: 0, CONNECTION: 0}
+        self._recovered = 0
+        self._exhausted = 0
+        self._deadline_exceeded = 0
+
+    def record_retry(self, kind: str) -> None:
+        """Count a retry after an error of the given kind."""
+        with self._lock:
+            self._retries[kind] += 1
+
+    def record_recovered(self) -> None:
+        """Count a request that succeeded after retrying."""
+        with self._lock:
+            self._recovered += 1
+
+    def record_gave_up(self, deadline: bool) -> None:
+        """Count a request that failed after retrying (attempts or deadline)."""
+        with self._lock:
+            if deadline:
+                self._deadline_exceeded += 1
+            else:
+                self._exhausted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry counts for metrics."""
+        with self._lock:
+            return {
+                "retries": dict(self._retries),
+                "recovered": self._recovered,
+                "exhausted": self._exhausted,
+                "deadline_exceeded": self._deadline_exceeded,
+            }
+
+
+_stats = RetryStats()
+
+
+def get_retry_stats() -> RetryStats:
+    """Return the process-wide retry counters."""
+    return _stats
+
+
+def _next_delay(attempt: int, error: BaseException, deadline: float) -> Optional[float]:
+    """Record a failed attempt; return the wait before the next one, or None to give up."""
+    kind = classify_error(error)
+    if kind is None:
+        return None
+    if attempt >= RETRY_ATTEMPTS:
+        logger.warning(f"OpenAI request failed after {attempt} attempts: {error}")
+        _stats.record_gave_up(deadline=False)
+        return None
+    delay = backoff_delay(attempt, error)
+    if time.monotonic() + delay >= deadline:
+        logger.warning(f"OpenAI request failed, retry deadline reached after {attempt} attempts: {error}")
+        _stats.record_gave_up(deadline=True)
+        return None
+    _stats.record_retry(kind)
+    logger.info(f"OpenAI {kind} ({error}), retrying in {delay:.2f}s (attempt {attempt + 1}/{RETRY_ATTEMPTS})")
+    return delay
+
+
+def call_with_retry(call: Callable[[], T]) -> T:
+    """
+    Call an OpenAI request, retrying transient errors.
+
+    Args:
+        call: Function sending the request
+
+    Returns:
+        The call's result
+
+    Raises:
+        The last error if it is not retryable, or attempts or the deadline ran out
+    """
+    deadline = time.monotonic() + DEADLINE_SECONDS
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = call()
+        except Exception as e:
+            delay = _next_delay(attempt, e, deadline)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        if attempt > 1:
+            _stats.record_recovered()
+        return result
+
+
+async def acall_with_retry(call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await an OpenAI request, retrying transient errors.
+
+    Args:
+        call: Function returning the request coroutine (called per attempt)
+
+    Returns:
+        The call's result
+
+    Raises:
+        The last error if it is not retryable, or attempts or the deadline ran out
+    """
+    deadline = time.monotonic() + DEADLINE_SECONDS
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = await call()
+        except Exception as e:
+            delay = _next_delay(attempt, e, deadline)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        if attempt > 1:
+            _stats.record_recovered()
+        return result
@@ -0,0 +1,208 @@
+"""
+Token Budget: Token estimates and output budgets for translation requests.
+
+Every completion used to reserve max_tokens=4096 whatever the document size.
+OpenAI counts reserved output tokens against the tokens-per-minute limit, so
+short documents wasted rate-limit headroom. Nothing checked up front whether
+a long document's translation would fit either.
+
+This module estimates tokens locally:
+- with tiktoken when it is installed (exact counts for the model)
+- with a character heuristic otherwise (about 4 characters per token for
+  Latin script, 2 for other scripts)
+
+The output of a translation is predicted from the input tokens and the token
+density of the source and target languages (Ukrainian text needs about twice
+the tokens of the same English text). max_tokens is the prediction times a
+safety margin, capped at the model's output limit. The chunk budget is the
+largest input whose predicted output still fits under that limit.
+
+Estimated prompt tokens and reserved output tokens are recorded against the
+usage OpenAI reports, in TokenUsage (exposed on /health).
+
+Configuration (environment):
+    TRANSLATION_MAX_OUTPUT_TOKENS  Output cap per completion (default: 4096)
+    TRANSLATION_OUTPUT_MARGIN      Factor on the predicted output (default: 1.5)
+"""
+
+import os
+import math
+import logging
+import threading
+import functools
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency: character heuristic
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+MAX_OUTPUT_TOKENS = int(os.getenv("TRANSLATION_MAX_OUTPUT_TOKENS", "4096"))
+OUTPUT_MARGIN = float(os.getenv("TRANSLATION_OUTPUT_MARGIN", "1.5"))
+
+# Smallest max_tokens reserved for a completion
+MIN_OUTPUT_TOKENS = 256
+
+# Chat format tokens per message (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Tokens for the same text relative to English (GPT-4o tokenizer)
+LANGUAGE_TOKEN_RATIOS = {
+    "en": 1.0,
+    "es": 1.2,
+    "fr": 1.25,
+    "de": 1.25,
+    "it": 1.2,
+    "pl": 1.6,
+    "he": 1.9,
+    "ru": 1.9,
+    "uk": 2.1,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding(model: str) -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # e.g. encoding files not downloadable offline
+        logger.warning(f"tiktoken encoding unavailable for {model}, using heuristic: {e}")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimate the tokens of a text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use (default: OPENAI_MODEL)
+
+    Returns:
+        Token count (exact with tiktoken, a slight overestimate otherwise)
+    """
+    encoding = _encoding(model or os.getenv("OPENAI_MODEL", "gpt-4o"))
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) // 2 + 1
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+    """Estimate the prompt tokens of chat messages."""
+    return sum(count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def expansion_ratio(source_lang: str, target_lang: str) -> float:
+    """Return the expected output tokens per input token for a language pair."""
+    return LANGUAGE_TOKEN_RATIOS.get(target_lang, 1.5) / LANGUAGE_TOKEN_RATIOS.get(source_lang, 1.5)
+
+
+def max_output_tokens(input_tokens: int, source_lang: str, target_lang: str) -> int:
+    """
+    Size max_tokens for translating a text.
+
+    Args:
+        input_tokens: Tokens of the text to translate
+        source_lang: Source language code
+        target_lang: Target language code
+
+    Returns:
+        Predicted output tokens times OUTPUT_MARGIN, between
+        MIN_OUTPUT_TOKENS and MAX_OUTPUT_TOKENS
+    """
+    predicted = input_tokens * expansion_ratio(source_lang, target_lang)
+    return max(MIN_OUTPUT_TOKENS, min(MAX_OUTPUT_TOKENS, math.ceil(predicted * OUTPUT_MARGIN)))
+
+
+def chunk_token_budget(configured: int, source_lang: str, target_lang: str) -> int:
+    """
+    Return the input tokens per chunk for a language pair.
+
+    Args:
+        configured: Configured chunk size (TRANSLATION_CHUNK_TOKENS)
+        source_lang: Source language code
+        target_lang: Target language code
+
+    Returns:
+        configured, lowered so a chunk's predicted output fits under MAX_OUTPUT_TOKENS
+    """
+    fits = int(MAX_OUTPUT_TOKENS / (OUTPUT_MARGIN * expansion_ratio(source_lang, target_lang)))
+    return max(1, min(configured, fits))
+
+
+class TokenUsage:
+    """Estimated vs. actual token usage across completions. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {
+            "completions": 0,
+            "estimated_prompt_tokens": 0,
+            "prompt_tokens": 0,
+            "reserved_completion_tokens": 0,
+            "completion_tokens": 0,
+            "truncation_retries": 0,
+        }
+
+    def record(
+        self,
+        estimated_prompt_tokens: int,
+        reserved_completion_tokens: int,
+        usage: Optional[Any]
+    ) -> None:
+        """
+        Record one completion.
+
+        Args:
+            estimated_prompt_tokens: count_message_tokens of the request
+            reserved_completion_tokens: max_tokens sent
+            usage: The response's usage (prompt_tokens, completion_tokens);
+                None if the API did not report it
+        """
+        if usage is None:
+            return
+        with self._lock:
+            self._totals["completions"] += 1
+            self._totals["estimated_prompt_tokens"] += estimated_prompt_tokens
+            self._totals["prompt_tokens"] += usage.prompt_tokens
+            self._totals["reserved_completion_tokens"] += reserved_completion_tokens
+            self._totals["completion_tokens"] += usage.completion_tokens
+        logger.debug(
+            f"Tokens: prompt {usage.prompt_tokens} (estimated {estimated_prompt_tokens}), "
+            f"completion {usage.completion_tokens} of {reserved_completion_tokens} reserved"
+        )
+
+    def record_truncation_retry(self) -> None:
+        """Count a completion repeated because max_tokens was too small."""
+        with self._lock:
+            self._totals["truncation_retries"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return totals plus estimate accuracy and reservation use for metrics."""
+        with self._lock:
+            stats = dict(self._totals)
+        stats["tokenizer"] = "tiktoken" if tiktoken is not None else "heuristic"
+        stats["prompt_estimate_ratio"] = (
+            round(stats["estimated_prompt_tokens"] / stats["prompt_tokens"], 3)
+            if stats["prompt_tokens"] else None
+        )
+        stats["reserved_used_ratio"] = (
+            round(stats["completion_tokens"] / stats["reserved_completion_tokens"], 3)
+            if stats["reserved_completion_tokens"] else None
+        )
+        return stats
+
+
+_usage = TokenUsage()
+
+
+def get_token_usage() -> TokenUsage:
+    """Return the process-wide token usage recorder."""
+    return _usage
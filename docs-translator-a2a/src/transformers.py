@@ -6,7 +6,7 @@ and CrewAI's internal input/output structures.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
@@ -132,7 +132,46 @@ def validate_a2a_request(capability: str, parameters: Dict[str, Any]) -> None:
     Raises:
         ValueError: If request is invalid
     """
-    # Validate capability
+    _validate_capability(capability)
+    if capability == "translate_document":
+        _validate_translate_parameters(parameters)
+
+    logger.info(f"A2A request validated: {capability}")
+
+
+def validate_a2a_batch(capability: str, items: List[Dict[str, Any]]) -> Dict[int, str]:
+    """
+    Validate the parameter sets of a batch request together.
+
+    Invalid items do not fail the batch; their errors are returned by index.
+
+    Args:
+        capability: Requested capability name (shared by all items)
+        items: Parameter sets, one per document
+
+    Returns:
+        Dictionary of item index -> validation error (empty if all valid)
+
+    Raises:
+        ValueError: If the capability itself is invalid
+    """
+    _validate_capability(capability)
+
+    errors = {}
+    for index, parameters in enumerate(items):
+        try:
+            _validate_translate_parameters(parameters)
+        except ValueError as e:
+            errors[index] = str(e)
+
+    logger.info(
+        f"A2A batch validated: {capability}, {len(items)} items, "
+        f"{len(errors)} invalid"
+    )
+    return errors
+
+
+def _validate_capability(capability: str) -> None:
     valid_capabilities = ["translate_document"]
     if capability not in valid_capabilities:
         raise ValueError(
@@ -140,35 +179,33 @@ def validate_a2a_request(capability: str, parameters: Dict[str, Any]) -> None:
             f"Valid capabilities: {valid_capabilities}"
         )
 
-    # Validate parameters for translate_document
-    if capability == "translate_document":
-        required = ["text", "source_language", "target_language"]
-        missing = [param for param in required if param not in parameters]
-        if missing:
-            raise ValueError(f"Missing required parameters: {missing}")
-
-        # Validate text length
-        text = parameters.get("text", "")
-        if len(text) > 50000:
-            raise ValueError(
-                f"Text too long: {len(text)} characters. Maximum: 50000"
-            )
-
-        # Validate language codes
-        valid_langs = ["es", "en", "pl", "he", "uk", "ru", "fr", "de", "it"]
-        source_lang = parameters.get("source_language")
-        target_lang = parameters.get("target_language")
-
-        if source_lang not in valid_langs:
-            raise ValueError(
-                f"Invalid source_language: {source_lang}. "
-                f"Valid languages: {valid_langs}"
-            )
-
-        if target_lang not in valid_langs:
-            raise ValueError(
-                f"Invalid target_language: {target_lang}. "
-                f"Valid languages: {valid_langs}"
-            )
 
-    logger.info(f"A2A request validated: {capability}")
+def _validate_translate_parameters(parameters: Dict[str, Any]) -> None:
+    required = ["text", "source_language", "target_language"]
+    missing = [param for param in required if param not in parameters]
+    if missing:
+        raise ValueError(f"Missing required parameters: {missing}")
+
+    # Validate text length
+    text = parameters.get("text", "")
+    if len(text) > 50000:
+        raise ValueError(
+            f"Text too long: {len(text)} characters. Maximum: 50000"
+        )
+
+    # Validate language codes
+    valid_langs = ["es", "en", "pl", "he", "uk", "ru", "fr", "de", "it"]
+    source_lang = parameters.get("source_language")
+    target_lang = parameters.get("target_language")
+
+    if source_lang not in valid_langs:
+        raise ValueError(
+            f"Invalid source_language: {source_lang}. "
+            f"Valid languages: {valid_langs}"
+        )
+
+    if target_lang not in valid_langs:
+        raise ValueError(
+            f"Invalid target_language: {target_lang}. "
+            f"Valid languages: {valid_langs}"
+        )
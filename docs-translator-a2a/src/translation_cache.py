@@ -0,0 +1,185 @@
+"""
+Translation result cache for the A2A service.
+
+Re-submissions, client retries and repeated template documents send the same
+masked text for the same language pair again; each one used to cost a full
+OpenAI call. Translations are cached by a hash of (text, source language,
+target language, document type, model, prompt version), so a new model or
+prompt never serves stale translations:
+
+- memory tier: LRU of the most recent translations
+- SQLite tier (optional): survives restarts and is shared by workers using
+  the same file; hits are promoted to memory
+- entries expire after a TTL in both tiers
+
+Only completed, non-empty translations are cached. Requests sent with
+"Cache-Control: no-cache" bypass the lookup (the fresh translation still
+replaces the cached one).
+
+Configuration (environment):
+    TRANSLATION_CACHE_SIZE  Entries in the memory tier (default: 1024, 0 disables it)
+    TRANSLATION_CACHE_TTL   Entry lifetime in seconds (default: 86400)
+    TRANSLATION_CACHE_DB    SQLite file for the persistent tier (default: unset)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HIT = "hit"
+MISS = "miss"
+BYPASS = "bypass"
+
+
+def translation_cache_key(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    doc_type: str,
+    model: str,
+    prompt_version: str
+) -> str:
+    """Return the cache key for a translation request."""
+    parts = [text, source_lang, target_lang, doc_type, model, prompt_version]
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two-tier (memory LRU + optional SQLite) translation cache with TTL.
+
+    Thread-safe: translations run in the server's thread pool.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400.0,
+        db_path: Optional[str] = None
+    ):
+        """
+        Args:
+            max_entries: Entries kept in the memory tier (0 disables it)
+            ttl_seconds: Entry lifetime
+            db_path: SQLite file for the persistent tier (None: memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypasses": 0, "stores": 0}
+        self._db: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translated_text TEXT, expires_at REAL)"
+            )
+            self._db.execute("DELETE FROM translations WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached translation for a key, or None on a miss.
+
+        Args:
+            key: Key from translation_cache_key
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translated_text, expires_at FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self._stats["disk_hits"] += 1
+                    return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, translated_text: str) -> None:
+        """Cache a completed translation (empty translations are ignored)."""
+        if not translated_text:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, translated_text, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, translated_text, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, translated_text, expires_at)
+                )
+                self._db.commit()
+            self._stats["stores"] += 1
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the lookup."""
+        with self._lock:
+            self._stats["bypasses"] += 1
+
+    def _remember(self, key: str, translated_text: str, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (translated_text, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and tier sizes for metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["persistent"] = self._db is not None
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+
+_cache: Optional[TranslationCache] = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """
+    Return the process-wide translation cache, configured from the environment.
+
+    Returns:
+        TranslationCache shared by all translation paths
+    """
+    global _cache
+    if _cache is None:
+        _cache = TranslationCache(
+            max_entries=int(os.getenv("TRANSLATION_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("TRANSLATION_CACHE_TTL", "86400")),
+            db_path=os.getenv("TRANSLATION_CACHE_DB") or None
+        )
+    return _cache
@@ -0,0 +1,260 @@
+"""
+Segment-level translation memory for the A2A service.
+
+Government documents repeat large fixed blocks (the "DECLARACIÓN OFICIAL"
+and "NOTAS IMPORTANTES" sections of a birth certificate, for example), but
+the translation cache only helps when the whole document is identical.
+The translation memory works per segment instead:
+
+- documents are split into segments on "---" separator lines and blank
+  lines (paragraphs); separators are kept verbatim
+- segment translations are looked up by a hash of the segment text, the
+  language pair, the model and the prompt version
+- only unseen segments are sent to the model, joined by "---" lines, and
+  the reply is split back into segments and reassembled in document order
+- translations of whole documents are split the same way to learn their
+  segments
+
+A reply whose segments do not line up with the request (the model merged
+or split paragraphs) is not learned from; for a partial request the whole
+document is translated instead. Besides the segment count, every segment
+pair is checked: the translation must keep the source segment's numbers and
+masks, and its length ratio must stay close to the reply's overall ratio, so
+a merge and a split that cancel out are caught too.
+
+Segments are stored in a TranslationCache, so the memory has the same
+memory LRU, optional SQLite tier and TTL.
+
+Configuration (environment):
+    TRANSLATION_MEMORY      Set to "false" to disable the memory (default: true)
+    TRANSLATION_MEMORY_SIZE Segments in the memory tier (default: 10000)
+    TRANSLATION_MEMORY_TTL  Segment lifetime in seconds (default: 2592000, 30 days)
+    TRANSLATION_MEMORY_DB   SQLite file for the persistent tier (default: unset)
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+from translation_cache import TranslationCache
+
+logger = logging.getLogger(__name__)
+
+# Paragraph breaks (blank lines) and "---" separator lines
+SEPARATOR = re.compile(r"(\n(?:[ \t]*\n)+|^[ \t]*-{3,}[ \t]*$)", re.MULTILINE)
+
+# Joins unseen segments in a model request; the prompt preserves it
+SEGMENT_DELIMITER = "\n\n---\n\n"
+
+# Tokens a translation keeps verbatim: mask placeholders, numbers, masks
+PROTECTED_TOKEN = re.compile(r"\[\[M\d+\]\]|\d+|\*{2,}")
+
+# A segment's length ratio may differ from the reply's overall ratio by this
+# factor; shorter segments (titles, labels) vary too much to be checked
+MAX_RATIO_DEVIATION = 1.75
+MIN_RATIO_CHARS = 20
+
+
+def split_segments(text: str) -> List[str]:
+    """
+    Split text into alternating segments and separators.
+
+    Args:
+        text: Document text
+
+    Returns:
+        [segment, separator, segment, ...] with "".join(parts) == text;
+        segments (even indices) may be empty or whitespace
+    """
+    return SEPARATOR.split(text)
+
+
+def is_translatable(segment: str) -> bool:
+    """Return True if a segment has text to translate (not just numbers or punctuation)."""
+    return any(char.isalpha() for char in segment)
+
+
+def segment_key(segment: str, source_lang: str, target_lang: str, model: str, prompt_version: str) -> str:
+    """Return the memory key for a stripped segment."""
+    parts = [segment, source_lang, target_lang, model, prompt_version]
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _translated_segments(text: str) -> List[str]:
+    segments = split_segments(text)[::2]
+    return [segment.strip() for segment in segments if is_translatable(segment)]
+
+
+def alignment_problem(sources: List[str], translations: List[str]) -> Optional[str]:
+    """
+    Check that translated segments belong to their source segments.
+
+    Args:
+        sources: Stripped source segments
+        translations: Stripped translated segments, in the same order
+
+    Returns:
+        Why the segments do not line up, or None if they do
+    """
+    if len(sources) != len(translations):
+        return f"{len(translations)} translated segments for {len(sources)} source segments"
+
+    overall = sum(map(len, translations)) / max(1, sum(map(len, sources)))
+    for number, (source, translation) in enumerate(zip(sources, translations), 1):
+        if sorted(PROTECTED_TOKEN.findall(source)) != sorted(PROTECTED_TOKEN.findall(translation)):
+            return f"segment {number} changed its numbers or masks"
+        if len(source) >= MIN_RATIO_CHARS:
+            deviation = len(translation) / len(source) / overall
+            if not 1 / MAX_RATIO_DEVIATION <= deviation <= MAX_RATIO_DEVIATION:
+                return f"segment {number} length ratio is {deviation:.1f}x the document's"
+    return None
+
+
+class SegmentMatch:
+    """
+    A document split into segments, with the translations found in memory.
+
+    Untranslatable segments (numbers, punctuation) are copied through.
+    """
+
+    def __init__(self, parts: List[str], keys: Dict[int, str], translations: Dict[int, str]):
+        """
+        Args:
+            parts: Output of split_segments
+            keys: Memory key of every translatable segment, by part index
+            translations: Translations found in memory, by part index
+        """
+        self.parts = parts
+        self.keys = keys
+        self.translations = translations
+        self.missing = [index for index in sorted(keys) if index not in translations]
+
+    @property
+    def segments(self) -> int:
+        """Number of translatable segments."""
+        return len(self.keys)
+
+    @property
+    def hits(self) -> int:
+        """Number of translatable segments found in memory."""
+        return len(self.keys) - len(self.missing)
+
+    @property
+    def complete(self) -> bool:
+        """True if every segment was found in memory."""
+        return not self.missing
+
+    def request_text(self) -> str:
+        """Return the unseen segments joined for a single model request."""
+        return SEGMENT_DELIMITER.join(self.parts[index].strip() for index in self.missing)
+
+    def assemble(self) -> str:
+        """Return the translated document; requires every segment to be translated."""
+        output = []
+        for index, part in enumerate(self.parts):
+            if index in self.keys:
+                stripped = part.strip()
+                start = part.index(stripped)
+                part = part[:start] + self.translations[index] + part[start + len(stripped):]
+            output.append(part)
+        return "".join(output).strip()
+
+
+class TranslationMemory:
+    """Exact-match segment translation memory backed by a TranslationCache."""
+
+    def __init__(self, store: TranslationCache):
+        """
+        Args:
+            store: Segment store (keys from segment_key)
+        """
+        self.store = store
+
+    def lookup(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        model: str,
+        prompt_version: str,
+        use_memory: bool = True
+    ) -> SegmentMatch:
+        """
+        Split a document and look its segments up.
+
+        Args:
+            text: Document text
+            source_lang: Source language code
+            target_lang: Target language code
+            model: Translation model
+            prompt_version: Prompt version (see real_translation.PROMPT_VERSION)
+            use_memory: Look segments up (False: only key them, to learn
+                from a fresh translation)
+
+        Returns:
+            SegmentMatch with the translations found
+        """
+        parts = split_segments(text)
+        keys: Dict[int, str] = {}
+        translations: Dict[int, str] = {}
+        for index in range(0, len(parts), 2):
+            if not is_translatable(parts[index]):
+                continue
+            keys[index] = segment_key(parts[index].strip(), source_lang, target_lang, model, prompt_version)
+            cached = self.store.get(keys[index]) if use_memory else None
+            if cached is not None:
+                translations[index] = cached
+        return SegmentMatch(parts, keys, translations)
+
+    def learn(self, match: SegmentMatch, translated_text: str, indices: List[int]) -> bool:
+        """
+        Store the translations of some of a match's segments.
+
+        Args:
+            match: Match the translated segments belong to
+            translated_text: Model output for those segments, in order
+            indices: Part indices of the translated segments
+
+        Returns:
+            True if the output lined up with the segments (they are then
+            also filled into match.translations), False otherwise
+        """
+        segments = _translated_segments(translated_text)
+        problem = alignment_problem([match.parts[index].strip() for index in indices], segments)
+        if problem:
+            logger.info(f"Translation memory: {problem}, not learned")
+            return False
+        for index, segment in zip(indices, segments):
+            match.translations[index] = segment
+            self.store.set(match.keys[index], segment)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the segment store counters for metrics."""
+        return self.store.stats()
+
+
+_memory: Optional[TranslationMemory] = None
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    Return the process-wide translation memory, configured from the environment.
+
+    Returns:
+        TranslationMemory, or None if TRANSLATION_MEMORY is "false"
+    """
+    global _memory
+    if os.getenv("TRANSLATION_MEMORY", "true").lower() == "false":
+        return None
+    if _memory is None:
+        _memory = TranslationMemory(TranslationCache(
+            max_entries=int(os.getenv("TRANSLATION_MEMORY_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("TRANSLATION_MEMORY_TTL", "2592000")),
+            db_path=os.getenv("TRANSLATION_MEMORY_DB") or None
+        ))
+    return _memory
@@ -16,3 +16,4 @@ def setup_test_env():
     # Set other test environment variables
     os.environ["LOG_LEVEL"] = "WARNING"  # Reduce logging noise in tests
     os.environ["A2A_SERVICE_PORT"] = "8001"
+    os.environ["OPENAI_WARMUP"] = "false"  # No network calls at app startup
@@ -0,0 +1,261 @@
+"""
+Tests for the A2A server endpoints.
+"""
+
+import gzip
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastapi.testclient import TestClient
+
+import a2a_server
+from a2a_server import app, AGENT_CARD_ETAG
+from agent_card import AGENT_CARD
+from content_encoding import SUPPORTED_ENCODINGS, choose_encoding
+
+
+@pytest.fixture
+def client():
+    """Test client for the A2A server."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def echo_translation(monkeypatch):
+    """Replace the OpenAI-backed translation with an echo."""
+    def fake_translate(text, source_lang, target_lang, doc_type="general", use_cache=True):
+        return {
+            "translated_text": text,
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "document_type": doc_type,
+            "confidence": 0.95
+        }
+    monkeypatch.setattr(a2a_server, "translate_document_crew", fake_translate)
+
+    async def fake_stream(text, source_lang, target_lang, doc_type="general", use_cache=True):
+        for word in text.split():
+            yield word + " "
+    monkeypatch.setattr(a2a_server, "stream_translate_document_crew", fake_stream)
+
+
+JSON = {"Content-Type": "application/json"}
+
+
+def invoke_payload(text):
+    return json.dumps({
+        "capability": "translate_document",
+        "parameters": {"text": text, "source_language": "es", "target_language": "en"}
+    }).encode("utf-8")
+
+
+class TestAgentCardEndpoint:
+    """Test the agent card endpoint and its cache validators."""
+
+    def test_agent_card_has_validators(self, client):
+        """Test the card is served with an ETag and Cache-Control."""
+        response = client.get("/.well-known/agent-card.json")
+
+        assert response.status_code == 200
+        assert response.json() == AGENT_CARD
+        assert response.headers["etag"] == AGENT_CARD_ETAG
+        assert "max-age" in response.headers["cache-control"]
+
+    def test_agent_card_not_modified(self, client):
+        """Test a matching If-None-Match returns 304 without a body."""
+        response = client.get(
+            "/.well-known/agent-card.json",
+            headers={"If-None-Match": AGENT_CARD_ETAG}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_agent_card_etag_mismatch(self, client):
+        """Test a stale ETag returns the full card."""
+        response = client.get(
+            "/.well-known/agent-card.json",
+            headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["name"] == AGENT_CARD["name"]
+
+
+class TestStreamEndpoint:
+    """Test token-level streaming on /stream."""
+
+    def test_stream_relays_deltas(self, client, echo_translation):
+        """Test deltas arrive in order before the final result event."""
+        text = "Certificado de Nacimiento ***-**-1234"
+        response = client.post("/stream", content=invoke_payload(text), headers=JSON)
+
+        assert response.status_code == 200
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+        deltas = [event["delta"] for event in events if event["status"] == "delta"]
+        assert "".join(deltas).strip() == text
+
+        final = events[-1]
+        assert final["status"] == "success"
+        assert final["result"]["translated_text"] == text
+        assert final["result"]["word_count"] == 4
+        assert final["result"]["source_language"] == "es"
+
+    def test_stream_error_event(self, client, monkeypatch):
+        """Test a failing translation ends the stream with an error event."""
+        async def failing_stream(text, source_lang, target_lang, doc_type="general", use_cache=True):
+            yield "Birth "
+            raise RuntimeError("Translation failed: rate limited")
+        monkeypatch.setattr(a2a_server, "stream_translate_document_crew", failing_stream)
+
+        response = client.post("/stream", content=invoke_payload("Certificado"), headers=JSON)
+
+        last = response.text.strip().splitlines()[-1]
+        assert json.loads(last[len("data: "):]) == {
+            "status": "error", "error": "Translation failed: rate limited"
+        }
+
+
+class TestBatchEndpoint:
+    """Test the /invoke_batch endpoint."""
+
+    def batch(self, *texts):
+        return {
+            "capability": "translate_document",
+            "items": [
+                {"text": text, "source_language": "es", "target_language": "en"}
+                for text in texts
+            ]
+        }
+
+    def test_batch_advertised(self):
+        """Test the agent card lists the batch endpoint."""
+        assert AGENT_CARD["endpoints"]["invoke_batch"] == "/invoke_batch"
+        assert AGENT_CARD["metadata"]["max_batch_items"] > 0
+
+    def test_batch_results_in_order(self, client, echo_translation):
+        """Test per-item results come back in request order."""
+        payload = self.batch("uno", "dos", "tres")
+        payload["items"][1]["target_language"] = "xx"
+
+        response = client.post("/invoke_batch", json=payload)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "partial"
+        assert [item["index"] for item in body["results"]] == [0, 1, 2]
+        assert body["results"][0]["result"]["translated_text"] == "uno"
+        assert body["results"][1]["status"] == "error"
+        assert "Invalid target_language" in body["results"][1]["error"]
+        assert body["results"][2]["result"]["translated_text"] == "tres"
+        assert body["metadata"]["succeeded"] == 2
+        assert body["metadata"]["failed"] == 1
+
+    def test_batch_ndjson(self, client, echo_translation):
+        """Test results are streamed as NDJSON lines on request."""
+        response = client.post(
+            "/invoke_batch",
+            json=self.batch("uno", "dos"),
+            headers={"Accept": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1]
+        assert lines[1]["result"]["translated_text"] == "dos"
+
+    def test_batch_rejects_unknown_capability(self, client):
+        """Test an unknown capability rejects the whole batch."""
+        payload = self.batch("uno")
+        payload["capability"] = "summarize"
+
+        response = client.post("/invoke_batch", json=payload)
+
+        assert response.status_code == 400
+
+    def test_batch_rejects_empty_and_oversized(self, client, monkeypatch):
+        """Test empty and oversized batches are rejected."""
+        monkeypatch.setattr(a2a_server, "BATCH_MAX_ITEMS", 2)
+
+        assert client.post("/invoke_batch", json=self.batch()).status_code == 400
+        assert client.post("/invoke_batch", json=self.batch("a", "b", "c")).status_code == 400
+
+
+class TestContentEncoding:
+    """Test compressed request and response bodies."""
+
+    def test_encodings_advertised(self):
+        """Test the agent card lists the supported encodings."""
+        encodings = AGENT_CARD["metadata"]["content_encodings"]
+
+        assert "gzip" in encodings["request"]
+        assert encodings["response"] == SUPPORTED_ENCODINGS
+
+    def test_gzip_request_body(self, client, echo_translation):
+        """Test a gzip request body is decompressed before parsing."""
+        text = "Certificado de Nacimiento. " * 200
+        response = client.post(
+            "/invoke",
+            content=gzip.compress(invoke_payload(text)),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["result"]["translated_text"] == text
+
+    def test_gzip_response_body(self, client, echo_translation):
+        """Test large responses are compressed per Accept-Encoding."""
+        text = "Certificado de Nacimiento. " * 200
+        response = client.post(
+            "/invoke",
+            content=invoke_payload(text),
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json()["result"]["translated_text"] == text
+
+    def test_small_response_not_compressed(self, client):
+        """Test small bodies are sent as-is."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_unsupported_request_encoding(self, client):
+        """Test an unknown Content-Encoding is rejected with 415."""
+        response = client.post(
+            "/invoke",
+            content=b"...",
+            headers={"Content-Type": "application/json", "Content-Encoding": "br"}
+        )
+
+        assert response.status_code == 415
+        assert "gzip" in response.headers["accept-encoding"]
+
+    def test_corrupt_request_body(self, client):
+        """Test a body that is not valid gzip is rejected with 400."""
+        response = client.post(
+            "/invoke",
+            content=b"not gzip",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 400
+
+    def test_choose_encoding(self):
+        """Test Accept-Encoding negotiation honours q=0."""
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0, deflate") is None
+        assert choose_encoding("identity") is None
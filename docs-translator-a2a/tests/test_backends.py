@@ -0,0 +1,214 @@
+"""
+Tests for translation backend selection and the local stand-in engine.
+"""
+
+import time
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import crew_agent
+from a2a_server import app
+from tools import backends, retry
+from tools.backends import (
+    LocalBackend,
+    OpenAIBackend,
+    TranslationBackend,
+    get_translation_backend,
+    local_translate,
+    parse_error_rates,
+    register_backend
+)
+from translation_cache import TranslationCache
+
+DOCUMENT = (
+    "CERTIFICADO DE NACIMIENTO\n\n"
+    "Nombre: Juan Pérez\n"
+    "Número: ***-**-****-X\n"
+    "Correo: m*************@ejemplo.es\n"
+    "Fecha de nacimiento: 12/03/1990"
+)
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    """Select the local backend, uncached, with a fresh instance."""
+    monkeypatch.setenv("TRANSLATION_BACKEND", "local")
+    monkeypatch.setattr(backends, "_backends", {})
+    monkeypatch.setattr(crew_agent, "get_translation_cache", lambda: TranslationCache(max_entries=0))
+    monkeypatch.setattr(crew_agent, "get_translation_memory", lambda: None)
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    """Retry quickly, and often enough that flaky requests always succeed."""
+    monkeypatch.setattr(retry, "RETRY_ATTEMPTS", 20)
+    monkeypatch.setattr(retry, "BASE_DELAY", 0.001)
+    monkeypatch.setattr(retry, "MAX_DELAY", 0.005)
+
+
+class TestBackendSelection:
+    """Test TRANSLATION_BACKEND picks the engine."""
+
+    def test_default_is_openai(self, monkeypatch):
+        """Test OpenAI is used without configuration."""
+        monkeypatch.delenv("TRANSLATION_BACKEND", raising=False)
+
+        assert isinstance(get_translation_backend(), OpenAIBackend)
+
+    def test_local_selected_and_shared(self, local_backend):
+        """Test the local backend is created once."""
+        backend = get_translation_backend()
+
+        assert isinstance(backend, LocalBackend)
+        assert get_translation_backend() is backend
+
+    def test_unknown_backend(self, monkeypatch):
+        """Test an unknown name lists the available backends."""
+        monkeypatch.setenv("TRANSLATION_BACKEND", "carrier-pigeon")
+
+        with pytest.raises(ValueError, match="local, openai"):
+            get_translation_backend()
+
+    def test_register_backend(self, monkeypatch):
+        """Test custom backends get the default streaming and serve translations."""
+        class UpperBackend(TranslationBackend):
+            name = "upper"
+            model = "upper"
+            prompt_version = "1"
+
+            def translate(self, text, source_lang, target_lang, doc_type="general"):
+                return text.upper()
+
+        monkeypatch.setattr(backends, "_factories", dict(backends._factories))
+        monkeypatch.setattr(backends, "_backends", {})
+        monkeypatch.setenv("TRANSLATION_BACKEND", "upper")
+        register_backend("upper", UpperBackend)
+
+        async def collect():
+            return [delta async for delta in get_translation_backend().stream("hola", "es", "en")]
+
+        assert asyncio.run(collect()) == ["HOLA"]
+
+    def test_incomplete_backend_rejected(self):
+        """Test a backend missing translate or its cache-key properties cannot be created."""
+        class NoTranslate(TranslationBackend):
+            model = "none"
+            prompt_version = "1"
+
+        class NoModel(TranslationBackend):
+            def translate(self, text, source_lang, target_lang, doc_type="general"):
+                return text
+
+        for backend_class in (NoTranslate, NoModel):
+            with pytest.raises(TypeError):
+                backend_class()
+
+    def test_backend_in_cache_key(self, local_backend, monkeypatch):
+        """Test translations from different backends are cached apart."""
+        local_key = crew_agent._cache_key("Hola", "es", "en", "general")
+        monkeypatch.setenv("TRANSLATION_BACKEND", "openai")
+
+        assert crew_agent._cache_key("Hola", "es", "en", "general") != local_key
+
+
+class TestLocalTranslation:
+    """Test the dictionary engine is deterministic and keeps the document intact."""
+
+    def test_dictionary_and_rules(self):
+        """Test known words are replaced with matching case; PII, numbers and names are kept."""
+        translated = local_translate(DOCUMENT, "es", "en")
+
+        assert translated.startswith("CERTIFICATE OF BIRTH\n\nName: Juan Pérez\nNumber: ***-**-****-X\n")
+        assert "m*************@ejemplo.es" in translated
+        assert translated.endswith("Date of birth: 12/03/1990")
+        assert translated == local_translate(DOCUMENT, "es", "en")
+
+    def test_length_proportional(self):
+        """Test output length follows input length."""
+        short = local_translate(DOCUMENT, "es", "en")
+        long = local_translate("\n\n---\n\n".join([DOCUMENT] * 20), "es", "en")
+
+        assert 20 * len(short) < len(long) < 22 * len(short)
+
+    def test_unsupported_pair_unchanged(self):
+        """Test languages without a lexicon column return the text as is."""
+        assert local_translate("Привіт", "uk", "en") == "Привіт"
+
+    def test_end_to_end(self, local_backend):
+        """Test /invoke translates offline, passing the quality checks."""
+        response = TestClient(app).post("/invoke", json={
+            "capability": "translate_document",
+            "parameters": {"text": DOCUMENT, "source_language": "es", "target_language": "en"}
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["result"]["translated_text"] == local_translate(DOCUMENT, "es", "en")
+        assert body["result"]["confidence"] == 0.95
+        assert body["metadata"]["model"] == "local-dictionary"
+
+
+class TestLocalLatencyAndErrors:
+    """Test simulated latency and error distributions."""
+
+    def test_latency_scales_with_tokens(self):
+        """Test requests wait the fixed latency plus the per-token latency."""
+        backend = LocalBackend(latency_ms=20, ms_per_token=1)
+
+        start = time.perf_counter()
+        backend.translate("palabra " * 50, "es", "en")
+
+        assert time.perf_counter() - start >= 0.02 + 0.1
+
+    def test_jitter_is_seeded(self):
+        """Test the same seed draws the same latencies."""
+        first = LocalBackend(latency_ms=100, jitter=0.5, seed=7)
+        second = LocalBackend(latency_ms=100, jitter=0.5, seed=7)
+
+        draws = [first._attempt("texto")[0] for _ in range(5)]
+
+        assert draws == [second._attempt("texto")[0] for _ in range(5)]
+        assert len(set(draws)) == 5
+
+    def test_parse_error_rates(self):
+        """Test error distributions are parsed and validated."""
+        assert parse_error_rates("429=0.02, 503=0.01,timeout=0.005") == [
+            ("429", 0.02), ("503", 0.01), ("timeout", 0.005)
+        ]
+        assert parse_error_rates("") == []
+        with pytest.raises(ValueError, match="Unknown"):
+            parse_error_rates("418=0.5")
+
+    def test_errors_are_retried(self, fast_retries):
+        """Test synthetic errors go through the retry layer like API errors."""
+        backend = LocalBackend(error_rates=[("429", 0.5), ("503", 0.2)], seed=1)
+
+        results = [backend.translate("Nombre", "es", "en") for _ in range(20)]
+
+        assert results == ["Name"] * 20
+
+    def test_errors_surface_when_persistent(self, fast_retries):
+        """Test a backend that always fails reports a translation failure."""
+        backend = LocalBackend(error_rates=[("timeout", 1.0)])
+
+        with pytest.raises(RuntimeError, match="Translation failed"):
+            backend.translate("Nombre", "es", "en")
+
+    def test_stream_yields_lines(self):
+        """Test streaming yields the translation line by line."""
+        backend = LocalBackend(latency_ms=10)
+
+        async def collect():
+            return [delta async for delta in backend.stream(DOCUMENT, "es", "en")]
+
+        deltas = asyncio.run(collect())
+
+        assert len(deltas) == DOCUMENT.count("\n") + 1
+        assert "".join(deltas) == local_translate(DOCUMENT, "es", "en")
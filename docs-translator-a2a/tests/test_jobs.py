@@ -0,0 +1,221 @@
+"""
+Tests for the asynchronous job API.
+"""
+
+import json
+import time
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastapi.testclient import TestClient
+
+import jobs
+from a2a_server import app
+from jobs import JobManager, JobStore, QUEUED, FAILED, SUCCEEDED
+
+
+@pytest.fixture
+def client():
+    """Test client running the app lifespan (starts the job workers)."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def echo_stream(monkeypatch):
+    """Replace the OpenAI-backed streaming translation with an echo."""
+    async def fake_stream(text, source_lang, target_lang, doc_type="general", use_cache=True):
+        for word in text.split():
+            await asyncio.sleep(0.01)
+            yield word + " "
+    monkeypatch.setattr(jobs, "stream_translate_document_crew", fake_stream)
+
+
+def job_request(text="Certificado de Nacimiento"):
+    return {
+        "capability": "translate_document",
+        "parameters": {"text": text, "source_language": "es", "target_language": "en"}
+    }
+
+
+def wait_for_job(client, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+class TestJobEndpoints:
+    """Test job submission, polling and the SSE status feed."""
+
+    def test_submit_and_poll(self, client, echo_stream):
+        """Test a job is accepted at once and finishes with a result."""
+        response = client.post("/jobs", json=job_request())
+
+        assert response.status_code == 202
+        created = response.json()
+        assert created["status"] == QUEUED
+        assert response.headers["location"] == f"/jobs/{created['job_id']}"
+        assert "parameters" not in created
+
+        job = wait_for_job(client, created["job_id"])
+        assert job["status"] == SUCCEEDED
+        assert job["result"]["translated_text"] == "Certificado de Nacimiento"
+        assert job["progress"]["translated_chars"] > 0
+
+    def test_event_feed(self, client, echo_stream):
+        """Test the SSE feed ends with the finished job."""
+        job_id = client.post("/jobs", json=job_request()).json()["job_id"]
+
+        response = client.get(f"/jobs/{job_id}/events")
+
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+        assert events[-1]["status"] == SUCCEEDED
+        assert events[-1]["result"]["translated_text"] == "Certificado de Nacimiento"
+
+    def test_failed_job(self, client, monkeypatch):
+        """Test a failing translation marks the job failed."""
+        async def failing_stream(text, source_lang, target_lang, doc_type="general", use_cache=True):
+            raise RuntimeError("Translation failed: rate limited")
+            yield  # pragma: no cover
+        monkeypatch.setattr(jobs, "stream_translate_document_crew", failing_stream)
+
+        job_id = client.post("/jobs", json=job_request()).json()["job_id"]
+
+        job = wait_for_job(client, job_id)
+        assert job["status"] == FAILED
+        assert "rate limited" in job["error"]
+
+    def test_invalid_request(self, client):
+        """Test invalid parameters are rejected before queuing."""
+        request = job_request()
+        request["parameters"]["source_language"] = "xx"
+
+        assert client.post("/jobs", json=request).status_code == 400
+
+    def test_unknown_job(self, client):
+        """Test unknown job ids return 404."""
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.get("/jobs/missing/events").status_code == 404
+
+
+class TestJobStore:
+    """Test the in-memory store and its SQLite tier."""
+
+    def job(self, job_id, status=QUEUED):
+        return {
+            "job_id": job_id, "status": status, "capability": "translate_document",
+            "parameters": {"text": "Hola"}, "progress": {}, "result": None,
+            "error": None, "created_at": time.time(), "started_at": None,
+            "finished_at": None,
+        }
+
+    def test_finished_jobs_survive_restart(self, tmp_path):
+        """Test finished jobs are read back from SQLite by a new store."""
+        db_path = str(tmp_path / "jobs.db")
+        store = JobStore(db_path)
+        store.add(self.job("a"))
+        store.update("a", status=SUCCEEDED, result={"translated_text": "Hello"},
+                     finished_at=time.time())
+        store.close()
+
+        job = JobStore(db_path).get("a")
+
+        assert job["status"] == SUCCEEDED
+        assert job["result"] == {"translated_text": "Hello"}
+        assert "parameters" not in job
+
+    def test_interrupted_jobs_marked_failed(self, tmp_path):
+        """Test jobs still queued at shutdown are failed on restart."""
+        db_path = str(tmp_path / "jobs.db")
+        store = JobStore(db_path)
+        store.add(self.job("b"))
+        store.close()
+
+        job = JobStore(db_path).get("b")
+
+        assert job["status"] == FAILED
+        assert "restart" in job["error"]
+
+    def test_finished_jobs_expire(self):
+        """Test finished jobs are evicted after the TTL."""
+        store = JobStore(ttl_seconds=0)
+        store.add(self.job("c"))
+        store.update("c", status=SUCCEEDED, finished_at=time.time() - 1)
+        store.add(self.job("d"))
+
+        assert store.get("c") is None
+        assert store.get("d")["status"] == QUEUED
+
+
+class TestJobManager:
+    """Test the worker pool across event loops."""
+
+    def parameters(self):
+        return job_request()["parameters"]
+
+    async def wait_finished(self, manager, job_id, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while manager.store.get(job_id)["status"] not in (SUCCEEDED, FAILED):
+            assert time.monotonic() < deadline, f"Job {job_id} did not finish"
+            await asyncio.sleep(0.02)
+        return manager.store.get(job_id)
+
+    def test_jobs_requeued_on_new_loop(self, echo_stream):
+        """Test jobs left on a previous loop's queue still run after a restart."""
+        manager = JobManager(JobStore(), workers=1)
+
+        async def submit():
+            return [(await manager.submit("translate_document", self.parameters()))["job_id"]
+                    for _ in range(2)]
+
+        job_ids = asyncio.run(submit())  # the loop ends before the workers get to them
+
+        async def restart():
+            manager.start()
+            try:
+                return [await self.wait_finished(manager, job_id) for job_id in job_ids]
+            finally:
+                await manager.stop()
+
+        finished = asyncio.run(restart())
+
+        assert [job["status"] for job in finished] == [SUCCEEDED, SUCCEEDED]
+
+    def test_store_writes_off_event_loop(self, echo_stream, tmp_path, monkeypatch):
+        """Test job updates (and their SQLite commits) run outside the loop's thread."""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        threads = set()
+        update = store.update
+
+        def recording_update(job_id, **fields):
+            threads.add(threading.current_thread())
+            return update(job_id, **fields)
+
+        monkeypatch.setattr(store, "update", recording_update)
+        manager = JobManager(store, workers=1)
+
+        async def run():
+            job = await manager.submit("translate_document", self.parameters())
+            try:
+                return threading.current_thread(), await self.wait_finished(manager, job["job_id"])
+            finally:
+                await manager.stop()
+
+        loop_thread, job = asyncio.run(run())
+
+        assert job["status"] == SUCCEEDED
+        assert threads and loop_thread not in threads
+        store.close()
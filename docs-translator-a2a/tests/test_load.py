@@ -0,0 +1,137 @@
+"""
+Load test: translations must not block the event loop.
+
+The OpenAI call is replaced by a blocking sleep, the way a slow translation
+behaves, and concurrent requests are sent through an in-process ASGI client.
+"""
+
+import time
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import a2a_server
+from a2a_server import app
+
+TRANSLATION_SECONDS = 0.5
+
+
+@pytest.fixture
+def slow_translation(monkeypatch):
+    """Replace the OpenAI-backed translation with a blocking sleep."""
+    def fake_translate(text, source_lang, target_lang, doc_type="general", use_cache=True):
+        time.sleep(TRANSLATION_SECONDS)
+        return {
+            "translated_text": text,
+            "source_language": source_lang,
+            "target_language": target_lang,
+            "document_type": doc_type,
+            "confidence": 0.95
+        }
+    monkeypatch.setattr(a2a_server, "translate_document_crew", fake_translate)
+
+    async def fake_stream(text, source_lang, target_lang, doc_type="general", use_cache=True):
+        for word in text.split():
+            await asyncio.sleep(TRANSLATION_SECONDS / 2)
+            yield word + " "
+    monkeypatch.setattr(a2a_server, "stream_translate_document_crew", fake_stream)
+
+
+def invoke_payload(i):
+    return {
+        "capability": "translate_document",
+        "parameters": {"text": f"Documento {i}", "source_language": "es", "target_language": "en"}
+    }
+
+
+async def timed_request(client, method, url, since=None, **kwargs):
+    """Send a request; return the response and seconds elapsed since `since`."""
+    start = since if since is not None else time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return response, time.perf_counter() - start
+
+
+class TestConcurrentTranslation:
+    """Test the server keeps serving while translations run."""
+
+    def test_translations_run_concurrently(self, slow_translation):
+        """Test concurrent translations overlap and /health stays responsive."""
+        concurrency = min(4, a2a_server.TRANSLATION_WORKERS)
+
+        async def load():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                start = time.perf_counter()
+                translations = [
+                    asyncio.ensure_future(timed_request(client, "POST", "/invoke", json=invoke_payload(i)))
+                    for i in range(concurrency)
+                ]
+                await asyncio.sleep(0.05)  # translations are now in flight
+                health = await timed_request(client, "GET", "/health", since=start)
+                return health, await asyncio.gather(*translations)
+
+        (health, health_seconds), results = asyncio.run(load())
+
+        # A blocked event loop would answer only after the translations
+        assert health.status_code == 200
+        assert health_seconds < TRANSLATION_SECONDS / 2
+        for i, (response, seconds) in enumerate(results):
+            assert response.status_code == 200
+            assert response.json()["result"]["translated_text"] == f"Documento {i}"
+            # Serialized translations would take concurrency x TRANSLATION_SECONDS
+            assert seconds < TRANSLATION_SECONDS * 2
+
+    def test_stream_does_not_block(self, slow_translation):
+        """Test /health answers while a /stream translation is running."""
+        async def load():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                start = time.perf_counter()
+                stream = asyncio.ensure_future(
+                    timed_request(client, "POST", "/stream", json=invoke_payload(0))
+                )
+                await asyncio.sleep(0.2)  # past the initial events, translating
+                health = await timed_request(client, "GET", "/health", since=start)
+                return health, await stream
+
+        (health, health_seconds), (stream, _) = asyncio.run(load())
+
+        assert health.status_code == 200
+        assert health_seconds < 0.2 + TRANSLATION_SECONDS / 2
+        assert '"status": "success"' in stream.text
+
+    def test_batch_concurrency_is_bounded(self, monkeypatch):
+        """Test a batch overlaps translations but never exceeds BATCH_CONCURRENCY."""
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def fake_translate(text, source_lang, target_lang, doc_type="general", use_cache=True):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return {"translated_text": text}
+        monkeypatch.setattr(a2a_server, "translate_document_crew", fake_translate)
+        monkeypatch.setattr(a2a_server, "BATCH_CONCURRENCY", 3)
+
+        async def load():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/invoke_batch", json={
+                    "items": [invoke_payload(i)["parameters"] for i in range(12)]
+                })
+
+        response = asyncio.run(load())
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+        assert running["peak"] == 3
@@ -0,0 +1,117 @@
+"""
+Tests for the shared OpenAI client registry.
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools import openai_clients
+from tools.openai_clients import (
+    close_openai_clients,
+    get_async_openai_client,
+    get_openai_client,
+    warm_up_openai_clients
+)
+from tools.real_translation import RealTranslationTool
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    """Start and end every test without shared clients."""
+    asyncio.run(close_openai_clients())
+    yield
+    asyncio.run(close_openai_clients())
+
+
+class TestClientRegistry:
+    """Test clients are shared per API key and base URL."""
+
+    def test_same_key_shares_client(self):
+        """Test repeated lookups return one client."""
+        assert get_openai_client("key-a") is get_openai_client("key-a")
+        assert get_openai_client() is get_openai_client()
+
+    def test_keys_and_base_urls_are_separate(self):
+        """Test a different API key or base URL gets its own client."""
+        client = get_openai_client("key-a")
+
+        assert get_openai_client("key-b") is not client
+        assert get_openai_client("key-a", "http://localhost:8080/v1") is not client
+        assert get_openai_client("key-a", "https://api.openai.com/v1/") is client
+
+    def test_pool_configuration(self, monkeypatch):
+        """Test timeouts come from the environment."""
+        monkeypatch.setenv("OPENAI_CONNECT_TIMEOUT", "3")
+        monkeypatch.setenv("OPENAI_TIMEOUT_SECONDS", "45")
+
+        client = get_openai_client("key-c")
+
+        assert client.timeout.connect == 3
+        assert client.timeout.read == 45
+
+    def test_tools_share_clients(self):
+        """Test translation tools reuse the shared sync and async clients."""
+        first = RealTranslationTool()
+        second = RealTranslationTool()
+
+        assert first.client is second.client is get_openai_client()
+
+    def test_close_drops_clients(self):
+        """Test closed clients are replaced on the next lookup."""
+        client = get_openai_client("key-a")
+        async_client = get_async_openai_client("key-a")
+
+        asyncio.run(close_openai_clients())
+
+        assert client.is_closed()
+        assert get_openai_client("key-a") is not client
+        assert get_async_openai_client("key-a") is not async_client
+
+
+class TestWarmUp:
+    """Test clients are created and connections opened at startup."""
+
+    def test_warm_up_lists_models(self, monkeypatch):
+        """Test warm-up sends one request per client."""
+        monkeypatch.setenv("OPENAI_WARMUP", "true")
+        calls = []
+
+        class FakeModels:
+            def list(self):
+                calls.append("sync")
+
+        class FakeAsyncModels:
+            async def list(self):
+                calls.append("async")
+
+        client = get_openai_client()
+        async_client = get_async_openai_client()
+        monkeypatch.setattr(client, "with_options", lambda **_: type("C", (), {"models": FakeModels()})())
+        monkeypatch.setattr(async_client, "with_options", lambda **_: type("C", (), {"models": FakeAsyncModels()})())
+
+        asyncio.run(warm_up_openai_clients())
+
+        assert sorted(calls) == ["async", "sync"]
+
+    def test_warm_up_failure_is_logged(self, monkeypatch, caplog):
+        """Test an unreachable API does not fail startup."""
+        monkeypatch.setenv("OPENAI_WARMUP", "true")
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+        monkeypatch.setenv("OPENAI_CONNECT_TIMEOUT", "1")
+
+        asyncio.run(warm_up_openai_clients())
+
+        assert "warm-up failed" in caplog.text
+
+    def test_warm_up_disabled(self, monkeypatch):
+        """Test OPENAI_WARMUP=false only creates the clients."""
+        monkeypatch.setenv("OPENAI_WARMUP", "false")
+
+        asyncio.run(warm_up_openai_clients())
+
+        assert openai_clients._clients and openai_clients._async_clients
@@ -0,0 +1,302 @@
+"""
+Tests for RealTranslationTool: chunked translation and masked PII placeholders.
+"""
+
+import time
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools import real_translation
+from tools.token_budget import count_tokens
+from tools.real_translation import (
+    ChunkTranslationError,
+    RealTranslationTool,
+    compress_masks,
+    restore_masks,
+    split_chunks
+)
+
+CALL_SECONDS = 0.1
+
+
+def section(number):
+    return f"SECCIÓN {number}\n\n" + "\n".join(f"Línea {number}.{line} del documento oficial." for line in range(8))
+
+
+DOCUMENT = "\n\n---\n\n".join(section(number) for number in range(8))
+
+
+def fake_translation(text):
+    return "\n".join(f"EN {line}" if line.strip() and line.strip() != "---" else line for line in text.split("\n"))
+
+
+def completion(content, finish_reason="stop"):
+    return SimpleNamespace(choices=[SimpleNamespace(
+        message=SimpleNamespace(content=content), finish_reason=finish_reason
+    )])
+
+
+class FakeCompletions:
+    """Chat completions that 'translate' the text after the prompt, line by line."""
+
+    def __init__(self, fail_on=None, finish_reason="stop"):
+        self.fail_on = fail_on
+        self.finish_reason = finish_reason
+        self.requests = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def translate(self, messages):
+        prompt = messages[-1]["content"]
+        text = prompt.split(":\n\n")[-1]
+        self.requests.append(prompt)
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("rate limited")
+        return completion(fake_translation(text), self.finish_reason)
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(CALL_SECONDS)
+            return self.translate(messages)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, model, messages, temperature, max_tokens, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(CALL_SECONDS)
+            return self.translate(messages)
+        finally:
+            self.running -= 1
+
+
+class FakeStreamingCompletions:
+    """Streaming chat completions that send the 'translation' in 3-character deltas."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, model, messages, temperature, max_tokens, stream, **kwargs):
+        prompt = messages[-1]["content"]
+        self.requests.append(prompt)
+        content = fake_translation(prompt.split(":\n\n")[-1])
+
+        async def chunks():
+            for start in range(0, len(content), 3):
+                yield SimpleNamespace(choices=[SimpleNamespace(
+                    delta=SimpleNamespace(content=content[start:start + 3]), finish_reason=None
+                )])
+        return chunks()
+
+
+def fake_client(completions):
+    return SimpleNamespace(api_key="test", chat=SimpleNamespace(completions=completions))
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Make DOCUMENT span several chunks."""
+    monkeypatch.setattr(real_translation, "CHUNK_TOKENS", 150)
+    monkeypatch.setattr(real_translation, "CHUNK_WORKERS", 4)
+    monkeypatch.setattr(real_translation, "_chunk_executor", None)
+
+
+class TestSplitChunks:
+    """Test documents are split on structural boundaries under the budget."""
+
+    def test_split_is_lossless_and_bounded(self):
+        """Test chunks rejoin to the document and stay under the budget."""
+        chunks = split_chunks(DOCUMENT, 150)
+
+        assert len(chunks) > 1
+        assert "".join(chunk + separator for chunk, separator in chunks) == DOCUMENT
+        assert all(count_tokens(chunk) <= 150 for chunk, _ in chunks)
+
+    def test_prefers_section_boundaries(self):
+        """Test sections that fit are never split."""
+        chunks = split_chunks(DOCUMENT, 150)
+
+        assert all(chunk.startswith("SECCIÓN") for chunk, _ in chunks)
+        assert all(separator.strip() in ("---", "") for _, separator in chunks)
+
+    def test_short_document_is_one_chunk(self):
+        """Test documents under the budget are not split."""
+        assert split_chunks("Hola mundo", 150) == [("Hola mundo", "")]
+
+    def test_long_line_split_between_words(self):
+        """Test a single line over the budget is split at spaces."""
+        line = " ".join(["palabra"] * 200)
+
+        chunks = split_chunks(line, 50)
+
+        assert "".join(chunk + separator for chunk, separator in chunks) == line
+        assert all(count_tokens(chunk) <= 50 for chunk, _ in chunks)
+        assert all(not chunk.startswith("alabra") for chunk, _ in chunks)
+
+
+class TestChunkedTranslation:
+    """Test long documents are translated in concurrent chunks."""
+
+    def test_chunks_run_concurrently_in_order(self, small_chunks):
+        """Test chunks overlap, with output reassembled in document order."""
+        completions = FakeCompletions()
+        tool = RealTranslationTool(client=fake_client(completions))
+        chunks = len(split_chunks(DOCUMENT, 150))
+
+        start = time.perf_counter()
+        translated = tool.run(DOCUMENT, "es", "en")
+        elapsed = time.perf_counter() - start
+
+        assert translated == fake_translation(DOCUMENT)
+        assert completions.peak == 4
+        assert elapsed < CALL_SECONDS * chunks / 2
+
+    def test_concurrent_documents_share_chunk_workers(self, small_chunks):
+        """Test chunks of concurrent documents share one pool of CHUNK_WORKERS threads."""
+        completions = FakeCompletions()
+        tool = RealTranslationTool(client=fake_client(completions))
+        results = []
+        documents = [
+            threading.Thread(target=lambda: results.append(tool.run(DOCUMENT, "es", "en")))
+            for _ in range(2)
+        ]
+
+        for document in documents:
+            document.start()
+        for document in documents:
+            document.join()
+
+        assert results == [fake_translation(DOCUMENT)] * 2
+        assert completions.peak == 4
+
+    def test_chunks_get_previous_context(self, small_chunks):
+        """Test every chunk after the first is sent the end of the previous one."""
+        completions = FakeCompletions()
+        RealTranslationTool(client=fake_client(completions)).run(DOCUMENT, "es", "en")
+
+        with_context = [prompt for prompt in completions.requests if "context only" in prompt]
+        assert len(with_context) == len(completions.requests) - 1
+
+    def test_chunk_failures_reported(self, small_chunks):
+        """Test failed chunks are listed in the error."""
+        completions = FakeCompletions(fail_on="SECCIÓN 3")
+        tool = RealTranslationTool(client=fake_client(completions))
+
+        with pytest.raises(ChunkTranslationError) as error:
+            tool.run(DOCUMENT, "es", "en")
+
+        assert list(error.value.failures.values()) == ["rate limited"]
+        assert error.value.total == len(split_chunks(DOCUMENT, 150))
+        assert "rate limited" in str(error.value)
+
+    def test_truncated_output_is_an_error(self):
+        """Test a completion cut off at max_tokens is not returned."""
+        tool = RealTranslationTool(client=fake_client(FakeCompletions(finish_reason="length")))
+
+        with pytest.raises(RuntimeError, match="truncated"):
+            tool.run("Hola mundo", "es", "en")
+
+    def test_stream_yields_chunks_in_order(self, small_chunks):
+        """Test streaming translates chunks concurrently and yields them in order."""
+        completions = FakeAsyncCompletions()
+        tool = RealTranslationTool(client=fake_client(FakeCompletions()), async_client=fake_client(completions))
+
+        async def collect():
+            return [delta async for delta in tool.stream(DOCUMENT, "es", "en")]
+
+        deltas = asyncio.run(collect())
+
+        assert len(deltas) == len(split_chunks(DOCUMENT, 150))
+        assert "".join(deltas).strip() == fake_translation(DOCUMENT)
+        assert completions.peak == 4
+
+
+MASKED = "Número: ***-**-****-X\nCorreo: m*************@ejemplo.es\nPasaporte: ESP-*****4321"
+
+
+class TestMaskPlaceholders:
+    """Test masked PII is sent as placeholders and restored one-to-one."""
+
+    def test_round_trip(self):
+        """Test masks become placeholders and come back unchanged."""
+        compressed, masks = compress_masks(MASKED)
+
+        assert compressed == "Número: [[M1]]\nCorreo: [[M2]]\nPasaporte: [[M3]]"
+        assert masks == ["***-**-****-X", "m*************@ejemplo.es", "ESP-*****4321"]
+        assert restore_masks(compressed, masks) == MASKED
+        assert len(compressed) < len(MASKED)
+
+    def test_restore_requires_each_placeholder_once(self):
+        """Test dropped or duplicated placeholders are rejected."""
+        _, masks = compress_masks(MASKED)
+
+        assert restore_masks("[[M1]] [[M2]]", masks) is None
+        assert restore_masks("[[M1]] [[M2]] [[M3]] [[M3]]", masks) is None
+        assert restore_masks("[[M3]] [[M1]] [[M2]]", masks) == "ESP-*****4321 ***-**-****-X m*************@ejemplo.es"
+
+    def test_surrounding_punctuation_not_masked(self):
+        """Test punctuation around a mask stays in the text sent to the model."""
+        text = "SSN ***-**-1234, (***). Correo: m*****@ejemplo.es."
+
+        compressed, masks = compress_masks(text)
+
+        assert compressed == "SSN [[M1]], ([[M2]]). Correo: [[M3]]."
+        assert masks == ["***-**-1234", "***", "m*****@ejemplo.es"]
+        assert restore_masks(compressed, masks) == text
+
+    def test_existing_placeholder_syntax_left_alone(self):
+        """Test text that already uses the placeholder syntax is not compressed."""
+        assert compress_masks("[[M1]] ***-**") == ("[[M1]] ***-**", [])
+
+    def test_run_sends_placeholders(self):
+        """Test the model sees placeholders and the result has the masks."""
+        completions = FakeCompletions()
+        tool = RealTranslationTool(client=fake_client(completions))
+
+        translated = tool.run(MASKED, "es", "en")
+
+        assert "[[M1]]" in completions.requests[0]
+        assert "*" not in completions.requests[0].split(":\n\n")[-1]
+        assert translated == fake_translation(MASKED)
+
+    def test_lost_placeholder_retries_with_masks(self):
+        """Test a reply that drops a placeholder is translated again with masks inline."""
+        completions = FakeCompletions()
+        translate = completions.translate
+        completions.translate = lambda messages: (
+            completion("EN Número: [[M1]]") if "[[M1]]" in messages[-1]["content"] else translate(messages)
+        )
+        tool = RealTranslationTool(client=fake_client(completions))
+
+        translated = tool.run(MASKED, "es", "en")
+
+        assert translated == fake_translation(MASKED)
+        assert "***-**-****-X" in completions.requests[-1]
+
+    def test_stream_restores_split_placeholders(self):
+        """Test placeholders split across streamed deltas are restored."""
+        completions = FakeStreamingCompletions()
+        tool = RealTranslationTool(client=fake_client(FakeCompletions()), async_client=fake_client(completions))
+
+        async def collect():
+            return [delta async for delta in tool.stream(MASKED, "es", "en")]
+
+        deltas = asyncio.run(collect())
+
+        assert "".join(deltas) == fake_translation(MASKED)
+        assert not any("[[" in delta or "]]" in delta for delta in deltas)
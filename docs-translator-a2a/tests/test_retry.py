@@ -0,0 +1,170 @@
+"""
+Tests for retrying OpenAI requests with backoff and Retry-After.
+"""
+
+import time
+import asyncio
+import httpx
+import openai
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools import retry
+from tools.real_translation import RealTranslationTool
+from tools.retry import (
+    RATE_LIMIT,
+    SERVER_ERROR,
+    TIMEOUT,
+    RetryStats,
+    acall_with_retry,
+    backoff_delay,
+    call_with_retry,
+    classify_error,
+    retry_after_seconds
+)
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(status, headers=None, code=None):
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    body = {"code": code} if code else None
+    if status == 429:
+        return openai.RateLimitError("rate limited", response=response, body=body)
+    if status >= 500:
+        return openai.InternalServerError("upstream error", response=response, body=body)
+    return openai.BadRequestError("bad request", response=response, body=body)
+
+
+def timeout_error():
+    return openai.APITimeoutError(request=REQUEST)
+
+
+class FlakyCall:
+    """A call that raises the given errors, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """Short backoff and fresh counters."""
+    monkeypatch.setattr(retry, "BASE_DELAY", 0.01)
+    monkeypatch.setattr(retry, "MAX_DELAY", 0.05)
+    monkeypatch.setattr(retry, "RETRY_ATTEMPTS", 4)
+    monkeypatch.setattr(retry, "DEADLINE_SECONDS", 5)
+    stats = RetryStats()
+    monkeypatch.setattr(retry, "_stats", stats)
+    return stats
+
+
+class TestClassification:
+    """Test which errors are retried and how long to wait."""
+
+    def test_retryable_kinds(self):
+        """Test 429, 5xx and timeouts are retried; client errors and exhausted quota are not."""
+        assert classify_error(status_error(429)) == RATE_LIMIT
+        assert classify_error(status_error(503)) == SERVER_ERROR
+        assert classify_error(timeout_error()) == TIMEOUT
+        assert classify_error(status_error(400)) is None
+        assert classify_error(status_error(429, code="insufficient_quota")) is None
+        assert classify_error(RuntimeError("boom")) is None
+
+    def test_retry_after_headers(self):
+        """Test retry-after-ms, retry-after seconds and HTTP dates are read."""
+        assert retry_after_seconds(status_error(429, {"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(status_error(429, {"retry-after": "3"})) == 3
+        assert retry_after_seconds(status_error(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+        assert retry_after_seconds(status_error(429, {"retry-after": "soon"})) is None
+        assert retry_after_seconds(status_error(429)) is None
+
+    def test_rate_limit_waits_for_retry_after(self):
+        """Test Retry-After is honoured even above the backoff cap."""
+        assert backoff_delay(1, status_error(429, {"retry-after": "2"})) == 2
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test delays are random and never above MAX_DELAY."""
+        delays = {backoff_delay(10, status_error(500)) for _ in range(20)}
+
+        assert len(delays) > 1
+        assert all(0 <= delay <= 0.05 for delay in delays)
+
+
+class TestCallWithRetry:
+    """Test transient errors are absorbed and counted."""
+
+    def test_recovers_from_transient_errors(self, fast_retries):
+        """Test a call failing with 429, 5xx and a timeout succeeds on the fourth attempt."""
+        call = FlakyCall(status_error(429, {"retry-after-ms": "10"}), status_error(502), timeout_error())
+
+        assert call_with_retry(call) == "ok"
+        assert call.calls == 4
+        stats = fast_retries.stats()
+        assert stats["retries"][RATE_LIMIT] == stats["retries"][SERVER_ERROR] == stats["retries"][TIMEOUT] == 1
+        assert stats["recovered"] == 1
+
+    def test_client_error_not_retried(self, fast_retries):
+        """Test a 400 is raised on the first attempt."""
+        call = FlakyCall(status_error(400))
+
+        with pytest.raises(openai.BadRequestError):
+            call_with_retry(call)
+        assert call.calls == 1
+
+    def test_attempts_exhausted(self, fast_retries):
+        """Test the last error is raised after RETRY_ATTEMPTS attempts."""
+        call = FlakyCall(*[status_error(500) for _ in range(5)])
+
+        with pytest.raises(openai.InternalServerError):
+            call_with_retry(call)
+        assert call.calls == 4
+        assert fast_retries.stats()["exhausted"] == 1
+
+    def test_deadline_stops_long_waits(self, fast_retries):
+        """Test a Retry-After past the deadline fails at once instead of sleeping."""
+        call = FlakyCall(status_error(429, {"retry-after": "30"}))
+
+        start = time.perf_counter()
+        with pytest.raises(openai.RateLimitError):
+            call_with_retry(call)
+
+        assert time.perf_counter() - start < 1
+        assert fast_retries.stats()["deadline_exceeded"] == 1
+
+    def test_async_recovers(self, fast_retries):
+        """Test the async variant retries the coroutine factory."""
+        call = FlakyCall(status_error(503))
+
+        async def request():
+            return call()
+
+        assert asyncio.run(acall_with_retry(request)) == "ok"
+        assert call.calls == 2
+
+    def test_translation_survives_rate_limit(self):
+        """Test a rate-limited completion is retried inside the translation tool."""
+        call = FlakyCall(status_error(429, {"retry-after-ms": "10"}))
+
+        def create(**kwargs):
+            call()
+            return SimpleNamespace(choices=[SimpleNamespace(
+                message=SimpleNamespace(content="Hello world"), finish_reason="stop"
+            )])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        assert RealTranslationTool(client=client).run("Hola mundo", "es", "en") == "Hello world"
+        assert call.calls == 2
@@ -0,0 +1,131 @@
+"""
+Tests for token estimates, dynamic max_tokens and token usage recording.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools import token_budget
+from tools.real_translation import RealTranslationTool
+from tools.token_budget import (
+    MAX_OUTPUT_TOKENS,
+    MIN_OUTPUT_TOKENS,
+    TokenUsage,
+    chunk_token_budget,
+    count_tokens,
+    max_output_tokens
+)
+
+
+def response(content, finish_reason="stop", completion_tokens=10):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        usage=SimpleNamespace(prompt_tokens=100, completion_tokens=completion_tokens)
+    )
+
+
+class RecordingCompletions:
+    """Chat completions that record max_tokens and reply with the given finish reasons."""
+
+    def __init__(self, finish_reasons=("stop",)):
+        self.finish_reasons = list(finish_reasons)
+        self.max_tokens = []
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        self.max_tokens.append(max_tokens)
+        finish_reason = self.finish_reasons.pop(0) if len(self.finish_reasons) > 1 else self.finish_reasons[0]
+        return response("Hello world", finish_reason)
+
+
+@pytest.fixture
+def usage(monkeypatch):
+    """Record token usage in a fresh TokenUsage."""
+    usage = TokenUsage()
+    monkeypatch.setattr(token_budget, "_usage", usage)
+    return usage
+
+
+@pytest.fixture
+def heuristic(monkeypatch):
+    """Count tokens with the character heuristic."""
+    monkeypatch.setattr(token_budget, "tiktoken", None)
+    token_budget._encoding.cache_clear()
+    yield
+    token_budget._encoding.cache_clear()
+
+
+class TestTokenEstimates:
+    """Test token counts and output budgets."""
+
+    def test_heuristic_counts(self, heuristic):
+        """Test Latin text counts 4 characters per token and other scripts 2."""
+        assert count_tokens("a" * 400) == 101
+        assert count_tokens("я" * 400) == 201
+
+    def test_output_scales_with_language(self):
+        """Test denser target languages reserve more output tokens."""
+        english = max_output_tokens(1000, "es", "en")
+        ukrainian = max_output_tokens(1000, "es", "uk")
+
+        assert english < ukrainian
+        assert english >= 1000 * 1.0 / 1.2
+
+    def test_output_clamped(self):
+        """Test max_tokens stays between the minimum and the model cap."""
+        assert max_output_tokens(1, "es", "en") == MIN_OUTPUT_TOKENS
+        assert max_output_tokens(100000, "es", "en") == MAX_OUTPUT_TOKENS
+
+    def test_chunk_budget_fits_output_cap(self):
+        """Test chunks shrink for pairs whose translation would exceed the cap."""
+        budget = chunk_token_budget(100000, "en", "uk")
+
+        assert max_output_tokens(budget, "en", "uk") <= MAX_OUTPUT_TOKENS
+        assert budget < MAX_OUTPUT_TOKENS
+        assert chunk_token_budget(150, "en", "uk") == 150
+
+
+class TestDynamicMaxTokens:
+    """Test completions reserve a sized max_tokens and record usage."""
+
+    def test_short_text_reserves_less_than_cap(self, usage):
+        """Test a short document does not reserve the full output cap."""
+        completions = RecordingCompletions()
+        tool = RealTranslationTool(client=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+        assert tool.run("Hola mundo", "es", "en") == "Hello world"
+        assert completions.max_tokens == [MIN_OUTPUT_TOKENS]
+
+    def test_truncation_retries_with_cap(self, usage):
+        """Test output cut off at the sized max_tokens is requested again at the cap."""
+        completions = RecordingCompletions(finish_reasons=("length", "stop"))
+        tool = RealTranslationTool(client=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+        assert tool.run("Hola mundo", "es", "en") == "Hello world"
+        assert completions.max_tokens == [MIN_OUTPUT_TOKENS, MAX_OUTPUT_TOKENS]
+        assert usage.stats()["truncation_retries"] == 1
+
+    def test_usage_recorded(self, usage):
+        """Test estimated and reported tokens are compared in the stats."""
+        completions = RecordingCompletions()
+        tool = RealTranslationTool(client=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+        tool.run("Hola mundo", "es", "en")
+        stats = usage.stats()
+
+        assert stats["completions"] == 1
+        assert stats["prompt_tokens"] == 100
+        assert stats["reserved_completion_tokens"] == MIN_OUTPUT_TOKENS
+        assert stats["reserved_used_ratio"] == round(10 / MIN_OUTPUT_TOKENS, 3)
+        assert stats["prompt_estimate_ratio"] > 0
+
+    def test_missing_usage_ignored(self, usage):
+        """Test responses without usage are not counted."""
+        usage.record(10, 256, None)
+
+        assert usage.stats()["completions"] == 0
+        assert usage.stats()["prompt_estimate_ratio"] is None
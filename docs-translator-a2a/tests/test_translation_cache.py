@@ -0,0 +1,195 @@
+"""
+Tests for the translation result cache.
+"""
+
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastapi.testclient import TestClient
+
+import crew_agent
+from a2a_server import app
+from translation_cache import TranslationCache, translation_cache_key
+
+
+def key(text, model="gpt-4o", prompt_version="1"):
+    return translation_cache_key(text, "es", "en", "general", model, prompt_version)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh memory-only cache used by the translation entry points (no translation memory)."""
+    cache = TranslationCache()
+    monkeypatch.setattr(crew_agent, "get_translation_cache", lambda: cache)
+    monkeypatch.setattr(crew_agent, "get_translation_memory", lambda: None)
+    return cache
+
+
+@pytest.fixture
+def counted_translation(monkeypatch):
+    """Replace the OpenAI calls with an echo that counts calls."""
+    calls = []
+
+    def fake_translate(text, source_lang, target_lang, doc_type="general"):
+        calls.append(text)
+        return f"EN: {text}"
+    monkeypatch.setattr(crew_agent, "translate_text", fake_translate)
+
+    async def fake_stream(text, source_lang, target_lang, doc_type="general"):
+        calls.append(text)
+        for word in f"EN: {text}".split():
+            yield word + " "
+    monkeypatch.setattr(crew_agent, "stream_translate_text", fake_stream)
+    return calls
+
+
+def invoke_request(text="Certificado de Nacimiento"):
+    return {
+        "capability": "translate_document",
+        "parameters": {"text": text, "source_language": "es", "target_language": "en"}
+    }
+
+
+class TestTranslationCache:
+    """Test the memory and SQLite tiers."""
+
+    def test_key_includes_model_and_prompt_version(self):
+        """Test a new model or prompt never reuses old translations."""
+        assert key("Hola") == key("Hola")
+        assert key("Hola") != key("Hola", model="gpt-4o-mini")
+        assert key("Hola") != key("Hola", prompt_version="2")
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = TranslationCache(max_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+        assert cache.get("c") == "C"
+
+    def test_ttl_expiry(self):
+        """Test expired entries are misses."""
+        cache = TranslationCache(ttl_seconds=-1)
+        cache.set("a", "A")
+
+        assert cache.get("a") is None
+
+    def test_empty_translation_not_cached(self):
+        """Test empty translations are not stored."""
+        cache = TranslationCache()
+        cache.set("a", "")
+
+        assert cache.get("a") is None
+        assert cache.stats()["stores"] == 0
+
+    def test_persistent_tier(self, tmp_path):
+        """Test translations survive a restart and are promoted to memory."""
+        db_path = str(tmp_path / "cache.db")
+        TranslationCache(db_path=db_path).set("a", "A")
+
+        cache = TranslationCache(db_path=db_path)
+
+        assert cache.get("a") == "A"
+        assert cache.get("a") == "A"
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["persistent"] is True
+
+    def test_stats(self):
+        """Test hit rate counts memory and disk hits over all lookups."""
+        cache = TranslationCache()
+        cache.set("a", "A")
+        cache.get("a")
+        cache.get("b")
+        cache.record_bypass()
+
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bypasses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class TestCachedTranslation:
+    """Test the translation entry points and the server use the cache."""
+
+    def test_repeat_translation_is_cached(self, cache, counted_translation):
+        """Test a repeated document is translated once."""
+        first = crew_agent.translate_document_crew("Hola", "es", "en")
+        second = crew_agent.translate_document_crew("Hola", "es", "en")
+
+        assert counted_translation == ["Hola"]
+        assert (first["cache"], second["cache"]) == ("miss", "hit")
+        assert second["translated_text"] == "EN: Hola"
+
+    def test_bypass_refreshes_entry(self, cache, counted_translation):
+        """Test use_cache=False translates again and stores the result."""
+        crew_agent.translate_document_crew("Hola", "es", "en")
+        result = crew_agent.translate_document_crew("Hola", "es", "en", use_cache=False)
+
+        assert result["cache"] == "bypass"
+        assert counted_translation == ["Hola", "Hola"]
+        assert cache.stats()["stores"] == 2
+
+    def test_stream_shares_cache(self, cache, counted_translation):
+        """Test a streamed translation is cached for /invoke and vice versa."""
+        async def collect(text):
+            return "".join([d async for d in crew_agent.stream_translate_document_crew(text, "es", "en")])
+
+        streamed = asyncio.run(collect("Hola"))
+        result = crew_agent.translate_document_crew("Hola", "es", "en")
+        crew_agent.translate_document_crew("Adios", "es", "en")
+        replayed = asyncio.run(collect("Adios"))
+
+        assert streamed.strip() == result["translated_text"] == "EN: Hola"
+        assert replayed == "EN: Adios"
+        assert counted_translation == ["Hola", "Adios"]
+
+    def test_stream_cache_io_off_event_loop(self, cache, counted_translation, monkeypatch):
+        """Test the streaming path reads and writes the cache outside the loop's thread."""
+        threads = []
+        get, set_ = cache.get, cache.set
+        monkeypatch.setattr(cache, "get", lambda *a: threads.append(threading.current_thread()) or get(*a))
+        monkeypatch.setattr(cache, "set", lambda *a: threads.append(threading.current_thread()) or set_(*a))
+
+        async def collect(text):
+            deltas = [d async for d in crew_agent.stream_translate_document_crew(text, "es", "en")]
+            return threading.current_thread(), "".join(deltas)
+
+        loop_thread, streamed = asyncio.run(collect("Hola"))
+
+        assert streamed.strip() == "EN: Hola"
+        assert len(threads) == 2
+        assert loop_thread not in threads
+
+    def test_invoke_cache_header(self, cache, counted_translation):
+        """Test /invoke reports the cache status and honours no-cache."""
+        client = TestClient(app)
+
+        miss = client.post("/invoke", json=invoke_request())
+        hit = client.post("/invoke", json=invoke_request())
+        bypass = client.post("/invoke", json=invoke_request(), headers={"Cache-Control": "no-cache"})
+
+        assert miss.headers["x-translation-cache"] == "miss"
+        assert hit.headers["x-translation-cache"] == "hit"
+        assert hit.json()["metadata"]["cache"] == "hit"
+        assert bypass.headers["x-translation-cache"] == "bypass"
+        assert len(counted_translation) == 2
+
+    def test_health_reports_cache_stats(self):
+        """Test /health exposes the cache counters."""
+        stats = TestClient(app).get("/health").json()["translation_cache"]
+
+        assert "hit_rate" in stats
+        assert "memory_entries" in stats
@@ -0,0 +1,214 @@
+"""
+Tests for the segment-level translation memory.
+"""
+
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import crew_agent
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory, alignment_problem, split_segments
+
+BOILERPLATE = """DECLARACIÓN OFICIAL
+
+Este certificado es un documento oficial emitido por el Registro Civil de España.
+
+---
+
+NOTAS IMPORTANTES:
+
+1. Este documento debe ser presentado junto con identificación con fotografía válida.
+2. Para uso en país extranjero, puede requerir apostilla o legalización."""
+
+
+def document(name):
+    return f"CERTIFICADO DE NACIMIENTO\n\nNombre Completo: {name}\nNúmero: ***-**-****-X\n\n---\n\n{BOILERPLATE}"
+
+
+def fake_translation(text):
+    """Line-by-line 'translation' that keeps structure, like the prompt asks."""
+    return "\n".join(f"EN {line}" if line.strip() and line.strip() != "---" else line for line in text.split("\n"))
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    """Fresh translation memory, with the document-level cache disabled."""
+    memory = TranslationMemory(TranslationCache())
+    monkeypatch.setattr(crew_agent, "get_translation_memory", lambda: memory)
+    monkeypatch.setattr(crew_agent, "get_translation_cache", lambda: TranslationCache(max_entries=0))
+    return memory
+
+
+@pytest.fixture
+def model_requests(monkeypatch):
+    """Replace the OpenAI calls with fake_translation, recording the text sent."""
+    requests = []
+
+    def fake_translate(text, source_lang, target_lang, doc_type="general"):
+        requests.append(text)
+        return fake_translation(text)
+    monkeypatch.setattr(crew_agent, "translate_text", fake_translate)
+
+    async def fake_stream(text, source_lang, target_lang, doc_type="general"):
+        requests.append(text)
+        for line in fake_translation(text).splitlines(keepends=True):
+            yield line
+    monkeypatch.setattr(crew_agent, "stream_translate_text", fake_stream)
+    return requests
+
+
+class TestSegmentation:
+    """Test documents split into segments and back."""
+
+    def test_split_is_lossless(self):
+        """Test joining the parts gives back the document."""
+        text = document("María García")
+        parts = split_segments(text)
+
+        assert "".join(parts) == text
+        assert "DECLARACIÓN OFICIAL" in parts[::2]
+        assert "---" in parts[1::2]
+
+
+class TestAlignment:
+    """Test translated segments are checked against their sources before learning."""
+
+    SOURCES = [
+        "Nombre Completo: María García López",
+        "Fecha de Nacimiento: 15 de marzo de 1985",
+        "Lugar de Nacimiento: Madrid, España",
+    ]
+
+    def test_aligned_segments(self):
+        """Test a faithful translation passes, with numbers reordered."""
+        translations = [
+            "Full Name: María García López",
+            "Date of Birth: March 15, 1985",
+            "Place of Birth: Madrid, Spain",
+        ]
+
+        assert alignment_problem(self.SOURCES, translations) is None
+
+    def test_count_mismatch(self):
+        """Test a reply with fewer segments is rejected."""
+        assert "2 translated segments" in alignment_problem(self.SOURCES, ["a", "b"])
+
+    def test_changed_masks(self):
+        """Test a translation that drops a mask is rejected."""
+        problem = alignment_problem(["Número: ***-**-****-X"], ["Number: X"])
+
+        assert "numbers or masks" in problem
+
+    def test_merge_and_split_without_numbers(self):
+        """Test a merge and a split that cancel out are caught by length."""
+        sources = [
+            "Este certificado es un documento oficial.",
+            "Debe presentarse con identificación válida.",
+            "Para uso en el extranjero puede requerir apostilla o legalización.",
+        ]
+        translations = [
+            "This certificate is an official document. It must be presented with valid ID.",
+            "For use abroad it may require",
+            "an apostille or legalization.",
+        ]
+
+        assert "length ratio" in alignment_problem(sources, translations)
+
+    def test_merged_and_split_reply_not_learned(self):
+        """Test learn stores nothing when segments shifted but their count matches."""
+        memory = TranslationMemory(TranslationCache())
+        match = memory.lookup("\n\n".join(self.SOURCES), "es", "en", "model", "v1")
+        reply = "\n\n".join([
+            "Full Name: María García López. Date of Birth: March 15, 1985",
+            "Place of Birth:",
+            "Madrid, Spain",
+        ])
+
+        assert not memory.learn(match, reply, match.missing)
+        assert match.translations == {}
+        assert memory.stats()["memory_entries"] == 0
+
+
+class TestTranslationMemory:
+    """Test only unseen segments are sent to the model."""
+
+    def test_boilerplate_not_resent(self, memory, model_requests):
+        """Test a second document sends only the segments that differ."""
+        crew_agent.translate_document_crew(document("María García"), "es", "en")
+        result = crew_agent.translate_document_crew(document("Juan Morales"), "es", "en")
+
+        assert len(model_requests) == 2
+        assert model_requests[1] == "Nombre Completo: Juan Morales\nNúmero: ***-**-****-X"
+        assert result["translated_text"] == fake_translation(document("Juan Morales"))
+
+    def test_identical_segments_skip_model(self, memory, model_requests):
+        """Test a document made only of known segments needs no model call."""
+        crew_agent.translate_document_crew(document("María García"), "es", "en")
+        result = crew_agent.translate_document_crew(BOILERPLATE, "es", "en")
+
+        assert len(model_requests) == 1
+        assert result["translated_text"] == fake_translation(BOILERPLATE)
+
+    def test_language_pairs_are_separate(self, memory, model_requests):
+        """Test segments are only reused for the same language pair."""
+        crew_agent.translate_document_crew(document("María García"), "es", "en")
+        crew_agent.translate_document_crew(document("María García"), "es", "pl")
+
+        assert model_requests[1] == document("María García")
+
+    def test_misaligned_reply_falls_back(self, memory, model_requests, monkeypatch):
+        """Test a reply that merges segments is not used; the whole document is translated."""
+        crew_agent.translate_document_crew(document("María García"), "es", "en")
+
+        def merging_translate(text, source_lang, target_lang, doc_type="general"):
+            model_requests.append(text)
+            return fake_translation(text).replace("\n\n---\n\n", "\n")
+        monkeypatch.setattr(crew_agent, "translate_text", merging_translate)
+        text = document("Juan Morales").replace("NACIMIENTO", "MATRIMONIO")
+        result = crew_agent.translate_document_crew(text, "es", "en")
+
+        assert model_requests[1] == "CERTIFICADO DE MATRIMONIO\n\n---\n\nNombre Completo: Juan Morales\nNúmero: ***-**-****-X"
+        assert model_requests[2] == text
+        assert "EN Nombre Completo: Juan Morales" in result["translated_text"]
+
+    def test_stream_reuses_segments(self, memory, model_requests):
+        """Test streaming sends only unseen segments and yields the whole document."""
+        async def collect(text):
+            return "".join([d async for d in crew_agent.stream_translate_document_crew(text, "es", "en")])
+
+        first = asyncio.run(collect(document("María García")))
+        second = asyncio.run(collect(document("Juan Morales")))
+
+        assert first == fake_translation(document("María García"))
+        assert second == fake_translation(document("Juan Morales"))
+        assert model_requests[1] == "Nombre Completo: Juan Morales\nNúmero: ***-**-****-X"
+
+    def test_stream_memory_io_off_event_loop(self, memory, model_requests, monkeypatch):
+        """Test the streaming path looks up and learns segments outside the loop's thread."""
+        threads = []
+        lookup, learn = memory.lookup, memory.learn
+        monkeypatch.setattr(memory, "lookup", lambda *a, **k: threads.append(threading.current_thread()) or lookup(*a, **k))
+        monkeypatch.setattr(memory, "learn", lambda *a, **k: threads.append(threading.current_thread()) or learn(*a, **k))
+
+        async def collect(text):
+            deltas = [d async for d in crew_agent.stream_translate_document_crew(text, "es", "en")]
+            return threading.current_thread(), "".join(deltas)
+
+        loop_thread, streamed = asyncio.run(collect(document("María García")))
+
+        assert streamed == fake_translation(document("María García"))
+        assert len(threads) == 2
+        assert loop_thread not in threads
+
+    def test_bypass_translates_everything(self, memory, model_requests):
+        """Test use_cache=False sends the whole document again."""
+        crew_agent.translate_document_crew(document("María García"), "es", "en")
+        crew_agent.translate_document_crew(document("Juan Morales"), "es", "en", use_cache=False)
+
+        assert model_requests[1] == document("Juan Morales")
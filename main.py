@@ -7,6 +7,7 @@ This script demonstrates the complete document processing pipeline with A2A inte
 import os
 import logging
 import asyncio
+import textwrap
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -40,6 +41,10 @@ async def main():
     # Import agents and tools
     from agents import create_intake_agent, create_processing_agent
     from tools import create_remote_vendor_agent
+    from observability.timing import timed
+    from tools.circuit_breaker import VendorHealthProber
+    from tools.http_client import close_vendor_http_client, get_vendor_http_client
+    from tools.vendor_connector import get_vendor_endpoints, test_vendor_connection
 
     # Sample document path
     sample_doc = Path(__file__).parent / "samples" / "sample_document.txt"
@@ -50,94 +55,109 @@ async def main():
 
     logger.info(f"\n[Step 1] Document to process: {sample_doc.name}")
 
-    # Create remote vendor agent (A2A connection)
-    logger.info("\n[Step 2] Creating A2A connection to vendor...")
-    remote_vendor = create_remote_vendor_agent()
-
-    # Test vendor connectivity
-    from tools.vendor_connector import test_vendor_connection
-    vendor_reachable = test_vendor_connection(remote_vendor)
-
-    if not vendor_reachable:
-        logger.warning("⚠️  Vendor server not reachable!")
-        logger.warning("Please start the vendor server first:")
-        logger.warning("  python docs-translator-a2a/src/a2a_server.py")
-        logger.warning("\nContinuing with demo (vendor call may fail)...")
-    else:
-        logger.info("✓ Vendor A2A server is online and ready")
-
-    # Create agents
-    logger.info("\n[Step 3] Creating government agents...")
-    intake_agent = create_intake_agent()
-    processing_agent = create_processing_agent(remote_vendor_agent=remote_vendor)
-
-    logger.info(f"  ✓ Created: {intake_agent.name}")
-    logger.info(f"  ✓ Created: {processing_agent.name}")
-    logger.info(f"  ✓ Connected to vendor: {remote_vendor.name}")
-
-    # Stage 1: Document Intake
-    logger.info("\n" + "=" * 80)
-    logger.info("[STAGE 1: DOCUMENT INTAKE]")
-    logger.info("=" * 80)
-
-    # Import ADK components
-    from google.adk.runners import Runner
-    from google.adk.sessions import InMemorySessionService
-
-    # Create session service for state management (Day 3 pattern)
-    session_service = InMemorySessionService()
-    logger.info("✓ Session service initialized (InMemorySessionService)")
-
-    # Create runner with session management
-    intake_runner = Runner(
-        app_name="enterprise_docs_intake",
-        agent=intake_agent,
-        session_service=session_service
-    )
-    intake_prompt = f"Please validate the document at: {sample_doc}"
-
-    logger.info(f"\nPrompt: {intake_prompt}")
-    logger.info("\nIntake Agent processing...")
-
-    intake_result = await intake_runner.run(intake_prompt)
-
-    logger.info("\n--- Intake Agent Response ---")
-    logger.info(intake_result.response_text)
-
-    # Stage 2: Document Processing with A2A
-    logger.info("\n" + "=" * 80)
-    logger.info("[STAGE 2: DOCUMENT PROCESSING WITH A2A]")
-    logger.info("=" * 80)
-
-    # Create runner with same session service for state continuity
-    processing_runner = Runner(
-        app_name="enterprise_docs_processing",
-        agent=processing_agent,
-        session_service=session_service
-    )
-    processing_prompt = f"""Process the document at {sample_doc} through the complete pipeline:
-
-1. Extract text using OCR
-2. Apply security filtering (mask PII)
-3. Send to external vendor via A2A for translation (Spanish to English)
-4. Verify vendor response
-5. Return final processed document
-
-Document type: birth_certificate
-Target language: English"""
-
-    logger.info(f"\nPrompt: {processing_prompt}")
-    logger.info("\nProcessing Agent pipeline:")
-    logger.info("  → Step 1: OCR extraction")
-    logger.info("  → Step 2: PII filtering (pre-vendor)")
-    logger.info("  → Step 3: A2A vendor call [CROSS-ORG BOUNDARY]")
-    logger.info("  → Step 4: Security verification (post-vendor)")
-    logger.info("  → Step 5: Final compilation")
-
-    processing_result = await processing_runner.run(processing_prompt)
-
-    logger.info("\n--- Processing Agent Response ---")
-    logger.info(processing_result.response_text)
+    probers = []
+    try:
+        # Create remote vendor agent (A2A connection)
+        logger.info("\n[Step 2] Creating A2A connection to vendor...")
+        endpoints = get_vendor_endpoints()
+        remote_vendor = create_remote_vendor_agent(endpoints=endpoints)
+
+        # Test vendor connectivity
+        vendor_reachable = await test_vendor_connection(remote_vendor)
+
+        if not vendor_reachable:
+            logger.warning("⚠️  Vendor server not reachable!")
+            logger.warning("Please start the vendor server first:")
+            logger.warning("  python docs-translator-a2a/src/a2a_server.py")
+            logger.warning("\nVendor circuit is open: documents are parked at the vendor stage")
+            logger.warning("until a health probe sees the vendor again.")
+        else:
+            logger.info("✓ Vendor A2A server is online and ready")
+
+        # Keep probing in the background so the circuit breakers follow the vendor
+        probers = [VendorHealthProber(url, get_vendor_http_client()) for url in endpoints]
+        for prober in probers:
+            prober.start()
+
+        # Create agents
+        logger.info("\n[Step 3] Creating government agents...")
+        intake_agent = create_intake_agent()
+        processing_agent = create_processing_agent(remote_vendor_agent=remote_vendor)
+
+        logger.info(f"  ✓ Created: {intake_agent.name}")
+        logger.info(f"  ✓ Created: {processing_agent.name}")
+        logger.info(f"  ✓ Connected to vendor: {remote_vendor.name}")
+
+        # Stage 1: Document Intake
+        logger.info("\n" + "=" * 80)
+        logger.info("[STAGE 1: DOCUMENT INTAKE]")
+        logger.info("=" * 80)
+
+        # Import ADK components
+        from google.adk.runners import Runner
+        from google.adk.sessions import InMemorySessionService
+
+        # Create session service for state management (Day 3 pattern)
+        session_service = InMemorySessionService()
+        logger.info("✓ Session service initialized (InMemorySessionService)")
+
+        # Create runner with session management
+        intake_runner = Runner(
+            app_name="enterprise_docs_intake",
+            agent=intake_agent,
+            session_service=session_service
+        )
+        intake_prompt = f"Please validate the document at: {sample_doc}"
+
+        logger.info(f"\nPrompt: {intake_prompt}")
+        logger.info("\nIntake Agent processing...")
+
+        with timed("agent.intake"):
+            intake_result = await intake_runner.run(intake_prompt)
+
+        logger.info("\n--- Intake Agent Response ---")
+        logger.info(intake_result.response_text)
+
+        # Stage 2: Document Processing with A2A
+        logger.info("\n" + "=" * 80)
+        logger.info("[STAGE 2: DOCUMENT PROCESSING WITH A2A]")
+        logger.info("=" * 80)
+
+        # Create runner with same session service for state continuity
+        processing_runner = Runner(
+            app_name="enterprise_docs_processing",
+            agent=processing_agent,
+            session_service=session_service
+        )
+        processing_prompt = textwrap.dedent(f"""\
+            Process the document at {sample_doc} through the complete pipeline:
+
+            1. Extract text using OCR
+            2. Apply security filtering (mask PII)
+            3. Send to external vendor via A2A for translation (Spanish to English)
+            4. Verify vendor response
+            5. Return final processed document
+
+            Document type: birth_certificate
+            Target language: English""")
+
+        logger.info(f"\nPrompt: {processing_prompt}")
+        logger.info("\nProcessing Agent pipeline:")
+        logger.info("  → Step 1: OCR extraction")
+        logger.info("  → Step 2: PII filtering (pre-vendor)")
+        logger.info("  → Step 3: A2A vendor call [CROSS-ORG BOUNDARY]")
+        logger.info("  → Step 4: Security verification (post-vendor)")
+        logger.info("  → Step 5: Final compilation")
+
+        with timed("agent.processing"):
+            processing_result = await processing_runner.run(processing_prompt)
+
+        logger.info("\n--- Processing Agent Response ---")
+        logger.info(processing_result.response_text)
+    finally:
+        for prober in probers:
+            await prober.stop()
+        await close_vendor_http_client()
 
     # Summary
     logger.info("\n" + "=" * 80)
@@ -166,9 +186,127 @@ Target language: English"""
     logger.info("=" * 80)
 
 
+async def main_batch(
+    document_paths,
+    document_type="general",
+    target_language="en",
+    checkpoint_dir=None,
+    resume=False
+):
+    """
+    Batch mode: process many documents through the staged pipeline runner.
+
+    Stages run as bounded worker pools (CPU stages on a process pool, vendor
+    calls as coroutines), so documents overlap instead of running one after
+    another. No Gemini model is involved, only the vendor's translation.
+
+    With a checkpoint directory, stage results are persisted per document and
+    resume=True skips stages completed by a previous run.
+    """
+    from pipeline import VENDOR_UNAVAILABLE, CheckpointStore, StagedPipelineRunner
+    from observability.timing import timed
+    from tools.circuit_breaker import VendorHealthProber
+    from tools.concurrency_limiter import get_concurrency_limiter
+    from tools.http_client import close_vendor_http_client, get_vendor_http_client
+    from tools.vendor_connector import get_vendor_endpoints, translate_via_vendor
+
+    logger.info("=" * 80)
+    logger.info(f"Batch processing {len(document_paths)} documents")
+    endpoints = get_vendor_endpoints()
+    logger.info(f"Vendor: {', '.join(endpoints)}")
+    if checkpoint_dir:
+        logger.info(f"Checkpoints: {checkpoint_dir} (resume={resume})")
+    logger.info("=" * 80)
+
+    # Enough vendor workers for every limiter to reach its ceiling: the
+    # adaptive limiters, not the worker count, decide how many calls are sent
+    limiters = [get_concurrency_limiter(url) for url in endpoints]
+    vendor_workers = os.getenv("PIPELINE_VENDOR_CONCURRENCY")
+    runner = StagedPipelineRunner(
+        vendor_call=translate_via_vendor,
+        concurrency={"vendor": int(vendor_workers or sum(l.max_limit for l in limiters))},
+        queue_size=int(os.getenv("PIPELINE_QUEUE_SIZE", "8")),
+        checkpoints=CheckpointStore(checkpoint_dir) if checkpoint_dir else None,
+        resume=resume,
+        default_document_type=document_type,
+        default_target_language=target_language
+    )
+    # Health probes feed the vendor's circuit breaker during the run: while
+    # it is open, documents are parked instead of waiting on vendor timeouts
+    probers = [VendorHealthProber(url, get_vendor_http_client()) for url in endpoints]
+    for prober in probers:
+        prober.start()
+    try:
+        with timed("pipeline.batch"):
+            results = await runner.run(document_paths)
+    finally:
+        for prober in probers:
+            await prober.stop()
+        await close_vendor_http_client()
+
+    for limiter in limiters:
+        stats = limiter.snapshot()
+        logger.info(
+            f"Vendor concurrency {stats['name']}: limit {stats['limit']} "
+            f"({stats['increases']} increases, {stats['decreases']} decreases)"
+        )
+
+    for item in results:
+        if item["status"] == VENDOR_UNAVAILABLE:
+            hint = " (rerun with --resume to continue from the vendor stage)" if checkpoint_dir else ""
+            logger.warning(f"⏸ {item['document_path']}: parked, vendor unavailable{hint}")
+        elif item["status"] == "error":
+            logger.error(
+                f"✗ {item['document_path']}: failed at {item['failed_stage']} "
+                f"({item['error_message']})"
+            )
+        else:
+            logger.info(
+                f"✓ {item['document_path']}: {item['status']} "
+                f"-> {item['processing_result']['translated_text_ref']}"
+            )
+
+    return results
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch", nargs="+", metavar="DOCUMENT",
+        help="Process these documents with the staged batch pipeline"
+    )
+    parser.add_argument("--document-type", default="general")
+    parser.add_argument("--target-language", default="en")
+    parser.add_argument(
+        "--checkpoint-dir", default=os.getenv("PIPELINE_CHECKPOINT_DIR"),
+        help="Persist per-stage results here (default: PIPELINE_CHECKPOINT_DIR)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip stages that already have a checkpoint"
+    )
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume requires --checkpoint-dir or PIPELINE_CHECKPOINT_DIR")
+
+    # Per-stage latency report at exit (and on SIGUSR1 while running)
+    from observability.timing import install_dump_handlers
+    install_dump_handlers()
+
     try:
-        asyncio.run(main())
+        if args.batch:
+            asyncio.run(main_batch(
+                args.batch,
+                args.document_type,
+                args.target_language,
+                checkpoint_dir=args.checkpoint_dir,
+                resume=args.resume
+            ))
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("\nDemo interrupted by user")
     except Exception as e:
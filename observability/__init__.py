@@ -0,0 +1,9 @@
+"""
+Observability helpers shared by every layer of the pipeline.
+
+- timing: Per-stage latency histograms and report dumps
+
+Dependency-free (standard library only), so low-level modules such as
+security.policy can record timings without importing the tools package
+and its ADK and HTTP dependencies.
+"""
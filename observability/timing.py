@@ -0,0 +1,246 @@
+"""
+Timing: Per-stage latency histograms for the document pipeline.
+
+A lightweight, in-process timing layer. Durations are recorded into
+HDR-style histograms (log-linear buckets with ~0.1% relative error), so
+percentiles stay accurate without keeping every sample:
+
+    @timed("tool.ocr_tool")
+    def ocr_tool(...): ...
+
+    with timed("stage.vendor"):
+        ...
+
+    print(format_report())   # count, p50, p95, p99, max per stage
+
+install_dump_handlers() prints the report at interpreter exit and whenever
+the process receives SIGUSR1 (kill -USR1 <pid>), without stopping it. The
+signal handler only wakes a background thread that writes the report: the
+signal can arrive while the main thread holds a histogram lock, and dumping
+from the handler would wait on that lock forever.
+
+Histograms are per process: stages that run in a process pool record into
+the worker's histograms, so pipeline runners also time each stage from the
+parent process.
+"""
+
+import sys
+import math
+import time
+import atexit
+import signal
+import logging
+import functools
+import threading
+import inspect
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram.
+
+    Values are recorded in microseconds. Below 2**sub_bucket_bits every value
+    has its own bucket; above it, each power-of-two range is split into
+    2**sub_bucket_bits linear sub-buckets, bounding the relative error.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 11):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self._lock = threading.Lock()
+
+    def _shift(self, value_us: int) -> int:
+        return max(0, value_us.bit_length() - self.sub_bucket_bits)
+
+    def record(self, seconds: float) -> None:
+        """Record one duration (in seconds)."""
+        value_us = max(0, int(seconds * 1_000_000))
+        shift = self._shift(value_us)
+        bucket = (value_us >> shift) << shift
+
+        with self._lock:
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+            self.count += 1
+            self.total_us += value_us
+            self.max_us = max(self.max_us, value_us)
+            self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return the duration (in milliseconds) at a percentile.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Highest value equivalent to the percentile's bucket, in ms
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, math.ceil(percent / 100 * self.count))
+            seen = 0
+            for bucket in sorted(self.counts):
+                seen += self.counts[bucket]
+                if seen >= target:
+                    upper = bucket + (1 << self._shift(bucket)) - 1
+                    return min(upper, self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean, min, p50, p95, p99 and max (ms)."""
+        return {
+            "count": self.count,
+            "mean_ms": (self.total_us / self.count / 1000) if self.count else 0.0,
+            "min_ms": (self.min_us or 0) / 1000,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_us / 1000,
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(name: str) -> LatencyHistogram:
+    """Return the histogram for a stage, creating it on first use."""
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, LatencyHistogram())
+    return histogram
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a duration (in seconds) for a stage."""
+    get_histogram(name).record(seconds)
+
+
+def get_histograms() -> Dict[str, LatencyHistogram]:
+    """Return a snapshot of all histograms by stage name."""
+    with _histograms_lock:
+        return dict(_histograms)
+
+
+def reset() -> None:
+    """Drop all recorded timings."""
+    with _histograms_lock:
+        _histograms.clear()
+
+
+class timed:
+    """
+    Time a block or a function into the named histogram.
+
+    Works as a context manager and as a decorator for both regular and
+    async functions. Failed calls are recorded too - a slow failure is
+    still latency.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._starts = []
+
+    def __enter__(self):
+        self._starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self._starts.pop())
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+
+
+def format_report() -> str:
+    """Format all histograms as a table (durations in milliseconds)."""
+    histograms = get_histograms()
+    if not histograms:
+        return "No stage timings recorded."
+
+    width = max(len("stage"), *(len(name) for name in histograms))
+    lines = [
+        f"{'stage':<{width}}  {'count':>6}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'max':>9}",
+        "-" * (width + 50),
+    ]
+    for name in sorted(histograms):
+        s = histograms[name].summary()
+        lines.append(
+            f"{name:<{width}}  {s['count']:>6}  {s['p50_ms']:>9.1f}  "
+            f"{s['p95_ms']:>9.1f}  {s['p99_ms']:>9.1f}  {s['max_ms']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def dump(stream=None) -> None:
+    """Write the latency report to a stream (default: stderr)."""
+    stream = stream or sys.stderr
+    stream.write("\n[Timing] Per-stage latency (ms)\n" + format_report() + "\n")
+    stream.flush()
+
+
+_handlers_installed = False
+_dump_requested = threading.Event()
+
+
+def _dump_when_requested() -> None:
+    while True:
+        _dump_requested.wait()
+        _dump_requested.clear()
+        dump()
+
+
+def install_dump_handlers(signum: Optional[int] = None) -> None:
+    """
+    Dump the latency report at exit and when the process receives a signal.
+
+    Args:
+        signum: Signal that triggers a dump (default: SIGUSR1 where available)
+    """
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+
+    atexit.register(dump)
+
+    signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return  # No SIGUSR1 on Windows
+
+    try:
+        signal.signal(signum, lambda *_: _dump_requested.set())
+    except ValueError:
+        # signal.signal only works from the main thread
+        logger.warning("Timing dump signal handler not installed (not main thread)")
+        return
+    threading.Thread(target=_dump_when_requested, name="timing-dump", daemon=True).start()
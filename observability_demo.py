@@ -63,6 +63,7 @@ async def main_with_observability():
     # Import agents and tools
     from agents import create_intake_agent, create_processing_agent
     from tools import create_remote_vendor_agent, test_vendor_connection
+    from observability.timing import timed, format_report
     from google.adk.runners import Runner
     from google.adk.sessions import InMemorySessionService
 
@@ -83,7 +84,7 @@ async def main_with_observability():
     print("=" * 100)
 
     remote_vendor = create_remote_vendor_agent()
-    vendor_reachable = test_vendor_connection(remote_vendor)
+    vendor_reachable = await test_vendor_connection(remote_vendor)
 
     if not vendor_reachable:
         print("\n⚠️  WARNING: Vendor server not reachable!")
@@ -166,7 +167,8 @@ async def main_with_observability():
     print(f"   Prompt: {intake_prompt}")
 
     print(f"\n🔄 IntakeAgent processing...")
-    intake_result = await intake_runner.run(intake_prompt)
+    with timed("agent.intake"):
+        intake_result = await intake_runner.run(intake_prompt)
 
     print(f"\n📥 IntakeAgent Response:")
     print(f"{'─' * 80}")
@@ -236,13 +238,24 @@ Target language: English"""
     print("   • [Sub-agent call] - A2A vendor invocation")
     print("   • [Tool: security_filter] - Response verification\n")
 
-    processing_result = await processing_runner.run(processing_prompt)
+    with timed("agent.processing"):
+        processing_result = await processing_runner.run(processing_prompt)
 
     print(f"\n📥 ProcessingAgent Final Response:")
     print(f"{'=' * 100}")
     print(processing_result.response_text)
     print(f"{'=' * 100}\n")
 
+    # ========================================================================
+    # STEP 6b: Stage Latency
+    # ========================================================================
+    print("=" * 100)
+    print("STAGE LATENCY (ms)")
+    print("=" * 100)
+    print("\n⏱️  Where the time went (p50/p95/p99 per stage):\n")
+    print(format_report())
+    print()
+
     # ========================================================================
     # STEP 7: Inspect Session State
     # ========================================================================
@@ -376,6 +389,9 @@ Target language: English"""
 
 
 if __name__ == "__main__":
+    from observability.timing import install_dump_handlers
+    install_dump_handlers()
+
     try:
         asyncio.run(main_with_observability())
     except KeyboardInterrupt:
@@ -0,0 +1,39 @@
+"""
+Code-orchestrated document processing pipeline.
+
+This module contains the deterministic stages of the ministry's processing
+pipeline. The stages are plain Python functions so they can be driven by code
+(ProcessingAgent, batch runners) instead of by an LLM deciding which tool to
+call next:
+- extract_text: OCR text extraction
+- pre_filter: PII masking before the A2A boundary
+- post_verify: PII verification of the vendor response
+- compile_result: Final result compilation
+- vendor_unavailable_result: Result of a document parked while the vendor is down
+- StagedPipelineRunner: Bounded multi-document runner with per-stage pools
+- CheckpointStore: Per-document stage checkpoints for resume
+"""
+
+from .stages import (
+    VENDOR_UNAVAILABLE,
+    StageError,
+    extract_text,
+    pre_filter,
+    post_verify,
+    compile_result,
+    vendor_unavailable_result,
+)
+from .checkpoint import CheckpointStore
+from .runner import StagedPipelineRunner
+
+__all__ = [
+    "VENDOR_UNAVAILABLE",
+    "StageError",
+    "extract_text",
+    "pre_filter",
+    "post_verify",
+    "compile_result",
+    "vendor_unavailable_result",
+    "StagedPipelineRunner",
+    "CheckpointStore",
+]
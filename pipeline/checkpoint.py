@@ -0,0 +1,219 @@
+"""
+Pipeline Checkpoints: Per-document stage results persisted to disk.
+
+After each stage of the processing pipeline the stage result is written to a
+checkpoint file keyed by document ID. In resume mode, stages that already
+have a checkpoint are skipped and their saved result is used instead - after
+a vendor outage or a restart the pipeline picks up at the vendor call rather
+than re-running OCR and masking, and a document that was already translated
+never pays for a second translation.
+
+The translation options (target language, document type) are saved with the
+checkpoint. The vendor translation and the stages after it depend on them, so
+those stages are only resumed for the same options; OCR and masking results
+are reused either way.
+
+Layout:
+    <directory>/<document_id>.json   stage results (artifact references)
+    <directory>/artifacts/           texts referenced by the checkpoints
+
+Stage results only hold artifact references, so the referenced texts are
+copied into the checkpoint's own on-disk artifact store. That way a resume
+works even when the runtime artifact store is memory-only.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import contextlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from tools.artifact_store import ArtifactStore, is_artifact_ref
+
+logger = logging.getLogger(__name__)
+
+# Stages with persisted results, and the state key each result is kept under
+CHECKPOINTED_STAGES = {
+    "ocr": "ocr_result",
+    "pre_filter": "pre_filter_result",
+    "vendor": "vendor_result",
+    "post_verify": "post_verify_result",
+}
+
+# Stages whose results depend on the translation options
+OPTION_STAGES = ("vendor", "post_verify")
+
+
+def derive_document_id(document_path: str) -> str:
+    """
+    Derive a stable document ID from the document's path and content.
+
+    Used when no ID was assigned at intake. Including the content means an
+    edited document does not resume from stale checkpoints.
+
+    Args:
+        document_path: Path to the document
+
+    Returns:
+        str: Document ID ("doc_<16 hex chars>")
+    """
+    digest = hashlib.sha256(os.path.abspath(document_path).encode("utf-8"))
+    try:
+        with open(document_path, "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        pass  # Missing documents fail at the OCR stage
+    return f"doc_{digest.hexdigest()[:16]}"
+
+
+class CheckpointStore:
+    """
+    Directory of per-document stage checkpoints.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory: Directory for checkpoint files (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Small memory tier: checkpointed texts are read back rarely
+        self.artifacts = ArtifactStore(
+            max_bytes=4 * 1024 * 1024,
+            directory=self.directory / "artifacts"
+        )
+
+    def _path(self, document_id: str) -> Path:
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in document_id)
+        return self.directory / f"{safe_id}.json"
+
+    def _read(self, document_id: str) -> Dict[str, Any]:
+        """Read a document's checkpoint file (empty if missing or unreadable)."""
+        path = self._path(document_id)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return {}
+
+    def load(self, document_id: str) -> Dict[str, Any]:
+        """
+        Load all saved stage results for a document.
+
+        Returns:
+            dict: Stage name -> stage result (empty if no checkpoint exists)
+        """
+        return self._read(document_id).get("stages", {})
+
+    def completed_stages(self, document_id: str) -> List[str]:
+        """Return the stages with a saved result for a document."""
+        return list(self.load(document_id))
+
+    def get_stage(
+        self,
+        document_id: str,
+        stage: str,
+        store: ArtifactStore,
+        options: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a saved stage result, restoring its texts into the runtime store.
+
+        Args:
+            document_id: Document ID
+            stage: Stage name (see CHECKPOINTED_STAGES)
+            store: Runtime artifact store the pipeline reads texts from
+            options: Translation options of this run (target_language,
+                document_type)
+
+        Returns:
+            dict: Saved stage result, or None if the stage has no checkpoint,
+                was saved for other options, or its texts are missing
+        """
+        checkpoint = self._read(document_id)
+        result = checkpoint.get("stages", {}).get(stage)
+        if result is None:
+            return None
+        if stage in OPTION_STAGES and checkpoint.get("options") != (options or {}):
+            logger.info(
+                f"Not resuming {document_id}/{stage}: checkpoint was saved for "
+                f"options {checkpoint.get('options')}"
+            )
+            return None
+
+        for key, value in result.items():
+            if key.endswith("_ref") and is_artifact_ref(value) and value not in store:
+                if value not in self.artifacts:
+                    logger.warning(
+                        f"Checkpoint {document_id}/{stage} references a missing artifact"
+                    )
+                    return None
+                store.put(self.artifacts.get(value))
+
+        logger.info(f"Resuming {document_id}: using checkpoint for stage '{stage}'")
+        return result
+
+    def save_stage(
+        self,
+        document_id: str,
+        stage: str,
+        result: Dict[str, Any],
+        store: ArtifactStore,
+        options: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Persist a stage result and the texts it references.
+
+        Checkpoints of later stages are dropped: they were derived from the
+        previous result of this stage. The options are saved with it, so
+        option-dependent stages are only resumed for the same options.
+
+        Args:
+            document_id: Document ID
+            stage: Stage name (see CHECKPOINTED_STAGES)
+            result: Stage result (JSON serializable, texts as references)
+            store: Runtime artifact store holding the referenced texts
+            options: Translation options of this run (target_language,
+                document_type)
+        """
+        for key, value in result.items():
+            if key.endswith("_ref") and is_artifact_ref(value):
+                self.artifacts.put(store.get(value))
+
+        order = list(CHECKPOINTED_STAGES)
+        later = set(order[order.index(stage) + 1:])
+        stages = {
+            name: saved for name, saved in self.load(document_id).items()
+            if name not in later
+        }
+        stages[stage] = result
+
+        self._write(self._path(document_id), {
+            "document_id": document_id,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "options": options or {},
+            "stages": stages
+        })
+
+    def _write(self, path: Path, checkpoint: Dict[str, Any]) -> None:
+        """Atomically replace a checkpoint file via a unique temp file."""
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(checkpoint, tmp_file, indent=2, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def clear(self, document_id: str) -> None:
+        """Delete a document's checkpoint (its artifacts are kept, they are shared)."""
+        self._path(document_id).unlink(missing_ok=True)
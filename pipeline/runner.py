@@ -0,0 +1,347 @@
+"""
+Staged Pipeline Runner: Bounded multi-document processing.
+
+Processes many documents at once by running each pipeline stage as its own
+pool of workers connected by bounded asyncio queues:
+
+    documents -> [ocr] -> [pre_filter] -> [vendor] -> [post_verify] -> [compile]
+
+- CPU stages (OCR, PII masking, verification) run on a process pool
+- The vendor stage runs as coroutines (I/O bound A2A calls)
+- Each stage has its own concurrency limit
+- Queues are bounded, so a slow vendor applies backpressure to the local
+  stages instead of letting extracted documents pile up in memory
+
+Throughput is limited by the slowest stage rather than by the sum of all
+stage latencies.
+
+A document that fails a stage is marked with status "error" and the stage
+name, and passes through the remaining stages untouched, so one bad document
+never stalls the batch. While the vendor's circuit breaker is open, vendor
+calls fail immediately and documents are parked with status
+"vendor_unavailable" instead of holding a vendor worker until a timeout.
+
+With a CheckpointStore, every stage result is persisted per document; with
+resume=True, stages that already have a checkpoint are skipped.
+
+Each stage is timed from the event loop into the "stage.<name>" histograms
+(observability.timing), including time spent waiting for a pool worker.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from tools.artifact_store import ArtifactStore, get_artifact_store
+from observability.timing import timed
+from tools.vendor_connector import VendorUnavailableError
+from .checkpoint import CHECKPOINTED_STAGES, CheckpointStore, derive_document_id
+from .stages import (
+    VENDOR_UNAVAILABLE,
+    StageError,
+    ocr_document,
+    mask_text,
+    verify_text,
+    load_text,
+    store_text_field,
+    compile_result,
+    vendor_unavailable_result,
+)
+
+logger = logging.getLogger(__name__)
+
+# Vendor call signature: (masked_text, source_language, target_language,
+# document_type) -> A2A result dict with "translated_text"
+VendorCall = Callable[[str, str, str, str], Awaitable[Dict[str, Any]]]
+
+STAGES = ["ocr", "pre_filter", "vendor", "post_verify", "compile"]
+
+DEFAULT_CONCURRENCY = {
+    "ocr": 2,
+    "pre_filter": 2,
+    "vendor": 4,
+    "post_verify": 2,
+    "compile": 1,
+}
+
+# Marks the end of the input for a stage's workers
+_DONE = object()
+
+# Items in these states skip the remaining stages
+_TERMINAL = ("error", VENDOR_UNAVAILABLE)
+
+
+def _options(item: Dict[str, Any]) -> Dict[str, str]:
+    """Translation options a document's checkpoints are valid for."""
+    return {"target_language": item["target_language"], "document_type": item["document_type"]}
+
+
+class StagedPipelineRunner:
+    """
+    Run documents through the pipeline with per-stage worker pools.
+
+    Example:
+        runner = StagedPipelineRunner(vendor_call=translate_via_vendor)
+        results = await runner.run(["a.txt", "b.txt"])
+    """
+
+    def __init__(
+        self,
+        vendor_call: VendorCall,
+        concurrency: Optional[Dict[str, int]] = None,
+        queue_size: int = 8,
+        executor: Optional[Executor] = None,
+        cpu_workers: Optional[int] = None,
+        store: Optional[ArtifactStore] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        resume: bool = False,
+        default_document_type: str = "general",
+        default_target_language: str = "en"
+    ):
+        """
+        Args:
+            vendor_call: Coroutine function that translates masked text
+                (e.g., tools.vendor_connector.translate_via_vendor)
+            concurrency: Per-stage worker counts, merged over DEFAULT_CONCURRENCY
+            queue_size: Capacity of each inter-stage queue
+            executor: Executor for CPU stages (default: a ProcessPoolExecutor
+                created per run with cpu_workers processes)
+            cpu_workers: Process count for the default executor
+            store: Artifact store (default: process-wide store)
+            checkpoints: Optional checkpoint store for per-stage results
+            resume: Skip stages that already have a checkpoint
+            default_document_type: Document type for inputs that don't set one
+            default_target_language: Target language for inputs that don't set one
+        """
+        self.vendor_call = vendor_call
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.queue_size = queue_size
+        self.executor = executor
+        self.cpu_workers = cpu_workers
+        self.store = store or get_artifact_store()
+        self.checkpoints = checkpoints
+        self.resume = resume
+        self.default_document_type = default_document_type
+        self.default_target_language = default_target_language
+
+        unknown = set(self.concurrency) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages in concurrency: {sorted(unknown)}")
+
+    # ------------------------------------------------------------------
+    # Stage implementations
+    # ------------------------------------------------------------------
+
+    async def _ocr(self, item: Dict[str, Any], executor: Executor) -> None:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, ocr_document, item["document_path"])
+        item["ocr_result"] = store_text_field(result, "extracted_text", "text_ref", self.store)
+
+    async def _pre_filter(self, item: Dict[str, Any], executor: Executor) -> None:
+        loop = asyncio.get_running_loop()
+        text = load_text(item["ocr_result"]["text_ref"], self.store, "pre_filter")
+        result = await loop.run_in_executor(executor, mask_text, text)
+        item["pre_filter_result"] = store_text_field(
+            result, "filtered_text", "filtered_text_ref", self.store
+        )
+
+    async def _vendor(self, item: Dict[str, Any], executor: Executor) -> None:
+        masked_text = load_text(item["pre_filter_result"]["filtered_text_ref"], self.store, "vendor")
+        try:
+            result = await self.vendor_call(
+                masked_text,
+                item["ocr_result"]["detected_language"],
+                item["target_language"],
+                item["document_type"]
+            )
+        except VendorUnavailableError:
+            raise
+        except Exception as e:
+            raise StageError("vendor", str(e)) from e
+        item["vendor_result"] = store_text_field(
+            dict(result), "translated_text", "translated_text_ref", self.store
+        )
+
+    async def _post_verify(self, item: Dict[str, Any], executor: Executor) -> None:
+        loop = asyncio.get_running_loop()
+        text = load_text(item["vendor_result"]["translated_text_ref"], self.store, "post_verify")
+        item["post_verify_result"] = await loop.run_in_executor(executor, verify_text, text)
+
+    async def _compile(self, item: Dict[str, Any], executor: Executor) -> None:
+        item["processing_result"] = compile_result(
+            document_path=item["document_path"],
+            ocr_result=item["ocr_result"],
+            filter_result=item["pre_filter_result"],
+            translated_text_ref=item["vendor_result"]["translated_text_ref"],
+            verification=item["post_verify_result"],
+            target_language=item["target_language"],
+            document_type=item["document_type"],
+            document_id=item.get("document_id")
+        )
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _resume_stage(self, stage: str, item: Dict[str, Any]) -> bool:
+        """Load a stage result from its checkpoint. Returns True if found."""
+        if not (self.checkpoints and self.resume and stage in CHECKPOINTED_STAGES):
+            return False
+        saved = self.checkpoints.get_stage(
+            item["document_id"], stage, self.store, _options(item)
+        )
+        if saved is None:
+            return False
+        item[CHECKPOINTED_STAGES[stage]] = saved
+        item.setdefault("resumed_stages", []).append(stage)
+        return True
+
+    def _checkpoint_stage(self, stage: str, item: Dict[str, Any]) -> None:
+        if self.checkpoints and stage in CHECKPOINTED_STAGES:
+            self.checkpoints.save_stage(
+                item["document_id"], stage, item[CHECKPOINTED_STAGES[stage]], self.store,
+                _options(item)
+            )
+
+    # ------------------------------------------------------------------
+    # Worker plumbing
+    # ------------------------------------------------------------------
+
+    async def _worker(
+        self,
+        stage: str,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        executor: Executor
+    ) -> None:
+        handler = getattr(self, f"_{stage}")
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+
+            if item.get("status") not in _TERMINAL:
+                try:
+                    if not self._resume_stage(stage, item):
+                        with timed(f"stage.{stage}"):
+                            await handler(item, executor)
+                        self._checkpoint_stage(stage, item)
+                except VendorUnavailableError as e:
+                    # Park: earlier stages are checkpointed, resume retries the vendor
+                    item.update(
+                        status=VENDOR_UNAVAILABLE,
+                        failed_stage="vendor",
+                        error_message=str(e),
+                        processing_result=vendor_unavailable_result(
+                            item["document_path"], str(e), e.retry_after,
+                            item.get("document_id")
+                        )
+                    )
+                except StageError as e:
+                    item.update(status="error", failed_stage=e.stage, error_message=str(e))
+                except Exception as e:
+                    logger.error(f"Stage {stage} failed for {item['document_path']}: {e}")
+                    item.update(status="error", failed_stage=stage, error_message=str(e))
+
+            # Blocks while the next stage is saturated (backpressure)
+            await outbox.put(item)
+
+    async def _run_stage(
+        self,
+        stage: str,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        next_workers: int,
+        executor: Executor
+    ) -> None:
+        """Run a stage's worker pool, then signal the next stage to finish."""
+        workers = [
+            asyncio.create_task(self._worker(stage, inbox, outbox, executor))
+            for _ in range(self.concurrency[stage])
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        for _ in range(next_workers):
+            await outbox.put(_DONE)
+
+    def _make_item(self, index: int, document: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(document, str):
+            document = {"document_path": document}
+        document_id = document.get("document_id")
+        if document_id is None and self.checkpoints:
+            document_id = derive_document_id(document["document_path"])
+        return {
+            "index": index,
+            "document_path": document["document_path"],
+            "document_id": document_id,
+            "document_type": document.get("document_type", self.default_document_type),
+            "target_language": document.get("target_language", self.default_target_language),
+            "status": "pending",
+        }
+
+    async def run(
+        self,
+        documents: Iterable[Union[str, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a batch of documents.
+
+        Args:
+            documents: Document paths, or dicts with "document_path" and
+                optional "document_id", "document_type", "target_language"
+
+        Returns:
+            list: One result per document, in input order. Successful items
+                carry "processing_result"; failed items carry "failed_stage"
+                and "error_message". Parked items have status
+                "vendor_unavailable".
+        """
+        owns_executor = self.executor is None
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.cpu_workers)
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in STAGES]
+        results_queue: asyncio.Queue = asyncio.Queue()
+
+        stage_tasks = []
+        for i, stage in enumerate(STAGES):
+            outbox = queues[i + 1] if i + 1 < len(STAGES) else results_queue
+            next_workers = self.concurrency[STAGES[i + 1]] if i + 1 < len(STAGES) else 1
+            stage_tasks.append(asyncio.create_task(
+                self._run_stage(stage, queues[i], outbox, next_workers, executor)
+            ))
+
+        async def feed() -> None:
+            for index, document in enumerate(documents):
+                await queues[0].put(self._make_item(index, document))
+            for _ in range(self.concurrency[STAGES[0]]):
+                await queues[0].put(_DONE)
+
+        feeder = asyncio.create_task(feed())
+        results = []
+        try:
+            while True:
+                item = await results_queue.get()
+                if item is _DONE:
+                    break
+                if item["status"] not in _TERMINAL:
+                    item["status"] = item["processing_result"]["status"]
+                results.append(item)
+            await asyncio.gather(feeder, *stage_tasks)
+        finally:
+            feeder.cancel()
+            for task in stage_tasks:
+                task.cancel()
+            if owns_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        results.sort(key=lambda item: item["index"])
+        logger.info(
+            f"Processed {len(results)} documents: "
+            f"{sum(r['status'] not in _TERMINAL for r in results)} succeeded, "
+            f"{sum(r['status'] == VENDOR_UNAVAILABLE for r in results)} parked"
+        )
+        return results
@@ -0,0 +1,308 @@
+"""
+Pipeline stages: Deterministic steps of the document processing pipeline.
+
+Each stage wraps one of the internal tools and returns a small dict, so the
+result can be stored in session state and handed to the next stage without
+going through an LLM context. Document texts are kept in the artifact store
+(tools.artifact_store) and the stages exchange references to them; only the
+stage that needs the bytes dereferences them:
+1. extract_text   - OCR text extraction (tools.ocr_tool)
+2. pre_filter     - PII masking before the vendor call (security.policy)
+3. (vendor call)  - A2A translation, driven by the caller
+4. post_verify    - PII verification of the vendor response (security.policy)
+5. compile_result - Final result compilation
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from tools.ocr_tool import ocr_tool
+from tools.artifact_store import ArtifactNotFoundError, ArtifactStore, get_artifact_store
+from security.policy import security_filter
+
+# Status of a document parked because the vendor's circuit breaker is open.
+# Its OCR and masking results are kept (and checkpointed), so a resumed run
+# starts at the vendor call.
+VENDOR_UNAVAILABLE = "vendor_unavailable"
+
+
+class StageError(RuntimeError):
+    """Raised when a pipeline stage returns an error status."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(f"{stage} failed: {message}")
+        self.stage = stage
+        self.message = message
+
+    def __reduce__(self):
+        # Keep the exception picklable across process pool boundaries
+        return (type(self), (self.stage, self.message))
+
+
+def ocr_document(document_path: str) -> Dict[str, Any]:
+    """
+    Run OCR on a document and check the result.
+
+    Pure function (no artifact store), so it can run in a worker process.
+
+    Args:
+        document_path: Path to the document to process
+
+    Returns:
+        dict: OCR result (see tools.ocr_tool.ocr_tool)
+
+    Raises:
+        StageError: If OCR extraction fails
+    """
+    result = ocr_tool(document_path)
+    if result.get("status") != "success":
+        raise StageError("ocr", result.get("error_message", "unknown error"))
+    return result
+
+
+def mask_text(text: str) -> Dict[str, Any]:
+    """
+    Mask PII in text and verify the masked output.
+
+    Pure function (no artifact store), so it can run in a worker process.
+    A "warning" status (some PII may remain) is kept in the result for the
+    audit trail.
+
+    Args:
+        text: Extracted document text
+
+    Returns:
+        dict: Security filter result with filtered_text
+
+    Raises:
+        StageError: If masking fails
+    """
+    result = security_filter(text, mode="mask", verify=True)
+    if result.get("status") == "error":
+        raise StageError("pre_filter", result.get("error", "unknown error"))
+    return result
+
+
+def verify_text(text: str) -> Dict[str, Any]:
+    """
+    Verify that text contains no sensitive data.
+
+    Pure function (no artifact store), so it can run in a worker process.
+    An "unsafe" verdict is returned, not raised: the pipeline records it in
+    the final result so the audit trail shows what the vendor sent back.
+
+    Args:
+        text: Translated text returned by the vendor
+
+    Returns:
+        dict: Security filter verification result
+
+    Raises:
+        StageError: If verification itself fails
+    """
+    result = security_filter(text, mode="verify")
+    if result.get("status") == "error":
+        raise StageError("post_verify", result.get("error", "unknown error"))
+    return result
+
+
+def store_text_field(
+    result: Dict[str, Any],
+    field: str,
+    ref_field: str,
+    store: ArtifactStore
+) -> Dict[str, Any]:
+    """
+    Move a text field of a stage result into the artifact store.
+
+    Args:
+        result: Stage result containing the text
+        field: Name of the text field (e.g., "extracted_text")
+        ref_field: Name of the reference field to add (e.g., "text_ref")
+        store: Artifact store
+
+    Returns:
+        dict: The result with the text replaced by "<ref_field>" and
+            "<ref_field minus _ref>_size_bytes"
+    """
+    text = result.pop(field)
+    result[ref_field] = store.put_text(text)
+    result[f"{ref_field[:-len('_ref')]}_size_bytes"] = len(text.encode("utf-8"))
+    return result
+
+
+def load_text(ref: str, store: ArtifactStore, stage: str) -> str:
+    """
+    Read a stage's input text from the artifact store.
+
+    A memory-only store evicts least-recently-used artifacts, so a reference
+    held in session state or a work item can outlive its content.
+
+    Args:
+        ref: Artifact reference
+        store: Artifact store
+        stage: Stage reading the text, for the error
+
+    Returns:
+        str: The text
+
+    Raises:
+        StageError: If the artifact is no longer stored
+    """
+    try:
+        return store.get_text(ref)
+    except ArtifactNotFoundError as e:
+        raise StageError(
+            stage,
+            f"artifact {ref[:19]} is no longer in the artifact store "
+            f"(evicted from memory; set ARTIFACT_STORE_DIR to keep artifacts on disk)"
+        ) from e
+
+
+def extract_text(
+    document_path: str,
+    store: Optional[ArtifactStore] = None
+) -> Dict[str, Any]:
+    """
+    Stage 1: Extract text from the document.
+
+    Args:
+        document_path: Path to the document to process
+        store: Artifact store (default: process-wide store)
+
+    Returns:
+        dict: OCR result with the extracted text replaced by "text_ref"
+            and "text_size_bytes"
+
+    Raises:
+        StageError: If OCR extraction fails
+    """
+    store = store or get_artifact_store()
+    return store_text_field(
+        ocr_document(document_path), "extracted_text", "text_ref", store
+    )
+
+
+def pre_filter(
+    text_ref: str,
+    store: Optional[ArtifactStore] = None
+) -> Dict[str, Any]:
+    """
+    Stage 2: Mask PII before the text crosses the A2A boundary.
+
+    Args:
+        text_ref: Artifact reference of the extracted text
+        store: Artifact store (default: process-wide store)
+
+    Returns:
+        dict: Security filter result with the filtered text replaced by
+            "filtered_text_ref" and "filtered_text_size_bytes"
+
+    Raises:
+        StageError: If the text is no longer stored or masking fails
+    """
+    store = store or get_artifact_store()
+    return store_text_field(
+        mask_text(load_text(text_ref, store, "pre_filter")),
+        "filtered_text", "filtered_text_ref", store
+    )
+
+
+def post_verify(
+    translated_text_ref: str,
+    store: Optional[ArtifactStore] = None
+) -> Dict[str, Any]:
+    """
+    Stage 4: Verify the vendor response does not contain sensitive data.
+
+    Args:
+        translated_text_ref: Artifact reference of the vendor translation
+        store: Artifact store (default: process-wide store)
+
+    Returns:
+        dict: Security filter verification result
+
+    Raises:
+        StageError: If the translation is no longer stored or verification
+            itself fails
+    """
+    store = store or get_artifact_store()
+    return verify_text(load_text(translated_text_ref, store, "post_verify"))
+
+
+def vendor_unavailable_result(
+    document_path: str,
+    error_message: str,
+    retry_after: float = 0.0,
+    document_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the result for a document parked at the vendor stage.
+
+    Args:
+        document_path: Path to the original document
+        error_message: Why the vendor is considered unavailable
+        retry_after: Seconds until the vendor's breaker allows a trial call
+        document_id: Optional document ID
+
+    Returns:
+        dict: Result with status "vendor_unavailable"
+    """
+    return {
+        "status": VENDOR_UNAVAILABLE,
+        "document_id": document_id,
+        "document_path": document_path,
+        "failed_stage": "vendor",
+        "error_message": error_message,
+        "retry_after_seconds": round(retry_after, 1),
+        "parked_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compile_result(
+    document_path: str,
+    ocr_result: Dict[str, Any],
+    filter_result: Dict[str, Any],
+    translated_text_ref: str,
+    verification: Dict[str, Any],
+    target_language: str = "en",
+    document_type: str = "general",
+    document_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Stage 5: Combine all stage outputs into the final processing report.
+
+    Args:
+        document_path: Path to the processed document
+        ocr_result: Output of extract_text
+        filter_result: Output of pre_filter
+        translated_text_ref: Artifact reference of the vendor translation
+        verification: Output of post_verify
+        target_language: Target language code
+        document_type: Type of document
+        document_id: Optional document ID assigned at intake
+
+    Returns:
+        dict: Final processing result (texts are artifact references)
+    """
+    is_safe = verification.get("status") == "safe"
+
+    return {
+        "status": "success" if is_safe else "warning",
+        "document_id": document_id,
+        "document_path": document_path,
+        "document_type": document_type,
+        "source_language": ocr_result.get("detected_language"),
+        "target_language": target_language,
+        "original_text_ref": ocr_result.get("text_ref"),
+        "filtered_text_ref": filter_result.get("filtered_text_ref"),
+        "translated_text_ref": translated_text_ref,
+        "security": {
+            "pii_summary": filter_result.get("pii_summary", {}),
+            "masked_count": filter_result.get("masked_count", 0),
+            "pre_filter_status": filter_result.get("status"),
+            "vendor_response_safe": is_safe,
+            "vendor_response_violations": verification.get("violation_count", 0)
+        },
+        "completed_at": datetime.now(timezone.utc).isoformat()
+    }
@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Any
 import logging
 
+from observability.timing import timed
+
 logger = logging.getLogger(__name__)
 
 # PII Detection Patterns
@@ -152,6 +154,7 @@ def verify_pii_removal(text: str, threshold: int = 0) -> Dict[str, Any]:
     }
 
 
+@timed("tool.security_filter")
 def security_filter(
     text: str,
     mode: str = "mask",
@@ -0,0 +1 @@
+"""Tests for the ministry's document pipeline and vendor connection tools."""
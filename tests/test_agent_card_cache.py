@@ -0,0 +1,128 @@
+"""
+Tests for the agent card cache and the vendor connectivity check.
+"""
+
+import asyncio
+import httpx
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools import agent_card_cache, http_client
+from tools.agent_card_cache import AgentCardCache, AgentCardCacheTransport
+from tools.vendor_connector import test_vendor_connection as check_vendor_connection
+
+CARD_URL = "http://vendor/.well-known/agent-card.json"
+CARD = {"name": "vendor", "url": "http://vendor"}
+
+
+class FakeVendor:
+    """Agent card endpoint that records requests and answers 304 to a matching ETag."""
+
+    def __init__(self, status_code=None):
+        self.status_code = status_code
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.status_code is not None:
+            return httpx.Response(self.status_code)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=CARD, headers={"ETag": '"v1"'})
+
+
+def make_client(cache, vendor):
+    transport = AgentCardCacheTransport(cache, transport=httpx.MockTransport(vendor))
+    return httpx.AsyncClient(transport=transport)
+
+
+def get(client, **kwargs):
+    async def run():
+        return await client.get(CARD_URL, **kwargs)
+
+    return asyncio.run(run())
+
+
+class TestAgentCardCacheTransport:
+    """Test card requests are served from the cache and revalidated."""
+
+    def test_fresh_card_served_from_cache(self):
+        """Test a card within its TTL is served without a request."""
+        vendor = FakeVendor()
+        client = make_client(AgentCardCache(), vendor)
+
+        get(client)
+        response = get(client)
+
+        assert response.json() == CARD
+        assert len(vendor.requests) == 1
+
+    def test_no_cache_revalidates(self):
+        """Test a no-cache request revalidates with If-None-Match and gets the cached body."""
+        vendor = FakeVendor()
+        client = make_client(AgentCardCache(), vendor)
+
+        get(client)
+        response = get(client, headers={"Cache-Control": "no-cache"})
+
+        assert response.status_code == 200
+        assert response.json() == CARD
+        assert len(vendor.requests) == 2
+        assert vendor.requests[1].headers["If-None-Match"] == '"v1"'
+
+    def test_disk_copy_written_through_unique_temp_file(self, tmp_path):
+        """Test saving a card leaves no temp file and survives a stray fixed-name one."""
+        cache = AgentCardCache(directory=tmp_path)
+        card_path, _ = cache._paths(CARD_URL)
+        card_path.with_suffix(".tmp").mkdir()
+
+        get(make_client(cache, FakeVendor()))
+
+        assert AgentCardCache(directory=tmp_path).cached_card(CARD_URL) == CARD
+        assert not list(tmp_path.glob(".*.tmp"))
+
+
+class TestVendorConnection:
+    """Test the connectivity check always asks the vendor."""
+
+    @pytest.fixture
+    def vendor_agent(self):
+        class Agent:
+            _test_agent_card_url = CARD_URL
+            _vendor_url = None
+
+        return Agent()
+
+    @pytest.fixture
+    def use_vendor(self, monkeypatch):
+        cache = AgentCardCache()
+        monkeypatch.setattr(agent_card_cache, "_default_cache", cache)
+
+        def install(vendor):
+            monkeypatch.setattr(http_client, "_client", make_client(cache, vendor))
+            return vendor
+
+        return install
+
+    def test_fresh_card_still_revalidated(self, vendor_agent, use_vendor):
+        """Test a cached card does not replace the request, only its body."""
+        vendor = use_vendor(FakeVendor())
+
+        assert asyncio.run(check_vendor_connection(vendor_agent))
+        assert asyncio.run(check_vendor_connection(vendor_agent))
+
+        assert len(vendor.requests) == 2
+        assert vendor.requests[1].headers["If-None-Match"] == '"v1"'
+
+    def test_unreachable_after_cached_card(self, vendor_agent, use_vendor):
+        """Test a vendor that went down is reported even while its card is cached."""
+        use_vendor(FakeVendor())
+        asyncio.run(check_vendor_connection(vendor_agent))
+
+        use_vendor(FakeVendor(status_code=503))
+
+        assert not asyncio.run(check_vendor_connection(vendor_agent))
@@ -0,0 +1,82 @@
+"""
+Tests for the content-addressed artifact store.
+"""
+
+import os
+import time
+import threading
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools import artifact_store
+from tools.artifact_store import ArtifactNotFoundError, ArtifactStore, is_artifact_ref
+
+
+class TestArtifactStore:
+    """Test artifacts are stored by content and resolved by reference."""
+
+    def test_round_trip(self):
+        """Test text comes back from its reference."""
+        store = ArtifactStore()
+
+        ref = store.put_text("Certificado de nacimiento")
+
+        assert is_artifact_ref(ref)
+        assert store.get_text(ref) == "Certificado de nacimiento"
+        assert store.put_text("Certificado de nacimiento") == ref
+
+    def test_unknown_ref(self):
+        """Test unknown references raise ArtifactNotFoundError."""
+        with pytest.raises(ArtifactNotFoundError):
+            ArtifactStore().get("sha256:" + "0" * 64)
+
+    def test_lru_eviction(self):
+        """Test the least recently used artifact is evicted over the byte budget."""
+        store = ArtifactStore(max_bytes=10)
+        first = store.put(b"aaaaa")
+        second = store.put(b"bbbbb")
+        store.get(first)
+
+        store.put(b"ccccc")
+
+        assert first in store
+        assert second not in store
+        assert store.stats()["evictions"] == 1
+
+    def test_disk_tier_reloads_evicted(self, tmp_path):
+        """Test evicted artifacts are read back from the directory."""
+        store = ArtifactStore(max_bytes=10, directory=tmp_path)
+        first = store.put(b"aaaaaaaa")
+        store.put(b"bbbbbbbb")
+
+        assert store.get(first) == b"aaaaaaaa"
+        assert ArtifactStore(directory=tmp_path).get(first) == b"aaaaaaaa"
+
+    def test_concurrent_identical_puts(self, tmp_path, monkeypatch):
+        """Test writers of the same content at once all succeed and leave no temp files."""
+        store = ArtifactStore(directory=tmp_path)
+        data = b"***-**-****-X boilerplate" * 1000
+        barrier = threading.Barrier(8)
+        replace = os.replace
+
+        def slow_replace(source, destination):
+            # Widen the window between writing the temp file and renaming it
+            time.sleep(0.05)
+            replace(source, destination)
+
+        monkeypatch.setattr(artifact_store.os, "replace", slow_replace)
+
+        def put(_):
+            barrier.wait()
+            return store.put(data)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            refs = set(pool.map(put, range(8)))
+
+        assert len(refs) == 1
+        assert [path.name for path in tmp_path.iterdir()] == [refs.pop()[len("sha256:"):]]
@@ -0,0 +1,194 @@
+"""
+Tests for per-document pipeline checkpoints and resume.
+"""
+
+import asyncio
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline import VENDOR_UNAVAILABLE, CheckpointStore, StagedPipelineRunner
+from pipeline.checkpoint import derive_document_id
+from tools.artifact_store import ArtifactStore
+from tools.vendor_connector import VendorUnavailableError
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    return CheckpointStore(tmp_path / "checkpoints")
+
+
+@pytest.fixture
+def store():
+    return ArtifactStore()
+
+
+class TestDeriveDocumentId:
+    """Test document IDs derived from path and content."""
+
+    def test_stable(self, tmp_path):
+        """Test the same document always gets the same ID."""
+        path = tmp_path / "doc.txt"
+        path.write_text("hola", encoding="utf-8")
+
+        assert derive_document_id(str(path)) == derive_document_id(str(path))
+        assert derive_document_id(str(path)).startswith("doc_")
+
+    def test_changes_with_content(self, tmp_path):
+        """Test editing a document gives it a new ID."""
+        path = tmp_path / "doc.txt"
+        path.write_text("hola", encoding="utf-8")
+        before = derive_document_id(str(path))
+        path.write_text("adios", encoding="utf-8")
+
+        assert derive_document_id(str(path)) != before
+
+
+class TestCheckpointStore:
+    """Test saving and loading stage results."""
+
+    def test_save_and_load(self, checkpoints, store):
+        """Test a saved stage result is loaded back with its text."""
+        ref = store.put_text("texto extraido")
+        checkpoints.save_stage("doc_1", "ocr", {"text_ref": ref, "page_count": 1}, store)
+
+        fresh = ArtifactStore()
+        saved = checkpoints.get_stage("doc_1", "ocr", fresh)
+
+        assert saved == {"text_ref": ref, "page_count": 1}
+        assert fresh.get_text(ref) == "texto extraido"
+        assert checkpoints.completed_stages("doc_1") == ["ocr"]
+
+    def test_missing_stage(self, checkpoints, store):
+        """Test an unsaved stage or document returns None."""
+        assert checkpoints.get_stage("doc_1", "ocr", store) is None
+        assert checkpoints.load("doc_1") == {}
+
+    def test_resaving_drops_later_stages(self, checkpoints, store):
+        """Test saving a stage again discards the stages derived from it."""
+        for stage in ("ocr", "pre_filter", "vendor"):
+            checkpoints.save_stage("doc_1", stage, {"status": "success"}, store)
+
+        checkpoints.save_stage("doc_1", "pre_filter", {"status": "warning"}, store)
+
+        assert checkpoints.completed_stages("doc_1") == ["ocr", "pre_filter"]
+
+    def test_unreadable_checkpoint_ignored(self, checkpoints):
+        """Test a corrupt checkpoint file is treated as no checkpoint."""
+        checkpoints._path("doc_1").write_text("{not json", encoding="utf-8")
+
+        assert checkpoints.load("doc_1") == {}
+
+    def test_save_uses_unique_temp_file(self, checkpoints, store):
+        """Test a save leaves no temp file behind and never uses a fixed name."""
+        checkpoints._path("doc_1").with_suffix(".tmp").mkdir()
+
+        checkpoints.save_stage("doc_1", "ocr", {"status": "success"}, store)
+
+        assert checkpoints.completed_stages("doc_1") == ["ocr"]
+        assert not list(checkpoints.directory.glob(".*.tmp"))
+
+    def test_options_mismatch_skips_vendor_stages(self, checkpoints, store):
+        """Test vendor results saved for other options are not resumed."""
+        english = {"target_language": "en", "document_type": "general"}
+        for stage in ("ocr", "vendor"):
+            checkpoints.save_stage("doc_1", stage, {"status": "success"}, store, english)
+
+        french = {**english, "target_language": "fr"}
+        assert checkpoints.get_stage("doc_1", "ocr", store, french) is not None
+        assert checkpoints.get_stage("doc_1", "vendor", store, french) is None
+        assert checkpoints.get_stage("doc_1", "vendor", store, english) is not None
+
+    def test_clear(self, checkpoints, store):
+        """Test clear removes a document's checkpoint."""
+        checkpoints.save_stage("doc_1", "ocr", {"status": "success"}, store)
+        checkpoints.clear("doc_1")
+
+        assert checkpoints.completed_stages("doc_1") == []
+
+
+class CountingVendor:
+    """Vendor call that counts calls and can be switched off."""
+
+    def __init__(self):
+        self.calls = 0
+        self.available = True
+
+    async def __call__(self, text, source_language, target_language, document_type):
+        if not self.available:
+            raise VendorUnavailableError("http://vendor", retry_after=5.0)
+        self.calls += 1
+        return {"status": "success", "translated_text": f"[{target_language}] {text}"}
+
+
+class TestResume:
+    """Test a resumed run skips stages that already have a checkpoint."""
+
+    @pytest.fixture
+    def document(self, tmp_path):
+        path = tmp_path / "doc.txt"
+        path.write_text("Solicitud de residencia para Maria.", encoding="utf-8")
+        return str(path)
+
+    def run(self, vendor, checkpoints, documents, resume):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = StagedPipelineRunner(
+                vendor_call=vendor,
+                executor=executor,
+                store=ArtifactStore(),
+                checkpoints=checkpoints,
+                resume=resume
+            )
+            return asyncio.run(runner.run(documents))
+
+    def test_completed_document_not_translated_again(self, checkpoints, document):
+        """Test resuming a finished document reuses every checkpointed stage."""
+        vendor = CountingVendor()
+        self.run(vendor, checkpoints, [document], resume=False)
+
+        results = self.run(vendor, checkpoints, [document], resume=True)
+
+        assert vendor.calls == 1
+        assert results[0]["status"] == "success"
+        assert results[0]["resumed_stages"] == ["ocr", "pre_filter", "vendor", "post_verify"]
+
+    def test_without_resume_runs_every_stage(self, checkpoints, document):
+        """Test checkpoints are only read back when resume is set."""
+        vendor = CountingVendor()
+        self.run(vendor, checkpoints, [document], resume=False)
+
+        results = self.run(vendor, checkpoints, [document], resume=False)
+
+        assert vendor.calls == 2
+        assert "resumed_stages" not in results[0]
+
+    def test_parked_document_resumes_at_vendor(self, checkpoints, document):
+        """Test a document parked while the vendor was down resumes at the vendor call."""
+        vendor = CountingVendor()
+        vendor.available = False
+        parked = self.run(vendor, checkpoints, [document], resume=False)
+        assert parked[0]["status"] == VENDOR_UNAVAILABLE
+
+        vendor.available = True
+        results = self.run(vendor, checkpoints, [document], resume=True)
+
+        assert vendor.calls == 1
+        assert results[0]["status"] == "success"
+        assert results[0]["resumed_stages"] == ["ocr", "pre_filter"]
+
+    def test_other_target_language_translated_again(self, checkpoints, document):
+        """Test resuming for another target language calls the vendor again."""
+        vendor = CountingVendor()
+        self.run(vendor, checkpoints, [document], resume=False)
+
+        results = self.run(
+            vendor, checkpoints, [{"document_path": document, "target_language": "fr"}], resume=True
+        )
+
+        assert vendor.calls == 2
+        assert results[0]["resumed_stages"] == ["ocr", "pre_filter"]
+        assert results[0]["processing_result"]["target_language"] == "fr"
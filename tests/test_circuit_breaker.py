@@ -0,0 +1,266 @@
+"""
+Tests for the vendor circuit breaker and its health prober.
+"""
+
+import asyncio
+import httpx
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools import circuit_breaker
+from tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, VendorHealthProber
+
+
+class FakeClock:
+    """Monotonic clock the test moves by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Replace the module's clock only: asyncio's event loop also reads time.monotonic
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "http://vendor",
+        window_size=10,
+        min_calls=4,
+        error_rate_threshold=0.5,
+        slow_call_seconds=5.0,
+        slow_call_rate_threshold=0.75,
+        open_seconds=30.0,
+    )
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.allow_request()
+        breaker.record_failure("boom")
+    assert breaker.state == OPEN
+
+
+class TestClosed:
+    """Test when a closed breaker opens."""
+
+    def test_stays_closed_below_min_calls(self, breaker):
+        """Test failures do not open the breaker before min_calls."""
+        for _ in range(breaker.min_calls - 1):
+            breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_error_rate_opens(self, breaker):
+        """Test an error rate at the threshold opens the breaker."""
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.snapshot()["times_opened"] == 1
+
+    def test_slow_call_rate_opens(self, breaker):
+        """Test mostly slow (but successful) calls open the breaker."""
+        for latency in (6.0, 6.0, 6.0, 0.1):
+            breaker.record_success(latency)
+
+        assert breaker.state == OPEN
+        assert "slow-call rate" in breaker.snapshot()["last_open_reason"]
+
+
+class TestOpen:
+    """Test an open breaker rejects calls until it half-opens."""
+
+    def test_rejects_calls(self, breaker):
+        """Test calls are refused and counted while open."""
+        open_breaker(breaker)
+
+        assert not breaker.allow_request()
+        assert breaker.snapshot()["rejected_calls"] == 1
+        assert breaker.retry_after() == pytest.approx(30.0)
+
+    def test_half_opens_after_open_seconds(self, breaker, clock):
+        """Test the breaker half-opens once open_seconds have passed."""
+        open_breaker(breaker)
+
+        clock.advance(29.0)
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == pytest.approx(1.0)
+
+        clock.advance(1.0)
+        assert breaker.state == HALF_OPEN
+
+    def test_trip_while_open_restarts_timeout(self, breaker, clock):
+        """Test tripping an open breaker pushes its half-open time back."""
+        open_breaker(breaker)
+        clock.advance(20.0)
+
+        breaker.trip("probe failed")
+        clock.advance(20.0)
+
+        assert breaker.state == OPEN
+
+
+class TestHalfOpen:
+    """Test trial calls decide whether a half-open breaker closes."""
+
+    @pytest.fixture
+    def half_open(self, breaker, clock):
+        open_breaker(breaker)
+        clock.advance(breaker.open_seconds)
+        assert breaker.state == HALF_OPEN
+        return breaker
+
+    def test_allows_one_trial_call(self, half_open):
+        """Test only half_open_max_calls trial calls go through."""
+        assert half_open.allow_request()
+        assert not half_open.allow_request()
+
+    def test_trial_success_closes(self, half_open):
+        """Test a successful trial call closes the breaker and clears the window."""
+        half_open.allow_request()
+        half_open.record_success(0.1)
+
+        assert half_open.state == CLOSED
+        assert half_open.snapshot()["window_calls"] == 0
+
+    def test_trial_failure_reopens(self, half_open):
+        """Test a failed trial call opens the breaker again."""
+        half_open.allow_request()
+        half_open.record_failure("still down")
+
+        assert half_open.state == OPEN
+        assert half_open.snapshot()["times_opened"] == 2
+
+    def test_slow_trial_reopens(self, half_open):
+        """Test a slow trial call counts as a failure."""
+        half_open.allow_request()
+        half_open.record_success(6.0)
+
+        assert half_open.state == OPEN
+
+    def test_release_frees_trial_slot(self, half_open):
+        """Test a cancelled trial call lets another one through."""
+        half_open.allow_request()
+        half_open.release()
+
+        assert half_open.allow_request()
+
+
+def make_prober(breaker, handler, failure_threshold=3):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return VendorHealthProber(
+        "http://vendor", client, breaker=breaker, interval=0.01, failure_threshold=failure_threshold
+    )
+
+
+def healthy(request):
+    return httpx.Response(200, json={})
+
+
+def unhealthy(request):
+    return httpx.Response(503)
+
+
+def probe(prober, times=1):
+    async def run():
+        return [await prober.probe() for _ in range(times)]
+
+    return asyncio.run(run())
+
+
+class TestVendorHealthProber:
+    """Test the prober trips and recovers the breaker."""
+
+    def test_single_failure_does_not_trip(self, breaker):
+        """Test failures below the threshold leave the breaker closed."""
+        prober = make_prober(breaker, unhealthy)
+
+        assert probe(prober, times=2) == [False, False]
+        assert breaker.state == CLOSED
+
+    def test_consecutive_failures_trip(self, breaker):
+        """Test failure_threshold failed probes in a row open the breaker."""
+        prober = make_prober(breaker, unhealthy)
+
+        probe(prober, times=3)
+
+        assert breaker.state == OPEN
+        assert "3 times in a row" in breaker.snapshot()["last_open_reason"]
+
+    def test_success_resets_count(self, breaker):
+        """Test a successful probe between failures restarts the count."""
+        health = iter([503, 503, 200, 503, 503])
+
+        def handler(request):
+            if request.url.path == "/health":
+                return httpx.Response(next(health))
+            return httpx.Response(200, json={})
+
+        prober = make_prober(breaker, handler)
+
+        assert probe(prober, times=5) == [False, False, True, False, False]
+        assert breaker.state == CLOSED
+
+    def test_connection_error_counts_as_failure(self, breaker):
+        """Test transport errors count towards the threshold."""
+        def refuse(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        prober = make_prober(breaker, refuse, failure_threshold=1)
+
+        assert probe(prober) == [False]
+        assert breaker.state == OPEN
+
+    def test_success_half_opens(self, breaker):
+        """Test a successful probe half-opens an open breaker early."""
+        open_breaker(breaker)
+        prober = make_prober(breaker, healthy)
+
+        assert probe(prober) == [True]
+        assert breaker.state == HALF_OPEN
+
+    def test_loop_survives_unexpected_errors(self, breaker):
+        """Test an exception other than httpx.HTTPError does not stop probing."""
+        calls = []
+
+        def flaky(request):
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                raise ValueError("malformed response")
+            return httpx.Response(200, json={})
+
+        prober = make_prober(breaker, flaky)
+
+        async def run():
+            prober.start()
+            while len(calls) < 5:
+                await asyncio.sleep(0.01)
+            task = prober._task
+            await prober.stop()
+            return task
+
+        task = asyncio.run(run())
+
+        assert len(calls) >= 5
+        assert task.cancelled()
@@ -0,0 +1,243 @@
+"""
+Tests for the adaptive (AIMD) vendor concurrency limiter.
+"""
+
+import time
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.concurrency_limiter import BASELINE_MIN_SAMPLES, AdaptiveConcurrencyLimiter
+
+
+def run_round(limiter, latency, size=1.0):
+    """Fill every slot, then release them all with the same latency."""
+    async def round_():
+        return [await limiter.acquire() for _ in range(limiter.limit)]
+
+    for acquired_at in asyncio.run(round_()):
+        limiter.release(acquired_at, latency=latency, size=size)
+
+
+@pytest.fixture
+def limiter():
+    return AdaptiveConcurrencyLimiter("http://vendor", initial_limit=4, min_limit=1, max_limit=16)
+
+
+class TestIncrease:
+    """Test the limit grows while calls finish at normal latency."""
+
+    def test_grows_every_round(self, limiter):
+        """Test each full round of normal calls adds up to one slot."""
+        limits = []
+        for _ in range(6):
+            run_round(limiter, latency=3.0)
+            limits.append(limiter.limit)
+
+        assert limits == sorted(limits)
+        assert 6 <= limits[-1] <= 10
+        assert limiter.snapshot()["decreases"] == 0
+
+    def test_capped_at_max(self, limiter):
+        """Test the limit never exceeds max_limit."""
+        for _ in range(40):
+            run_round(limiter, latency=3.0)
+
+        assert limiter.limit == 16
+
+    def test_idle_limit_does_not_grow(self, limiter):
+        """Test calls that use under half the limit do not raise it."""
+        async def one_call():
+            return await limiter.acquire()
+
+        for _ in range(20):
+            limiter.release(asyncio.run(one_call()), latency=3.0)
+
+        assert limiter.limit == 4
+
+
+class TestDecrease:
+    """Test overload signals back the limit off."""
+
+    def test_dropped_call_halves_limit(self, limiter):
+        """Test a 429/5xx/timeout halves the limit."""
+        async def one_call():
+            return await limiter.acquire()
+
+        limiter.release(asyncio.run(one_call()), dropped=True)
+
+        assert limiter.limit == 2
+
+    def test_slow_calls_halve_limit_once_per_round(self, limiter):
+        """Test latency above tolerance times the baseline counts once per round."""
+        for _ in range(2):
+            run_round(limiter, latency=3.0)
+        limit = limiter.limit
+
+        run_round(limiter, latency=10.0)
+
+        assert limiter.limit == limit // 2
+        assert limiter.snapshot()["decreases"] == 1
+
+    def test_floor(self, limiter):
+        """Test the limit never drops below min_limit."""
+        async def one_call():
+            return await limiter.acquire()
+
+        for _ in range(5):
+            limiter.release(asyncio.run(one_call()), dropped=True)
+
+        assert limiter.limit == 1
+
+    def test_latency_normalized_by_size(self, limiter):
+        """Test a long document is not mistaken for overload."""
+        for _ in range(2):
+            run_round(limiter, latency=3.0, size=1.0)
+
+        run_round(limiter, latency=30.0, size=10.0)
+
+        assert limiter.snapshot()["decreases"] == 0
+
+
+class TestBaseline:
+    """Test the latency baseline resists outliers."""
+
+    def test_one_fast_call_does_not_pin_limit(self, limiter):
+        """Test a single very fast response does not make normal calls look overloaded."""
+        async def one_call():
+            return await limiter.acquire()
+
+        limiter.release(asyncio.run(one_call()), latency=0.01)
+        for _ in range(40):
+            run_round(limiter, latency=3.0)
+
+        stats = limiter.snapshot()
+        assert stats["decreases"] == 0
+        assert stats["increases"] > 0
+        assert limiter.limit == 16
+
+    def test_minority_of_fast_calls_ignored(self, limiter):
+        """Test translation-memory-fast calls mixed into a round do not trigger decreases."""
+        async def round_():
+            return [await limiter.acquire() for _ in range(limiter.limit)]
+
+        for _ in range(20):
+            for index, acquired_at in enumerate(asyncio.run(round_())):
+                limiter.release(acquired_at, latency=0.01 if index % 4 == 0 else 3.0)
+
+        assert limiter.snapshot()["decreases"] == 0
+
+    def test_no_latency_signal_before_min_samples(self, limiter):
+        """Test the first calls cannot be judged slow."""
+        async def one_call():
+            return await limiter.acquire()
+
+        for latency in [0.01] + [3.0] * (BASELINE_MIN_SAMPLES - 1):
+            limiter.release(asyncio.run(one_call()), latency=latency)
+
+        assert limiter.snapshot()["decreases"] == 0
+
+    def test_cache_hits_leave_baseline_alone(self, limiter):
+        """Test releases without latency (vendor cache hits) do not feed the baseline."""
+        for _ in range(2):
+            run_round(limiter, latency=3.0)
+        baseline = limiter.snapshot()["baseline_ms_per_unit"]
+
+        async def one_call():
+            return await limiter.acquire()
+
+        for _ in range(50):
+            limiter.release(asyncio.run(one_call()))
+
+        assert limiter.snapshot()["baseline_ms_per_unit"] == baseline
+
+
+class TestQueue:
+    """Test calls over the limit wait in FIFO order."""
+
+    def test_waiters_served_in_order(self):
+        """Test a released slot goes to the oldest waiter."""
+        limiter = AdaptiveConcurrencyLimiter("http://vendor", initial_limit=1, max_limit=1)
+        order = []
+
+        async def call(name, hold):
+            acquired_at = await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(hold)
+            limiter.release(acquired_at)
+
+        async def main():
+            first = asyncio.create_task(call("a", 0.05))
+            await asyncio.sleep(0)
+            others = [asyncio.create_task(call(name, 0)) for name in "bcd"]
+            await asyncio.sleep(0)
+            assert limiter.queue_depth == 3
+            await asyncio.gather(first, *others)
+
+        asyncio.run(main())
+
+        assert order == ["a", "b", "c", "d"]
+        assert limiter.snapshot()["in_flight"] == 0
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test cancelling a queued call frees its place."""
+        limiter = AdaptiveConcurrencyLimiter("http://vendor", initial_limit=1, max_limit=1)
+
+        async def main():
+            acquired_at = await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert limiter.queue_depth == 0
+            limiter.release(acquired_at)
+
+        asyncio.run(main())
+
+        assert limiter.snapshot()["in_flight"] == 0
+
+
+class TestVendorLatencySignal:
+    """Test vendor calls feed the limiter, except responses from the vendor's cache."""
+
+    def invoke(self, monkeypatch, vendor_url, cache_status):
+        import httpx
+        from tools import vendor_connector
+
+        def handler(request):
+            time.sleep(0.002)
+            return httpx.Response(
+                200,
+                json={"status": "success", "result": {"translated_text": "Hello"}},
+                headers={"X-Translation-Cache": cache_status}
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(vendor_connector, "get_vendor_http_client", lambda: client)
+        payload = {"capability": "translate_document", "parameters": {"text": "Hola"}}
+
+        async def calls():
+            for _ in range(BASELINE_MIN_SAMPLES):
+                await vendor_connector._invoke(vendor_url, payload, None)
+            await client.aclose()
+
+        asyncio.run(calls())
+        return vendor_connector.get_concurrency_limiter(vendor_url).snapshot()
+
+    def test_vendor_calls_set_baseline(self, monkeypatch):
+        """Test calls translated by the vendor are latency samples."""
+        stats = self.invoke(monkeypatch, "http://vendor-miss", "miss")
+
+        assert stats["baseline_ms_per_unit"] > 0
+
+    def test_cache_hits_ignored(self, monkeypatch):
+        """Test calls the vendor answered from its cache are not latency samples."""
+        stats = self.invoke(monkeypatch, "http://vendor-hit", "hit")
+
+        assert stats["baseline_ms_per_unit"] == 0
+        assert stats["in_flight"] == 0
@@ -0,0 +1,169 @@
+"""
+Tests for the staged multi-document pipeline runner.
+"""
+
+import asyncio
+import pytest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline import VENDOR_UNAVAILABLE, StagedPipelineRunner
+from tools.artifact_store import ArtifactNotFoundError, ArtifactStore
+from tools.vendor_connector import VendorUnavailableError
+
+
+class FakeVendor:
+    """Vendor call that records concurrency and fails for chosen documents."""
+
+    def __init__(self, latency=0.0, errors=None):
+        self.latency = latency
+        self.errors = errors or {}  # substring of the text -> exception
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, text, source_language, target_language, document_type):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            for marker, error in self.errors.items():
+                if marker in text:
+                    raise error
+            return {"status": "success", "translated_text": f"[{target_language}] {text}"}
+        finally:
+            self.in_flight -= 1
+
+
+class ForgetfulStore(ArtifactStore):
+    """Artifact store that loses texts containing a marker, as if evicted."""
+
+    def __init__(self, marker):
+        super().__init__()
+        self.marker = marker
+
+    def get(self, ref):
+        data = super().get(ref)
+        if self.marker.encode("utf-8") in data:
+            raise ArtifactNotFoundError(ref)
+        return data
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"doc{index}.txt"
+        path.write_text(f"Documento {index}: solicitud de residencia.", encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def make_runner(vendor, executor, **kwargs):
+    return StagedPipelineRunner(vendor_call=vendor, executor=executor, store=ArtifactStore(), **kwargs)
+
+
+class TestStagedPipelineRunner:
+    """Test batches run through every stage with bounded concurrency."""
+
+    def test_processes_all_documents_in_order(self, documents, executor):
+        """Test every document is translated and results keep input order."""
+        vendor = FakeVendor()
+        runner = make_runner(vendor, executor)
+
+        results = asyncio.run(runner.run(documents))
+
+        assert [r["document_path"] for r in results] == documents
+        assert all(r["status"] in ("success", "warning") for r in results)
+        assert vendor.calls == len(documents)
+        text = runner.store.get_text(results[0]["processing_result"]["translated_text_ref"])
+        assert text.startswith("[en] ")
+
+    def test_per_document_options(self, documents, executor):
+        """Test dict inputs override the target language and document type."""
+        runner = make_runner(FakeVendor(), executor)
+
+        results = asyncio.run(runner.run([
+            {"document_path": documents[0], "target_language": "fr", "document_type": "visa"}
+        ]))
+
+        result = results[0]["processing_result"]
+        assert result["target_language"] == "fr"
+        assert result["document_type"] == "visa"
+
+    def test_vendor_concurrency_bounded(self, documents, executor):
+        """Test no more vendor calls run at once than the vendor stage's workers."""
+        vendor = FakeVendor(latency=0.02)
+        runner = make_runner(vendor, executor, concurrency={"vendor": 2}, queue_size=1)
+
+        asyncio.run(runner.run(documents))
+
+        assert vendor.max_in_flight == 2
+
+    def test_unknown_stage_rejected(self, executor):
+        """Test a concurrency setting for an unknown stage is an error."""
+        with pytest.raises(ValueError):
+            make_runner(FakeVendor(), executor, concurrency={"translate": 2})
+
+    def test_failed_document_does_not_stop_batch(self, documents, tmp_path, executor):
+        """Test a document failing OCR is marked and the others still finish."""
+        vendor = FakeVendor()
+        runner = make_runner(vendor, executor)
+        batch = [documents[0], str(tmp_path / "missing.txt"), documents[1]]
+
+        results = asyncio.run(runner.run(batch))
+
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        assert results[1]["failed_stage"] == "ocr"
+        assert vendor.calls == 2
+
+    def test_vendor_error_marks_document(self, documents, executor):
+        """Test a vendor error fails only that document at the vendor stage."""
+        vendor = FakeVendor(errors={"Documento 2": RuntimeError("bad gateway")})
+        runner = make_runner(vendor, executor)
+
+        results = asyncio.run(runner.run(documents))
+
+        failed = [r for r in results if r["status"] == "error"]
+        assert [r["document_path"] for r in failed] == [documents[2]]
+        assert failed[0]["failed_stage"] == "vendor"
+        assert "bad gateway" in failed[0]["error_message"]
+        assert "processing_result" not in failed[0]
+
+    def test_vendor_unavailable_parks_document(self, documents, executor):
+        """Test an open vendor circuit parks documents instead of failing them."""
+        error = VendorUnavailableError("http://vendor", retry_after=12.0)
+        vendor = FakeVendor(errors={"Documento": error})
+        runner = make_runner(vendor, executor)
+
+        results = asyncio.run(runner.run(documents[:2]))
+
+        assert all(r["status"] == VENDOR_UNAVAILABLE for r in results)
+        parked = results[0]["processing_result"]
+        assert parked["failed_stage"] == "vendor"
+        assert parked["retry_after_seconds"] == 12.0
+        # Earlier stages are kept for a resumed run
+        assert "pre_filter_result" in results[0]
+
+    def test_evicted_artifact_fails_document(self, documents, executor):
+        """Test a stage input evicted from the store fails the document, not the batch."""
+        runner = StagedPipelineRunner(
+            vendor_call=FakeVendor(), executor=executor, store=ForgetfulStore("Documento 1")
+        )
+
+        results = asyncio.run(runner.run(documents[:3]))
+
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        assert results[1]["failed_stage"] == "pre_filter"
+        assert "no longer in the artifact store" in results[1]["error_message"]
@@ -0,0 +1,254 @@
+"""
+Tests for the code-orchestrated ProcessingAgent pipeline.
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from typing import AsyncGenerator, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from agents.processing_agent import ProcessingPipelineAgent, _find_document_path, _read_prompt_field
+from pipeline import VENDOR_UNAVAILABLE, CheckpointStore
+from tools.artifact_store import ArtifactNotFoundError, ArtifactStore
+from tools.circuit_breaker import CircuitBreaker
+
+SAMPLE_DOCUMENT = str(Path(__file__).parent.parent / "samples" / "sample_document.txt")
+
+
+class FakeVendor(BaseAgent):
+    """Vendor sub-agent that answers every request with a fixed prefix (or fails)."""
+
+    reply_prefix: str = "TRANSLATED "
+    error_message: str = ""
+    requests: List[str] = []
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        request = ctx.session.events[-1].content.parts[0].text
+        self.requests.append(request)
+        if self.error_message:
+            raise RuntimeError(self.error_message)
+        masked_text = request.split("\n\n", 1)[1]
+        reply = f"{self.reply_prefix}{masked_text[:40]}" if self.reply_prefix else ""
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=reply)])
+        )
+
+
+def run_agent(agent, prompt, state=None):
+    """Run the agent once; return its events and the final session state."""
+    async def run():
+        runner = InMemoryRunner(agent=agent, app_name="agents")
+        session = await runner.session_service.create_session(
+            app_name="agents", user_id="officer", state=state or {}
+        )
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        events = [
+            event async for event in runner.run_async(
+                user_id="officer", session_id=session.id, new_message=message
+            )
+        ]
+        session = await runner.session_service.get_session(
+            app_name="agents", user_id="officer", session_id=session.id
+        )
+        return events, session.state
+
+    return asyncio.run(run())
+
+
+def event_text(event):
+    return event.content.parts[0].text if event.content and event.content.parts else ""
+
+
+@pytest.fixture
+def vendor():
+    return FakeVendor(name="vendor", requests=[])
+
+
+@pytest.fixture
+def agent(vendor):
+    return ProcessingPipelineAgent(name="processing_agent", vendor_agent=vendor)
+
+
+class TestPromptParsing:
+    """Test inputs read from the user prompt."""
+
+    def test_find_document_path(self):
+        """Test the first existing file in the prompt is the document."""
+        prompt = f"Please process '{SAMPLE_DOCUMENT}', thanks"
+
+        assert _find_document_path(prompt) == SAMPLE_DOCUMENT
+        assert _find_document_path(f"Process {SAMPLE_DOCUMENT}.") == SAMPLE_DOCUMENT
+        assert _find_document_path("Process missing/file.txt") is None
+
+    def test_read_prompt_fields(self):
+        """Test "Field: value" lines, with language names mapped to codes."""
+        prompt = "Document type: birth_certificate\nTarget language: Polish"
+
+        assert _read_prompt_field(prompt, "document_type") == "birth_certificate"
+        assert _read_prompt_field(prompt, "target_language") == "pl"
+        assert _read_prompt_field("Target language: FR", "target_language") == "fr"
+        assert _read_prompt_field("Translate this", "document_type") is None
+
+
+class TestProcessingPipelineAgent:
+    """Test the stages run in order and hand their results on."""
+
+    def test_stage_events_in_order(self, agent, vendor):
+        """Test every stage reports an event and the vendor reply is relayed."""
+        events, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}\nTarget language: English")
+
+        texts = [event_text(event) for event in events]
+        assert [event.author for event in events] == [
+            "processing_agent", "processing_agent", "processing_agent",
+            "vendor", "processing_agent", "processing_agent", "processing_agent",
+        ]
+        assert texts[0].startswith("[1/5] OCR extracted")
+        assert texts[1].startswith("[2/5] Masked")
+        assert texts[3].startswith("TRANSLATED ")
+        assert texts[-1].startswith("[5/5] Processing complete (success)")
+        assert texts[-1].endswith(texts[3])
+        assert state["processing_result"]["status"] == "success"
+        assert {"ocr_result", "pre_filter_result", "vendor_result", "post_verify_result"} <= set(state)
+
+    def test_vendor_gets_masked_text(self, agent, vendor):
+        """Test only masked text crosses the A2A boundary, with the prompt's options."""
+        run_agent(agent, f"Process {SAMPLE_DOCUMENT}\nDocument type: birth_certificate\nTarget language: Polish")
+
+        request = vendor.requests[0]
+        assert request.startswith("Translate this birth_certificate from es to pl.")
+        assert "CERTIFICADO DE NACIMIENTO" in request
+        assert "123-45-6789" not in request
+
+    def test_state_overrides_prompt(self, agent, vendor):
+        """Test inputs in session state win over the prompt."""
+        state = {"document_path": SAMPLE_DOCUMENT, "target_language": "fr", "document_id": "DOC-1"}
+
+        _, state = run_agent(agent, "Process the document. Target language: German", state)
+
+        assert "to fr." in vendor.requests[0]
+        assert state["processing_result"]["document_id"] == "DOC-1"
+        assert state["processing_result"]["target_language"] == "fr"
+
+    def test_missing_document_path(self, agent, vendor):
+        """Test a prompt without a document fails without calling the vendor."""
+        events, state = run_agent(agent, "Process the usual document")
+
+        assert len(events) == 1
+        assert state["processing_result"]["status"] == "error"
+        assert vendor.requests == []
+
+    def test_stage_error_becomes_error_result(self, agent, vendor, tmp_path):
+        """Test a failing stage ends the run with an error result naming the stage."""
+        missing = str(tmp_path / "missing.txt")
+
+        events, state = run_agent(agent, "Process it", {"document_path": missing})
+
+        result = state["processing_result"]
+        assert result["status"] == "error"
+        assert result["failed_stage"] == "ocr"
+        assert event_text(events[-1]).startswith("Processing failed at stage 'ocr'")
+        assert vendor.requests == []
+
+    def test_empty_vendor_reply(self, agent, vendor):
+        """Test a vendor reply without text fails the vendor stage."""
+        vendor.reply_prefix = ""
+
+        _, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}")
+
+        assert state["processing_result"]["failed_stage"] == "vendor"
+        assert "post_verify_result" not in state
+
+    def test_evicted_artifact_becomes_error_result(self, vendor):
+        """Test a translation evicted from the artifact store fails its stage cleanly."""
+        class ForgetfulStore(ArtifactStore):
+            def get(self, ref):
+                data = super().get(ref)
+                if data.startswith(b"TRANSLATED "):
+                    raise ArtifactNotFoundError(ref)
+                return data
+
+        agent = ProcessingPipelineAgent(
+            name="processing_agent", vendor_agent=vendor, artifact_store=ForgetfulStore()
+        )
+
+        events, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}")
+
+        result = state["processing_result"]
+        assert result["status"] == "error"
+        assert result["failed_stage"] == "post_verify"
+        assert "no longer in the artifact store" in result["error_message"]
+
+    def test_resume_skips_checkpointed_stages(self, vendor, tmp_path):
+        """Test a resumed run reuses checkpointed stages instead of calling the vendor again."""
+        checkpoints = CheckpointStore(tmp_path / "checkpoints")
+        first = ProcessingPipelineAgent(
+            name="processing_agent", vendor_agent=vendor, checkpoint_store=checkpoints
+        )
+        run_agent(first, f"Process {SAMPLE_DOCUMENT}")
+
+        resumed = ProcessingPipelineAgent(
+            name="processing_agent",
+            vendor_agent=FakeVendor(name="vendor", requests=[]),
+            checkpoint_store=checkpoints,
+            resume=True
+        )
+        events, state = run_agent(resumed, f"Process {SAMPLE_DOCUMENT}")
+
+        assert len(vendor.requests) == 1
+        assert resumed.vendor_agent.requests == []
+        assert "vendor" not in [event.author for event in events]
+        assert state["processing_result"]["status"] == "success"
+
+
+class TestVendorCircuitBreaker:
+    """Test the vendor stage follows the vendor's circuit breaker."""
+
+    @pytest.fixture
+    def breaker(self):
+        return CircuitBreaker("http://vendor", min_calls=1, error_rate_threshold=1.0)
+
+    @pytest.fixture
+    def agent(self, vendor, breaker):
+        return ProcessingPipelineAgent(
+            name="processing_agent", vendor_agent=vendor, circuit_breaker=breaker
+        )
+
+    def test_open_breaker_parks_document(self, agent, vendor, breaker):
+        """Test an open breaker parks the document without calling the vendor."""
+        breaker.trip("vendor down")
+
+        events, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}")
+
+        assert state["processing_result"]["status"] == VENDOR_UNAVAILABLE
+        assert event_text(events[-1]).startswith("[3/5] Vendor unavailable")
+        assert "pre_filter_result" in state
+        assert vendor.requests == []
+
+    def test_vendor_error_recorded(self, agent, vendor, breaker):
+        """Test a failing vendor call becomes a vendor stage error and opens the breaker."""
+        vendor.error_message = "connection reset"
+
+        _, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}")
+
+        assert state["processing_result"]["failed_stage"] == "vendor"
+        assert "connection reset" in state["processing_result"]["error_message"]
+        assert breaker.state == "open"
+
+    def test_success_recorded(self, agent, breaker):
+        """Test a successful vendor call is recorded on the breaker."""
+        _, state = run_agent(agent, f"Process {SAMPLE_DOCUMENT}")
+
+        assert state["processing_result"]["status"] == "success"
+        assert breaker.snapshot()["window_calls"] == 1
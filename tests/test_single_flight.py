@@ -0,0 +1,145 @@
+"""
+Tests for coalescing concurrent identical vendor calls.
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.single_flight import SingleFlight, request_key
+
+
+class FakeCall:
+    """Vendor call that counts invocations and finishes when released."""
+
+    def __init__(self, result="translated", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    """Let started tasks reach their first await."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestRequestKey:
+    """Test request keys."""
+
+    def test_stable_and_distinct(self):
+        """Test equal parts give equal keys and different parts different keys."""
+        assert request_key("doc", "es", {"a": 1}) == request_key("doc", "es", {"a": 1})
+        assert request_key("doc", "es") != request_key("doc", "fr")
+
+
+class TestSingleFlight:
+    """Test concurrent callers share one call."""
+
+    def test_coalesces_concurrent_calls(self):
+        """Test callers with the same key share one call and its result."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall()
+            callers = [asyncio.ensure_future(flights.do("key", call)) for _ in range(3)]
+            await settle()
+            call.release.set()
+            return flights, call, await asyncio.gather(*callers)
+
+        flights, call, results = asyncio.run(run())
+
+        assert results == ["translated"] * 3
+        assert call.calls == 1
+        assert flights.stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+    def test_different_keys_not_coalesced(self):
+        """Test callers with different keys each make their own call."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall()
+            call.release.set()
+            await asyncio.gather(flights.do("a", call), flights.do("b", call))
+            return call
+
+        assert asyncio.run(run()).calls == 2
+
+    def test_sequential_calls_not_cached(self):
+        """Test a finished call is not reused by later callers."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall()
+            call.release.set()
+            await flights.do("key", call)
+            await flights.do("key", call)
+            return call
+
+        assert asyncio.run(run()).calls == 2
+
+    def test_error_shared(self):
+        """Test every waiting caller gets the shared call's error."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall(error=RuntimeError("vendor down"))
+            callers = [asyncio.ensure_future(flights.do("key", call)) for _ in range(2)]
+            await settle()
+            call.release.set()
+            return call, await asyncio.gather(*callers, return_exceptions=True)
+
+        call, results = asyncio.run(run())
+
+        assert call.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """Test one cancelled caller leaves the shared call running for the rest."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall()
+            first = asyncio.ensure_future(flights.do("key", call))
+            second = asyncio.ensure_future(flights.do("key", call))
+            await settle()
+            first.cancel()
+            await settle()
+            call.release.set()
+            return call, first, await second
+
+        call, first, result = asyncio.run(run())
+
+        assert first.cancelled()
+        assert result == "translated"
+        assert not call.cancelled
+
+    def test_last_cancelled_caller_cancels_call(self):
+        """Test the shared call is cancelled once no caller waits for it."""
+        async def run():
+            flights = SingleFlight()
+            call = FakeCall()
+            callers = [asyncio.ensure_future(flights.do("key", call)) for _ in range(2)]
+            await settle()
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await settle()
+            return flights, call
+
+        flights, call = asyncio.run(run())
+
+        assert call.cancelled
+        assert flights.stats()["in_flight"] == 0
@@ -0,0 +1,119 @@
+"""
+Tests for per-stage latency histograms and the report signal handler.
+"""
+
+import os
+import time
+import subprocess
+import signal
+import asyncio
+import threading
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from observability import timing
+from observability.timing import LatencyHistogram, get_histogram, timed
+
+
+@pytest.fixture(autouse=True)
+def clean_histograms():
+    timing.reset()
+    yield
+    timing.reset()
+
+
+class TestLatencyHistogram:
+    """Test percentiles stay within the bucket error."""
+
+    def test_percentiles(self):
+        """Test p50/p99 of a uniform 1-1000 ms distribution."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.002)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.002)
+        assert histogram.summary()["max_ms"] == 1000
+        assert histogram.summary()["count"] == 1000
+
+    def test_empty(self):
+        """Test an empty histogram reports zero."""
+        assert LatencyHistogram().percentile(95) == 0.0
+
+
+class TestTimed:
+    """Test timed records blocks, functions and coroutines."""
+
+    def test_context_manager_and_decorators(self):
+        """Test each form records into its named histogram."""
+        @timed("sync")
+        def work():
+            time.sleep(0.01)
+
+        @timed("async")
+        async def async_work():
+            await asyncio.sleep(0.01)
+
+        with timed("block"):
+            work()
+        asyncio.run(async_work())
+
+        assert get_histogram("sync").count == 1
+        assert get_histogram("async").count == 1
+        assert get_histogram("block").percentile(50) >= 10
+
+    def test_failures_recorded(self):
+        """Test a failing call still records its latency."""
+        @timed("failing")
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fail()
+
+        assert get_histogram("failing").count == 1
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 not available")
+class TestDumpSignal:
+    """Test the report signal does not deadlock on a held histogram lock."""
+
+    def test_signal_while_recording(self, monkeypatch):
+        """Test a signal arriving inside record() dumps once the lock is free."""
+        dumped = threading.Event()
+        monkeypatch.setattr(timing, "dump", lambda stream=None: (timing.format_report(), dumped.set()))
+        monkeypatch.setattr(timing, "_handlers_installed", False)
+        monkeypatch.setattr(timing.atexit, "register", lambda func: None)
+        previous = signal.getsignal(signal.SIGUSR1)
+        histogram = get_histogram("vendor.translate_document")
+        histogram.record(0.1)
+
+        try:
+            timing.install_dump_handlers()
+            with histogram._lock:
+                # The main thread is inside record(): the handler must not dump here
+                os.kill(os.getpid(), signal.SIGUSR1)
+                time.sleep(0.05)
+                assert not dumped.is_set()
+            assert dumped.wait(timeout=5)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+
+
+class TestImports:
+    """Test timing can be used without the tools package."""
+
+    def test_security_policy_does_not_import_tools(self):
+        """Test importing security.policy leaves tools (and its ADK/HTTP deps) unloaded."""
+        code = "import sys, security.policy; print('tools' in sys.modules, 'httpx' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.split() == ["False", "False"]
@@ -0,0 +1,184 @@
+"""
+Tests for vendor routing, failover and hedged requests.
+"""
+
+import uuid
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.circuit_breaker import get_circuit_breaker
+from tools.vendor_router import VendorRouter
+
+
+def vendor_urls(count):
+    """Unique vendor URLs: circuit breakers are shared per URL."""
+    run = uuid.uuid4().hex[:8]
+    return [f"http://vendor-{run}-{index}" for index in range(count)]
+
+
+class FakeVendors:
+    """Vendor replicas with a fixed latency (seconds) or error per URL."""
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.calls = []
+        self.cancelled = []
+
+    async def __call__(self, url):
+        self.calls.append(url)
+        outcome = self.behaviour[url]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        try:
+            await asyncio.sleep(outcome)
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        return url
+
+
+def warm_up(router, latency, size=1.0, count=20):
+    """Feed latency samples of calls of the given size."""
+    for _ in range(count):
+        router._latencies.append(latency / max(size, 1.0))
+
+
+class TestRouting:
+    """Test endpoint choice and failover."""
+
+    def test_needs_endpoints(self):
+        """Test a router without endpoints is rejected."""
+        with pytest.raises(ValueError):
+            VendorRouter([])
+
+    def test_prefers_lower_cost(self):
+        """Test power-of-two-choices picks the cheaper of two endpoints."""
+        fast, slow = urls = vendor_urls(2)
+        router = VendorRouter(urls)
+        router.endpoints[0].latency_ewma = 0.1
+        router.endpoints[1].latency_ewma = 5.0
+
+        assert all(router.choose().url == fast for _ in range(20))
+
+    def test_endpoint_latency_per_unit(self):
+        """Test a long document does not make its endpoint look slow."""
+        urls = vendor_urls(1)
+        router = VendorRouter(urls)
+
+        asyncio.run(router.call(FakeVendors({urls[0]: 0.05}), size=10))
+
+        assert router.endpoints[0].latency_ewma == pytest.approx(0.005, rel=0.5)
+
+    def test_avoids_open_breaker(self):
+        """Test an endpoint with an open breaker is not chosen while others are left."""
+        down, up = urls = vendor_urls(2)
+        router = VendorRouter(urls)
+        router.endpoints[1].latency_ewma = 100.0
+        get_circuit_breaker(down).trip("test")
+
+        assert all(router.choose().url == up for _ in range(20))
+        assert router.choose(exclude={up}).url == down
+
+    def test_fails_over_on_error(self):
+        """Test a failed call is retried on another endpoint."""
+        broken, working = urls = vendor_urls(2)
+        router = VendorRouter(urls)
+        router.endpoints[1].latency_ewma = 100.0  # try the broken endpoint first
+        vendors = FakeVendors({broken: ConnectionError("refused"), working: 0.0})
+
+        result = asyncio.run(router.call(vendors))
+
+        assert result == working
+        assert vendors.calls == urls
+        assert router.endpoints[0].failures == 1
+
+    def test_non_retryable_error_not_failed_over(self):
+        """Test an error is_retryable rejects is raised without trying another endpoint."""
+        broken, working = urls = vendor_urls(2)
+        router = VendorRouter(urls)
+        router.endpoints[1].latency_ewma = 100.0
+        vendors = FakeVendors({broken: ValueError("bad request"), working: 0.0})
+
+        with pytest.raises(ValueError):
+            asyncio.run(router.call(vendors, is_retryable=lambda e: not isinstance(e, ValueError)))
+
+        assert vendors.calls == [broken]
+
+    def test_all_endpoints_fail(self):
+        """Test each endpoint is tried once and the last error is raised."""
+        urls = vendor_urls(3)
+        router = VendorRouter(urls)
+        vendors = FakeVendors({url: ConnectionError(url) for url in urls})
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(router.call(vendors))
+
+        assert sorted(vendors.calls) == sorted(urls)
+
+
+class TestHedging:
+    """Test slow calls are duplicated to a second replica within the budget."""
+
+    def test_hedge_delay_scales_with_size(self):
+        """Test the hedge delay is the per-unit percentile times the call size."""
+        router = VendorRouter(vendor_urls(2), hedge_percentile=95)
+        assert router.hedge_delay() is None
+
+        warm_up(router, latency=0.5)
+
+        assert router.hedge_delay() == pytest.approx(0.5)
+        assert router.hedge_delay(size=10) == pytest.approx(5.0)
+        assert router.hedge_delay(size=0.2) == pytest.approx(0.5)
+
+    def test_latency_recorded_per_unit(self):
+        """Test a long call adds its latency per 1,000 characters."""
+        slow, fast = urls = vendor_urls(2)
+        router = VendorRouter(urls)
+        vendors = FakeVendors({slow: 0.05, fast: 0.05})
+
+        asyncio.run(router.call(vendors, size=5))
+
+        assert router._latencies[-1] == pytest.approx(0.01, rel=0.5)
+
+    def test_slow_call_hedged_and_loser_cancelled(self):
+        """Test a call past the hedge delay is duplicated and the slower request cancelled."""
+        urls = vendor_urls(2)
+        router = VendorRouter(urls, hedge_budget=1.0)
+        warm_up(router, latency=0.02)
+        vendors = FakeVendors({urls[0]: 1.0, urls[1]: 0.01})
+        router.endpoints[1].latency_ewma = 100.0  # route the first try to urls[0]
+
+        result = asyncio.run(router.call(vendors, hedge=True))
+
+        assert result == urls[1]
+        assert vendors.calls == urls
+        assert vendors.cancelled == [urls[0]]
+        assert router.snapshot()["hedge_wins"] == 1
+
+    def test_long_document_not_hedged(self):
+        """Test a long call within its size-scaled delay is not hedged."""
+        urls = vendor_urls(2)
+        router = VendorRouter(urls, hedge_budget=1.0)
+        warm_up(router, latency=0.02)
+        vendors = FakeVendors({url: 0.1 for url in urls})
+
+        asyncio.run(router.call(vendors, hedge=True, size=10))
+
+        assert len(vendors.calls) == 1
+        assert router.snapshot()["hedged_requests"] == 0
+
+    def test_hedge_budget(self):
+        """Test hedges stop once they would exceed the budget."""
+        urls = vendor_urls(2)
+        router = VendorRouter(urls, hedge_budget=0.0)
+        warm_up(router, latency=0.01)
+        vendors = FakeVendors({url: 0.05 for url in urls})
+
+        asyncio.run(router.call(vendors, hedge=True))
+
+        assert len(vendors.calls) == 1
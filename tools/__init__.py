@@ -4,15 +4,42 @@ Internal tools for government document processing.
 This module contains trusted, internal tools used by government agents:
 - ocr_tool: Text extraction from documents
 - vendor_connector: A2A connection to external vendor
+- artifact_store: Content-addressed storage for pipeline payloads
+- agent_card_cache: Cached vendor agent card (TTL + revalidation)
+- http_client: Shared pooled HTTP client for the vendor connection
+- circuit_breaker: Vendor circuit breaker and background health prober
+- vendor_router: Latency-aware routing and failover across vendor replicas
+- single_flight: Coalescing of concurrent identical vendor calls
+- concurrency_limiter: Adaptive (AIMD) limit on concurrent vendor calls
 
 These tools run in the secure government environment and are not exposed externally.
 """
 
 from .ocr_tool import ocr_tool
 from .vendor_connector import create_remote_vendor_agent, test_vendor_connection
+from .artifact_store import ArtifactStore, get_artifact_store
+from .agent_card_cache import AgentCardCache, get_agent_card_cache
+from .http_client import get_vendor_http_client, close_vendor_http_client
+from .circuit_breaker import CircuitBreaker, VendorHealthProber, get_circuit_breaker
+from .vendor_router import VendorRouter
+from .single_flight import SingleFlight
+from .concurrency_limiter import AdaptiveConcurrencyLimiter, get_concurrency_limiter
 
 __all__ = [
     "ocr_tool",
     "create_remote_vendor_agent",
     "test_vendor_connection",
+    "ArtifactStore",
+    "get_artifact_store",
+    "AgentCardCache",
+    "get_agent_card_cache",
+    "get_vendor_http_client",
+    "close_vendor_http_client",
+    "CircuitBreaker",
+    "VendorHealthProber",
+    "get_circuit_breaker",
+    "VendorRouter",
+    "SingleFlight",
+    "AdaptiveConcurrencyLimiter",
+    "get_concurrency_limiter",
 ]
@@ -0,0 +1,305 @@
+"""
+Agent Card Cache: TTL cache with conditional revalidation for vendor cards.
+
+Reading the vendor's agent card is the first thing every A2A consumer does.
+Against a Render-hosted vendor that may be asleep, that round-trip costs
+seconds on every process start and every health probe. This cache keeps the
+card:
+
+- in memory, keyed by URL, fresh for a TTL (no network at all)
+- on disk, so a new process starts with a fresh card or at least with the
+  validators needed to revalidate it
+- revalidated with If-None-Match / If-Modified-Since once stale, so an
+  unchanged card costs a 304 with no body
+- served stale (with a warning) if the vendor cannot be reached, as long as
+  a copy exists
+
+The cache sits in the vendor HTTP client (tools.http_client) as an httpx
+transport, so RemoteA2aAgent still resolves its card from the URL - and ADK
+keeps applying its origin checks to a card that came off the network - while
+card requests are answered from the cache. A request with
+"Cache-Control: no-cache" (the connectivity probe) always revalidates and
+never falls back to a stale copy.
+
+Configuration (environment):
+    AGENT_CARD_CACHE_TTL  Freshness lifetime in seconds (default: 300)
+    AGENT_CARD_CACHE_DIR  Directory for on-disk copies
+                          (default: ~/.cache/gov-docs-a2a/agent-cards,
+                          set to an empty value to disable)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "gov-docs-a2a", "agent-cards")
+
+
+class AgentCardUnavailableError(RuntimeError):
+    """Raised when a card cannot be fetched and no cached copy exists."""
+
+
+class AgentCardCache:
+    """
+    Agent card cache keyed by URL with TTL and conditional revalidation.
+
+    Holds the cached cards; the network side lives in AgentCardCacheTransport.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        directory: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            ttl_seconds: How long a fetched card is used without revalidation
+            directory: Optional directory for on-disk copies
+        """
+        self.ttl_seconds = ttl_seconds
+        self.directory = Path(directory).expanduser() if directory else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # On-disk copies
+    # ------------------------------------------------------------------
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{key}.json", self.directory / f"{key}.meta.json"
+
+    def _load_from_disk(self, url: str) -> Optional[Dict[str, Any]]:
+        if not self.directory:
+            return None
+        card_path, meta_path = self._paths(url)
+        try:
+            entry = json.loads(meta_path.read_text(encoding="utf-8"))
+            entry["card"] = json.loads(card_path.read_text(encoding="utf-8"))
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _save_to_disk(self, url: str, entry: Dict[str, Any]) -> None:
+        if not self.directory:
+            return
+        card_path, meta_path = self._paths(url)
+        meta = {k: v for k, v in entry.items() if k != "card"}
+        try:
+            for path, content in ((card_path, entry["card"]), (meta_path, meta)):
+                self._write(path, content)
+        except OSError as e:
+            logger.warning(f"Could not persist agent card for {url}: {e}")
+
+    def _write(self, path: Path, content: Any) -> None:
+        """Write a JSON file atomically; other processes may share the directory."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(content, tmp_file, indent=2)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    # ------------------------------------------------------------------
+    # Cache steps (driven by AgentCardCacheTransport)
+    # ------------------------------------------------------------------
+
+    def _entry(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(url)
+        if entry is None:
+            entry = self._load_from_disk(url)
+            if entry is not None:
+                self._entries[url] = entry
+        return entry
+
+    def fresh_card(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached card if it is within its TTL, else None."""
+        with self._lock:
+            entry = self._entry(url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return entry["card"]
+        return None
+
+    def cached_card(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached card, fresh or stale, without any network call."""
+        with self._lock:
+            entry = self._entry(url)
+        return entry["card"] if entry is not None else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a cached card."""
+        with self._lock:
+            entry = self._entry(url)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        content: bytes
+    ) -> Dict[str, Any]:
+        """
+        Apply a card response to the cache.
+
+        Args:
+            url: Agent card URL
+            status_code: Response status (200 or 304)
+            headers: Response headers
+            content: Response body
+
+        Returns:
+            dict: Current agent card
+
+        Raises:
+            ValueError: If the response is not a usable card response
+        """
+        with self._lock:
+            entry = self._entry(url)
+            if status_code == 304 and entry is not None:
+                logger.debug(f"Agent card not modified: {url}")
+                entry["fetched_at"] = time.time()
+            elif status_code == 200:
+                entry = {
+                    "url": url,
+                    "card": json.loads(content),
+                    "etag": headers.get("ETag"),
+                    "last_modified": headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+                self._entries[url] = entry
+            else:
+                raise ValueError(f"Agent card request returned status {status_code}")
+            self._save_to_disk(url, entry)
+            return entry["card"]
+
+    def fallback(self, url: str, error: Exception) -> Dict[str, Any]:
+        """
+        Return the stale card after a failed fetch.
+
+        Raises:
+            AgentCardUnavailableError: If no cached copy exists
+        """
+        with self._lock:
+            entry = self._entry(url)
+        if entry is None:
+            raise AgentCardUnavailableError(f"Agent card unavailable: {url} ({error})") from error
+        logger.warning(f"Using stale agent card for {url}: {error}")
+        return entry["card"]
+
+    def invalidate(self, url: str) -> None:
+        """Drop the in-memory entry for a URL (the disk copy is kept as fallback)."""
+        with self._lock:
+            self._entries.pop(url, None)
+
+
+class AgentCardCacheTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers agent card requests from an AgentCardCache.
+
+    GET requests for card_path are served from the cache while fresh and
+    revalidated through the wrapped transport once stale; if the vendor
+    cannot be reached, the stale copy is served. A request with
+    "Cache-Control: no-cache" skips the fresh copy and gets the real outcome
+    of the revalidation. All other requests pass through unchanged.
+    """
+
+    def __init__(
+        self,
+        cache: AgentCardCache,
+        card_path: str = "/.well-known/agent-card.json",
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            cache: Agent card cache
+            card_path: URL path of agent cards
+            transport: Transport for network requests (default: a new
+                httpx.AsyncHTTPTransport)
+        """
+        self.cache = cache
+        self.card_path = card_path
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    def _card_response(self, request: httpx.Request, card: Dict[str, Any]) -> httpx.Response:
+        return httpx.Response(200, json=card, request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or request.url.path != self.card_path:
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+        no_cache = "no-cache" in request.headers.get("Cache-Control", "")
+
+        card = None if no_cache else self.cache.fresh_card(url)
+        if card is not None:
+            return self._card_response(request, card)
+
+        request.headers.update(self.cache.conditional_headers(url))
+        try:
+            response = await self.transport.handle_async_request(request)
+            await response.aread()
+        except httpx.HTTPError as e:
+            if no_cache:
+                raise
+            try:
+                return self._card_response(request, self.cache.fallback(url, e))
+            except AgentCardUnavailableError:
+                raise e
+
+        try:
+            card = self.cache.update(url, response.status_code, response.headers, response.content)
+        except ValueError as e:
+            if no_cache:
+                return response
+            try:
+                card = self.cache.fallback(url, e)
+            except AgentCardUnavailableError:
+                return response  # Nothing cached: let the caller see the error
+        return self._card_response(request, card)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+_default_cache: Optional[AgentCardCache] = None
+
+
+def get_agent_card_cache() -> AgentCardCache:
+    """
+    Return the process-wide agent card cache, configured from the environment.
+
+    Returns:
+        AgentCardCache shared by the vendor connector
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AgentCardCache(
+            ttl_seconds=float(os.getenv("AGENT_CARD_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+            directory=os.getenv("AGENT_CARD_CACHE_DIR", DEFAULT_CACHE_DIR) or None
+        )
+    return _default_cache
@@ -0,0 +1,208 @@
+"""
+Artifact Store: Content-addressed storage for pipeline payloads.
+
+Extracted text, masked text and translations can be tens of kilobytes each.
+Instead of copying them through tool results, session state and events, the
+pipeline stages store them here and pass short references around:
+
+    ref = store.put_text(extracted_text)   # "sha256:9f86d081884c7d65..."
+    text = store.get_text(ref)             # only where the bytes are needed
+
+Artifacts are keyed by the SHA-256 of their content, so storing the same
+text twice is free. The in-memory tier evicts least-recently-used artifacts
+once it exceeds its byte budget. When a directory is configured, every
+artifact is also written to disk and evicted artifacts are reloaded from
+there on demand.
+
+Configuration (environment):
+    ARTIFACT_STORE_DIR        Optional directory for the on-disk tier
+    ARTIFACT_STORE_MAX_BYTES  In-memory budget in bytes (default: 64 MiB)
+"""
+
+import os
+import hashlib
+import tempfile
+import contextlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+REF_PREFIX = "sha256:"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ArtifactNotFoundError(KeyError):
+    """Raised when a reference cannot be resolved to stored content."""
+
+
+def is_artifact_ref(value: Any) -> bool:
+    """Return True if value looks like an artifact reference."""
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+class ArtifactStore:
+    """
+    Content-addressed artifact store with size-based LRU eviction.
+
+    Thread-safe: pipeline stages may run in worker threads.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            max_bytes: Byte budget for the in-memory tier
+            directory: Optional directory for the persistent on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def _path(self, ref: str) -> Path:
+        return self.directory / ref[len(REF_PREFIX):]
+
+    def _remember(self, ref: str, data: bytes) -> None:
+        """Insert into the memory tier and evict LRU entries over budget."""
+        if ref in self._memory:
+            self._memory.move_to_end(ref)
+            return
+
+        self._memory[ref] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            evicted_ref, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._evictions += 1
+            logger.debug(f"Evicted artifact {evicted_ref[:19]} ({len(evicted)} bytes)")
+
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes and return their reference.
+
+        Args:
+            data: Content to store
+
+        Returns:
+            Artifact reference ("sha256:<hex digest>")
+        """
+        ref = REF_PREFIX + hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            self._remember(ref, data)
+
+        if self.directory:
+            self._write(self._path(ref), data)
+
+        return ref
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write an artifact file atomically; concurrent writers of the same content are safe."""
+        if path.exists():
+            return
+        # Unique temp file per writer: identical payloads are written concurrently
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def put_text(self, text: str) -> str:
+        """Store UTF-8 text and return its reference."""
+        return self.put(text.encode("utf-8"))
+
+    def get(self, ref: str) -> bytes:
+        """
+        Resolve a reference to its content.
+
+        Args:
+            ref: Artifact reference returned by put()
+
+        Returns:
+            Stored bytes
+
+        Raises:
+            ArtifactNotFoundError: If the artifact is not stored (or was evicted
+                from memory and no on-disk tier is configured)
+        """
+        with self._lock:
+            data = self._memory.get(ref)
+            if data is not None:
+                self._memory.move_to_end(ref)
+                return data
+
+        if self.directory and is_artifact_ref(ref):
+            path = self._path(ref)
+            if path.exists():
+                data = path.read_bytes()
+                with self._lock:
+                    self._remember(ref, data)
+                return data
+
+        raise ArtifactNotFoundError(ref)
+
+    def get_text(self, ref: str) -> str:
+        """Resolve a reference to UTF-8 text."""
+        return self.get(ref).decode("utf-8")
+
+    def describe(self, ref: str) -> Dict[str, Any]:
+        """
+        Build the metadata that travels with a reference.
+
+        Returns:
+            dict: {"ref": str, "size_bytes": int}
+        """
+        return {"ref": ref, "size_bytes": len(self.get(ref))}
+
+    def __contains__(self, ref: str) -> bool:
+        with self._lock:
+            if ref in self._memory:
+                return True
+        return bool(self.directory and is_artifact_ref(ref) and self._path(ref).exists())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return memory usage and eviction counters."""
+        with self._lock:
+            return {
+                "memory_artifacts": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "directory": str(self.directory) if self.directory else None
+            }
+
+
+_default_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Return the process-wide artifact store, configured from the environment.
+
+    Returns:
+        ArtifactStore shared by all pipeline stages
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = ArtifactStore(
+            max_bytes=int(os.getenv("ARTIFACT_STORE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            directory=os.getenv("ARTIFACT_STORE_DIR") or None
+        )
+    return _default_store
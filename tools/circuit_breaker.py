@@ -0,0 +1,358 @@
+"""
+Circuit Breaker: Fast-fail for vendor calls while the vendor is down.
+
+Without a breaker every document waits for its own vendor call to time out
+before failing. The breaker watches vendor call outcomes and stops sending
+calls once the vendor looks unhealthy:
+
+    closed     Calls go through. Outcomes are kept in a sliding window; the
+               breaker opens when the error rate or the slow-call rate in the
+               window crosses its threshold.
+    open       Calls fail immediately. After open_seconds (or as soon as the
+               health prober sees the vendor again) the breaker half-opens.
+    half_open  A few trial calls go through. A success closes the breaker,
+               a failure opens it again.
+
+VendorHealthProber runs in the background, checks the vendor's /health
+endpoint and agent card, trips the breaker when they fail several times in a
+row and half-opens it when they recover.
+
+Breakers are kept per vendor URL (get_circuit_breaker). Configuration
+(environment):
+    VENDOR_BREAKER_WINDOW           Calls in the sliding window (default: 20)
+    VENDOR_BREAKER_MIN_CALLS        Calls before rates are evaluated (default: 5)
+    VENDOR_BREAKER_ERROR_RATE       Error rate that opens the breaker (default: 0.5)
+    VENDOR_BREAKER_SLOW_CALL_SECONDS  A call slower than this is slow (default: 60)
+    VENDOR_BREAKER_SLOW_CALL_RATE   Slow-call rate that opens the breaker (default: 0.8)
+    VENDOR_BREAKER_OPEN_SECONDS     Time before an open breaker half-opens (default: 30)
+    VENDOR_PROBE_INTERVAL           Seconds between health probes (default: 15)
+    VENDOR_PROBE_FAILURES           Consecutive failed probes that trip the breaker (default: 3)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker driven by error rate and latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 60.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Args:
+            name: Breaker name (the vendor URL) for logs and metrics
+            window_size: Number of recent calls the rates are computed over
+            min_calls: Calls needed in the window before the breaker can open
+            error_rate_threshold: Error rate (0-1) that opens the breaker
+            slow_call_seconds: Calls slower than this count as slow
+            slow_call_rate_threshold: Slow-call rate (0-1) that opens the breaker
+            open_seconds: Time an open breaker waits before half-opening
+            half_open_max_calls: Concurrent trial calls allowed when half-open
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._window = deque(maxlen=window_size)  # (failed, slow) per call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._open_count = 0
+        self._rejected_count = 0
+        self._last_reason = ""
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _transition(self, state: str, reason: str = "") -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker {self.name}: {self._state} -> {state} {reason}".rstrip())
+        self._state = state
+        self._trial_calls = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self._open_count += 1
+            self._last_reason = reason
+        elif state == CLOSED:
+            self._window.clear()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN, "(open timeout elapsed)")
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._current_state()
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker half-opens (0 if not open)."""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def allow_request(self) -> bool:
+        """
+        Return True if a call may be sent now.
+
+        Every allowed call must be followed by record_success(),
+        record_failure() or release(), which frees half-open trial slots.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            self._rejected_count += 1
+            return False
+
+    def record_success(self, latency_seconds: float = 0.0) -> None:
+        """Record a successful call and its latency."""
+        slow = latency_seconds >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if slow:
+                    self._transition(OPEN, f"(slow trial call: {latency_seconds:.1f}s)")
+                else:
+                    self._transition(CLOSED, "(trial call succeeded)")
+                return
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self, reason: str = "") -> None:
+        """Record a failed call."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN, f"(trial call failed: {reason})" if reason else "")
+                return
+            self._window.append((True, False))
+            self._evaluate()
+
+    def release(self) -> None:
+        """Release an allowed call without an outcome (e.g., it was cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def _evaluate(self) -> None:
+        if self._state != CLOSED or len(self._window) < self.min_calls:
+            return
+        calls = len(self._window)
+        error_rate = sum(failed for failed, _ in self._window) / calls
+        slow_rate = sum(slow for _, slow in self._window) / calls
+        if error_rate >= self.error_rate_threshold:
+            self._transition(OPEN, f"(error rate {error_rate:.0%} over {calls} calls)")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._transition(OPEN, f"(slow-call rate {slow_rate:.0%} over {calls} calls)")
+
+    # ------------------------------------------------------------------
+    # Health probe input
+    # ------------------------------------------------------------------
+
+    def trip(self, reason: str = "") -> None:
+        """Open the breaker now (e.g., the vendor failed a health probe)."""
+        with self._lock:
+            if self._state == OPEN:
+                self._opened_at = time.monotonic()
+            else:
+                self._transition(OPEN, f"({reason})" if reason else "")
+
+    def probe_succeeded(self) -> None:
+        """Half-open an open breaker early: the vendor answered a health probe."""
+        with self._lock:
+            if self._state == OPEN:
+                self._transition(HALF_OPEN, "(health probe succeeded)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return state and counters for metrics."""
+        with self._lock:
+            calls = len(self._window)
+            return {
+                "name": self.name,
+                "state": self._current_state(),
+                "window_calls": calls,
+                "error_rate": (sum(f for f, _ in self._window) / calls) if calls else 0.0,
+                "slow_call_rate": (sum(s for _, s in self._window) / calls) if calls else 0.0,
+                "times_opened": self._open_count,
+                "rejected_calls": self._rejected_count,
+                "last_open_reason": self._last_reason,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the circuit breaker for a vendor URL, creating it on first use.
+
+    Args:
+        name: Vendor base URL
+
+    Returns:
+        CircuitBreaker configured from the environment
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                window_size=int(os.getenv("VENDOR_BREAKER_WINDOW", "20")),
+                min_calls=int(os.getenv("VENDOR_BREAKER_MIN_CALLS", "5")),
+                error_rate_threshold=float(os.getenv("VENDOR_BREAKER_ERROR_RATE", "0.5")),
+                slow_call_seconds=float(os.getenv("VENDOR_BREAKER_SLOW_CALL_SECONDS", "60")),
+                slow_call_rate_threshold=float(os.getenv("VENDOR_BREAKER_SLOW_CALL_RATE", "0.8")),
+                open_seconds=float(os.getenv("VENDOR_BREAKER_OPEN_SECONDS", "30")),
+            )
+        return breaker
+
+
+class VendorHealthProber:
+    """
+    Background task that probes the vendor and feeds its circuit breaker.
+
+    Each probe checks GET /health and revalidates the agent card. Probes
+    that fail failure_threshold times in a row trip the breaker, so a single
+    dropped probe does not park every document; a successful probe resets
+    the count and half-opens an open breaker, so the next call is a trial
+    call instead of waiting for the timeout.
+
+    Example:
+        prober = VendorHealthProber(vendor_url, client)
+        prober.start()
+        ...
+        await prober.stop()
+    """
+
+    def __init__(
+        self,
+        vendor_url: str,
+        client: httpx.AsyncClient,
+        breaker: Optional[CircuitBreaker] = None,
+        interval: Optional[float] = None,
+        card_path: str = "/.well-known/agent-card.json",
+        timeout: float = 5.0,
+        failure_threshold: Optional[int] = None
+    ):
+        """
+        Args:
+            vendor_url: Vendor base URL
+            client: HTTP client for the probes
+            breaker: Breaker to feed (default: get_circuit_breaker(vendor_url))
+            interval: Seconds between probes (default: VENDOR_PROBE_INTERVAL or 15)
+            card_path: Agent card path
+            timeout: Probe timeout in seconds
+            failure_threshold: Consecutive failed probes that trip the breaker
+                (default: VENDOR_PROBE_FAILURES or 3)
+        """
+        self.vendor_url = vendor_url
+        self.client = client
+        self.breaker = breaker or get_circuit_breaker(vendor_url)
+        self.interval = interval or float(os.getenv("VENDOR_PROBE_INTERVAL", "15"))
+        self.card_path = card_path
+        self.timeout = timeout
+        self.failure_threshold = max(1, failure_threshold or int(os.getenv("VENDOR_PROBE_FAILURES", "3")))
+        self._consecutive_failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self) -> bool:
+        """
+        Probe the vendor once and update the breaker.
+
+        Returns:
+            bool: True if /health and the agent card both answered
+        """
+        try:
+            health = await self.client.get(f"{self.vendor_url}/health", timeout=self.timeout)
+            card = await self.client.get(
+                f"{self.vendor_url}{self.card_path}",
+                headers={"Cache-Control": "no-cache"},
+                timeout=self.timeout
+            )
+            healthy = health.status_code == 200 and card.status_code == 200
+            reason = f"health {health.status_code}, agent card {card.status_code}"
+        except httpx.HTTPError as e:
+            healthy = False
+            reason = str(e) or type(e).__name__
+
+        if healthy:
+            self._consecutive_failures = 0
+            self.breaker.probe_succeeded()
+            return True
+
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            self.breaker.trip(
+                f"health probe failed {self._consecutive_failures} times in a row: {reason}"
+            )
+        else:
+            logger.info(
+                f"Health probe of {self.vendor_url} failed "
+                f"({self._consecutive_failures}/{self.failure_threshold}): {reason}"
+            )
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                # Keep probing: a dead prober would leave the breaker open for good
+                logger.warning(f"Health probe of {self.vendor_url} raised: {e!r}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start probing in the background (requires a running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,261 @@
+"""
+Concurrency Limiter: Adaptive (AIMD) cap on concurrent vendor calls.
+
+Nothing used to limit how many translation calls were in flight, so a batch
+burst went straight to the vendor and came back as 429s and OpenAI rate
+limits. The limiter sits in front of each vendor endpoint and adapts its
+limit the way TCP adapts its congestion window:
+
+- additive increase: every call that completes at normal latency while the
+  limit is actually in use grows the limit by 1/limit (about +1 per "round"
+  of calls)
+- multiplicative decrease: an overload signal multiplies the limit by the
+  backoff factor. Overload signals are a dropped call (429, 5xx, timeout,
+  connection error) or a call whose latency is above latency_tolerance times
+  the baseline latency
+- the limit stays between a floor and a ceiling
+
+Translation latency grows with document length, so latency is compared per
+1,000 characters against a baseline: the median of the last BASELINE_WINDOW
+calls. The median ignores the occasional very fast call (translation memory
+hits) and follows a vendor that got permanently slower; no single sample can
+move it. Responses served from the vendor's translation cache say nothing
+about its load and are left out. Only one decrease is applied per round:
+calls that started before the last decrease report on the old limit and are
+not counted again.
+
+Calls over the limit wait in a FIFO queue. snapshot() exposes the current
+limit, in-flight calls and queue depth; queue wait times are recorded in the
+"vendor.queue_wait" timing histogram.
+
+Limiters are kept per vendor URL (get_concurrency_limiter). Configuration
+(environment):
+    VENDOR_CONCURRENCY_INITIAL            Starting limit (default: 4)
+    VENDOR_CONCURRENCY_MIN                Floor (default: 1)
+    VENDOR_CONCURRENCY_MAX                Ceiling (default: 32)
+    VENDOR_CONCURRENCY_BACKOFF            Decrease factor (default: 0.5)
+    VENDOR_CONCURRENCY_LATENCY_TOLERANCE  Latency/baseline ratio treated as
+                                          overload (default: 2.0)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import statistics
+from collections import deque
+from typing import Any, Dict, Optional
+
+from observability.timing import record
+
+logger = logging.getLogger(__name__)
+
+# Calls whose normalized latency forms the baseline (their median)
+BASELINE_WINDOW = 100
+
+# Calls needed before latency can signal overload
+BASELINE_MIN_SAMPLES = 5
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit with a FIFO wait queue.
+
+    Example:
+        limiter = get_concurrency_limiter(vendor_url)
+        acquired_at = await limiter.acquire()
+        try:
+            result = await call()
+        except OverloadError:
+            limiter.release(acquired_at, dropped=True)
+            raise
+        limiter.release(acquired_at, latency=elapsed)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        """
+        Args:
+            name: Limiter name (the vendor URL) for logs and metrics
+            initial_limit: Starting concurrency limit
+            min_limit: Floor of the limit
+            max_limit: Ceiling of the limit
+            backoff: Factor applied to the limit on overload (0-1)
+            latency_tolerance: Normalized latency above this multiple of the
+                baseline counts as overload
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._samples: deque = deque(maxlen=BASELINE_WINDOW)  # seconds per size unit
+        self._last_decrease = 0.0
+        self._increases = 0
+        self._decreases = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a slot."""
+        return len(self._waiters)
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot.
+
+        Every acquire() must be followed by exactly one release().
+
+        Returns:
+            Acquisition time (time.monotonic()), to pass to release()
+        """
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return time.monotonic()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        queued_at = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted a slot while being cancelled: hand it on
+                    self._in_flight -= 1
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+            raise
+        record("vendor.queue_wait", time.perf_counter() - queued_at)
+        return time.monotonic()
+
+    def release(
+        self,
+        acquired_at: float,
+        latency: Optional[float] = None,
+        dropped: bool = False,
+        size: float = 1.0
+    ) -> None:
+        """
+        Free a slot and feed the call's outcome into the limit.
+
+        Args:
+            acquired_at: Value returned by acquire()
+            latency: Call latency in seconds (None: no latency signal, e.g.
+                the call was cancelled, rejected as invalid or served from
+                the vendor's cache)
+            dropped: The call failed from overload (429, 5xx, timeout)
+            size: Size units of the call (e.g., thousands of characters)
+                used to normalize latency
+        """
+        with self._lock:
+            in_use = self._in_flight >= self._limit / 2
+            self._in_flight -= 1
+
+            overloaded = dropped
+            if latency is not None and not dropped:
+                per_unit = latency / max(size, 1.0)
+                baseline = self._baseline()
+                overloaded = baseline is not None and per_unit > self.latency_tolerance * baseline
+                self._samples.append(per_unit)
+
+            if overloaded:
+                # One decrease per round: older calls saw the previous limit
+                if acquired_at >= self._last_decrease:
+                    self._decrease("dropped call" if dropped else f"latency {latency:.1f}s")
+            elif latency is not None and in_use:
+                self._increase()
+            self._wake()
+
+    def _baseline(self) -> Optional[float]:
+        if len(self._samples) < BASELINE_MIN_SAMPLES:
+            return None
+        return statistics.median(self._samples)
+
+    def _increase(self) -> None:
+        if self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            self._increases += 1
+
+    def _decrease(self, reason: str) -> None:
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        self._last_decrease = time.monotonic()
+        self._decreases += 1
+        if self.limit != previous:
+            logger.info(f"Vendor concurrency {self.name}: {previous} -> {self.limit} ({reason})")
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the limit, in-flight calls, queue depth and counters for metrics."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiters),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "baseline_ms_per_unit": round((self._baseline() or 0.0) * 1000, 1),
+                "increases": self._increases,
+                "decreases": self._decreases,
+            }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    """
+    Return the concurrency limiter for a vendor URL, creating it on first use.
+
+    Args:
+        name: Vendor base URL
+
+    Returns:
+        AdaptiveConcurrencyLimiter configured from the environment
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = AdaptiveConcurrencyLimiter(
+                name,
+                initial_limit=int(os.getenv("VENDOR_CONCURRENCY_INITIAL", "4")),
+                min_limit=int(os.getenv("VENDOR_CONCURRENCY_MIN", "1")),
+                max_limit=int(os.getenv("VENDOR_CONCURRENCY_MAX", "32")),
+                backoff=float(os.getenv("VENDOR_CONCURRENCY_BACKOFF", "0.5")),
+                latency_tolerance=float(os.getenv("VENDOR_CONCURRENCY_LATENCY_TOLERANCE", "2.0")),
+            )
+        return limiter
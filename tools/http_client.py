@@ -0,0 +1,165 @@
+"""
+HTTP Client: Shared pooled async client for the A2A vendor connection.
+
+Every call to the vendor used to open its own connection: RemoteA2aAgent
+instances created their own httpx clients, probes used requests, and each
+direct translation call created a fresh httpx.AsyncClient. For small
+documents the TCP and TLS handshakes to the Render-hosted vendor were a large
+share of the latency.
+
+This module keeps ONE httpx.AsyncClient per process with:
+- a bounded connection pool with keep-alive
+- HTTP/2 when the h2 package is installed (multiplexes concurrent vendor
+  calls over one TLS connection), HTTP/1.1 keep-alive otherwise
+- separate connect and read timeouts
+- agent card requests answered by the agent card cache
+  (tools.agent_card_cache)
+- compressed request bodies (gzip, or zstd when the zstandard package is
+  installed) when the vendor's agent card advertises the encoding under
+  metadata.content_encodings; compressed responses are decoded by httpx
+
+The vendor agent, the connectivity probe and translate_via_vendor all use it.
+
+Configuration (environment):
+    VENDOR_HTTP2                   Use HTTP/2 if available (default: true)
+    VENDOR_HTTP_MAX_CONNECTIONS    Pool size (default: 20)
+    VENDOR_HTTP_MAX_KEEPALIVE      Idle connections kept open (default: 10)
+    VENDOR_HTTP_KEEPALIVE_EXPIRY   Idle connection lifetime in seconds (default: 60)
+    VENDOR_HTTP_CONNECT_TIMEOUT    Connect timeout in seconds (default: 10)
+    VENDOR_TIMEOUT_SECONDS         Read timeout in seconds (default: 120)
+    VENDOR_REQUEST_COMPRESSION     auto, gzip, zstd or off (default: auto - the
+                                   best encoding both sides support)
+    VENDOR_COMPRESSION_MIN_BYTES   Smallest request body worth compressing (default: 1024)
+"""
+
+import os
+import zlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: gzip only
+    zstandard = None
+
+from .agent_card_cache import AgentCardCacheTransport, get_agent_card_cache
+
+logger = logging.getLogger(__name__)
+
+# Well-known agent card path (matches ADK's AGENT_CARD_WELL_KNOWN_PATH)
+AGENT_CARD_PATH = "/.well-known/agent-card.json"
+
+# Translation can take a while for long documents (OpenAI call on the vendor)
+DEFAULT_VENDOR_TIMEOUT = float(os.getenv("VENDOR_TIMEOUT_SECONDS", "120"))
+
+COMPRESSION_MIN_BYTES = int(os.getenv("VENDOR_COMPRESSION_MIN_BYTES", "1024"))
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_vendor_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled vendor HTTP client configured from the environment.
+
+    Returns:
+        httpx.AsyncClient with connection limits, timeouts and the agent
+        card cache installed
+    """
+    http2 = os.getenv("VENDOR_HTTP2", "true").lower() in ("1", "true", "yes")
+    if http2 and not _http2_available():
+        logger.info("h2 not installed - vendor connection uses HTTP/1.1 keep-alive")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("VENDOR_HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("VENDOR_HTTP_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("VENDOR_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+    timeout = httpx.Timeout(
+        DEFAULT_VENDOR_TIMEOUT,
+        connect=float(os.getenv("VENDOR_HTTP_CONNECT_TIMEOUT", "10")),
+    )
+
+    transport = AgentCardCacheTransport(
+        get_agent_card_cache(),
+        card_path=AGENT_CARD_PATH,
+        transport=httpx.AsyncHTTPTransport(http2=http2, limits=limits),
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+def get_vendor_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide vendor HTTP client, creating it on first use.
+
+    Returns:
+        Shared httpx.AsyncClient (do not close it - see close_vendor_http_client)
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_vendor_http_client()
+    return _client
+
+
+async def close_vendor_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def supported_request_encodings() -> List[str]:
+    """Request body encodings this client can produce, best first."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def choose_request_encoding(agent_card: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Pick the request body encoding for a vendor.
+
+    Args:
+        agent_card: The vendor's agent card (None if not known yet)
+
+    Returns:
+        An encoding the vendor advertises and VENDOR_REQUEST_COMPRESSION
+        allows, or None to send the body uncompressed
+    """
+    setting = os.getenv("VENDOR_REQUEST_COMPRESSION", "auto").lower()
+    if setting in ("off", "none", "false", "0"):
+        return None
+    metadata = (agent_card or {}).get("metadata") or {}
+    advertised = (metadata.get("content_encodings") or {}).get("request") or []
+    for encoding in supported_request_encodings():
+        if encoding in advertised and setting in ("auto", encoding):
+            return encoding
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a request body.
+
+    Args:
+        body: Raw body
+        encoding: "gzip" or "zstd"
+
+    Returns:
+        Compressed body for the Content-Encoding header value encoding
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return compressor.compress(body) + compressor.flush()
+    raise ValueError(f"Unsupported encoding: {encoding}")
@@ -10,7 +10,10 @@ For the Capstone POC, it reads from a sample document file to demonstrate the wo
 
 import os
 
+from observability.timing import timed
 
+
+@timed("tool.ocr_tool")
 def ocr_tool(document_path: str) -> dict:
     """
     Extract text from a document using OCR.
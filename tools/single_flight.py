@@ -0,0 +1,100 @@
+"""
+Single Flight: Coalesce concurrent identical async calls.
+
+Masked boilerplate documents (template forms with every PII field masked)
+produce byte-identical vendor requests, often at the same moment in a batch.
+SingleFlight lets the first caller for a key make the call while concurrent
+callers with the same key wait for and share its outcome - one billable
+vendor call instead of several.
+
+Only calls that are in flight at the same time are coalesced; nothing is
+cached after the call completes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def request_key(*parts: Any) -> str:
+    """Return a stable hash of JSON-serializable request parts."""
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The shared call keeps running while at least one caller waits for it; if
+    every caller is cancelled, the call is cancelled too. Errors are shared
+    like results.
+
+    Example:
+        flights = SingleFlight()
+        result = await flights.do(key, lambda: translate(...))
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._calls = 0
+        self._coalesced = 0
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Request key (see request_key)
+            fn: Coroutine function making the call
+
+        Returns:
+            The shared call's result
+        """
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+            with self._lock:
+                self._calls += 1
+        else:
+            with self._lock:
+                self._coalesced += 1
+            logger.debug(f"Coalesced request {key[:12]} with an in-flight call")
+
+        self._waiters[task] += 1
+        try:
+            # shield: one cancelled caller must not cancel the others' call
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(task) == 1:
+                task.cancel()
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        self._waiters.pop(task, None)
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return call counts: calls made, calls coalesced, calls in flight."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._flights),
+            }
@@ -15,15 +15,126 @@ For this POC, it points to a local simulation running on localhost:8001.
 """
 
 import os
+import json
+import time
+from typing import List, Optional, Tuple
+
+import httpx
 from google.adk.agents.remote_a2a_agent import (
     RemoteA2aAgent,
     AGENT_CARD_WELL_KNOWN_PATH
 )
 
+from observability.timing import timed
+from .agent_card_cache import get_agent_card_cache
+from .http_client import (
+    COMPRESSION_MIN_BYTES,
+    compress_body,
+    choose_request_encoding,
+    get_vendor_http_client
+)
+from .circuit_breaker import CircuitBreaker, get_circuit_breaker
+from .concurrency_limiter import get_concurrency_limiter
+from .vendor_router import VendorRouter
+from .single_flight import SingleFlight, request_key
+
+
+class VendorError(RuntimeError):
+    """Raised when the vendor rejects or fails a translation request."""
+
+
+class VendorRequestError(VendorError):
+    """Raised when the vendor rejects the request itself (4xx other than 429)."""
+
+
+class VendorUnavailableError(VendorError):
+    """
+    Raised without calling the vendor while its circuit breaker is open.
+
+    Callers should park the document and retry after retry_after seconds
+    instead of waiting for a call that will time out.
+    """
+
+    def __init__(self, vendor_url: str, retry_after: float = 0.0):
+        super().__init__(
+            f"Vendor unavailable (circuit open): {vendor_url}, "
+            f"retry after {retry_after:.0f}s"
+        )
+        self.vendor_url = vendor_url
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return (type(self), (self.vendor_url, self.retry_after))
+
+
+def get_vendor_url(vendor_host: str = None, vendor_port: int = None) -> str:
+    """
+    Build the vendor base URL from arguments or environment.
+
+    Args:
+        vendor_host: Vendor server hostname (default: from env or localhost)
+        vendor_port: Vendor server port (default: from env or 8001)
+
+    Returns:
+        str: Vendor base URL (HTTPS without explicit port for port 443)
+    """
+    host = vendor_host or os.getenv("VENDOR_SERVER_HOST", "localhost")
+    port = vendor_port or int(os.getenv("VENDOR_SERVER_PORT", "8001"))
+
+    # Use HTTPS for port 443 (and don't include the port in the URL)
+    if port == 443:
+        return f"https://{host}"
+    return f"http://{host}:{port}"
+
+
+def get_vendor_endpoints() -> List[str]:
+    """
+    Return the vendor replica base URLs.
+
+    Returns:
+        list: URLs from VENDOR_ENDPOINTS (comma-separated), or the single
+            URL from VENDOR_SERVER_HOST/PORT
+    """
+    endpoints = [
+        url.strip().rstrip("/")
+        for url in os.getenv("VENDOR_ENDPOINTS", "").split(",")
+        if url.strip()
+    ]
+    return endpoints or [get_vendor_url()]
+
+
+_routers = {}
+
+# Concurrent identical translation requests share one vendor call
+_translation_flights = SingleFlight()
+
+
+def get_vendor_router(endpoints: Optional[List[str]] = None) -> VendorRouter:
+    """
+    Return the process-wide router for a set of vendor endpoints.
+
+    Args:
+        endpoints: Vendor base URLs (default: get_vendor_endpoints())
+
+    Returns:
+        VendorRouter shared by all calls to these endpoints
+    """
+    endpoints = endpoints or get_vendor_endpoints()
+    key = tuple(endpoints)
+    if key not in _routers:
+        _routers[key] = VendorRouter(
+            endpoints,
+            alpha=float(os.getenv("VENDOR_EWMA_ALPHA", "0.3")),
+            hedge_percentile=float(os.getenv("VENDOR_HEDGE_PERCENTILE", "95")),
+            hedge_budget=float(os.getenv("VENDOR_HEDGE_BUDGET", "0.1"))
+        )
+    return _routers[key]
+
 
 def create_remote_vendor_agent(
     vendor_host: str = None,
-    vendor_port: int = None
+    vendor_port: int = None,
+    endpoints: Optional[List[str]] = None
 ) -> RemoteA2aAgent:
     """
     Create a RemoteA2aAgent connected to Docs Translator vendor.
@@ -34,30 +145,37 @@ def create_remote_vendor_agent(
     - Translates sub-agent calls into A2A protocol requests
     - Handles HTTP communication transparently
     - Returns responses in ADK format
-    
+
+    The agent uses the shared pooled vendor HTTP client (tools.http_client),
+    so its calls reuse connections, and its agent card is served from the
+    agent card cache (tools.agent_card_cache).
+
+    A RemoteA2aAgent talks to one endpoint. With several vendor replicas
+    (endpoints or VENDOR_ENDPOINTS), the agent is bound to the replica the
+    vendor router currently prefers; translate_via_vendor routes every call.
+
     Args:
         vendor_host: Vendor server hostname (default: from env or localhost)
         vendor_port: Vendor server port (default: from env or 8001)
-    
+        endpoints: Vendor replica base URLs (default: VENDOR_ENDPOINTS;
+            ignored if vendor_host or vendor_port is given)
+
     Returns:
         RemoteA2aAgent: Configured connection to Docs Translator vendor
     """
     # Get vendor configuration from environment or use defaults
-    host = vendor_host or os.getenv("VENDOR_SERVER_HOST", "localhost")
-    port = vendor_port or int(os.getenv("VENDOR_SERVER_PORT", "8001"))
-
-    # Construct vendor URL (use HTTPS for port 443, HTTP otherwise)
-    protocol = "https" if port == 443 else "http"
-
-    # For HTTPS (port 443), don't include port in URL
-    if port == 443:
-        vendor_url = f"{protocol}://{host}"
+    if vendor_host or vendor_port:
+        endpoints = [get_vendor_url(vendor_host, vendor_port)]
     else:
-        vendor_url = f"{protocol}://{host}:{port}"
+        endpoints = endpoints or get_vendor_endpoints()
+    vendor_url = get_vendor_router(endpoints).choose().url
+    protocol = vendor_url.split("://", 1)[0]
 
     agent_card_url = f"{vendor_url}{AGENT_CARD_WELL_KNOWN_PATH}"
 
     print(f"\n[A2A Connector] Configuring remote vendor connection:")
+    if len(endpoints) > 1:
+        print(f"    Replicas: {len(endpoints)} (routed to the preferred one)")
     print(f"    Vendor URL: {vendor_url}")
     print(f"    Agent Card: {agent_card_url}")
     print(f"    Protocol: A2A over {protocol.upper()}")
@@ -78,52 +196,260 @@ def create_remote_vendor_agent(
         Security Note: This is an EXTERNAL vendor. All data sent must be
         pre-filtered for PII. All responses must be post-verified.
         """,
-        agent_card=agent_card_url
+        agent_card=agent_card_url,
+        httpx_client=get_vendor_http_client()
     )
 
     # Store the agent_card_url as an attribute for testing
     remote_vendor._test_agent_card_url = agent_card_url
+    # Vendor base URL, used to look up the vendor's circuit breaker
+    remote_vendor._vendor_url = vendor_url
+    remote_vendor._vendor_endpoints = endpoints
 
     print(f"    ✓ Remote agent configured: {remote_vendor.name}")
 
     return remote_vendor
 
 
-def test_vendor_connection(vendor_agent: RemoteA2aAgent) -> bool:
+async def test_vendor_connection(vendor_agent: RemoteA2aAgent) -> bool:
     """
     Test if the vendor A2A server is reachable.
 
+    Always makes a request: a cached card is revalidated with If-None-Match,
+    so the cache only saves the body (an unchanged card costs a 304), never
+    the round-trip. A failed check opens the vendor's circuit breaker, so
+    documents are parked instead of waiting on the vendor.
+
     Args:
         vendor_agent: RemoteA2aAgent to test
 
     Returns:
         bool: True if vendor is reachable, False otherwise
     """
-    import requests
+    # Extract agent card URL from the agent
+    agent_card_url = getattr(vendor_agent, '_test_agent_card_url', None)
+    if not agent_card_url:
+        print("    ✗ Agent card URL not available")
+        return False
+
+    print(f"\n[A2A Test] Checking vendor availability...")
+    print(f"    Testing: {agent_card_url}")
 
     try:
-        # Extract agent card URL from the agent
-        agent_card_url = getattr(vendor_agent, '_test_agent_card_url', None)
-        if not agent_card_url:
-            print("    ✗ Agent card URL not available")
-            return False
-        
-        print(f"\n[A2A Test] Checking vendor availability...")
-        print(f"    Testing: {agent_card_url}")
-        
-        # Try to fetch the agent card
-        response = requests.get(agent_card_url, timeout=5)
-        
-        if response.status_code == 200:
-            print(f"    ✓ Vendor is reachable")
-            print(f"    ✓ Agent card retrieved successfully")
-            return True
-        else:
-            print(f"    ✗ Vendor returned status: {response.status_code}")
-            return False
-            
-    except requests.exceptions.RequestException as e:
-        print(f"    ✗ Vendor not reachable: {str(e)}")
+        # no-cache: revalidate with the vendor, never answer from a stale copy
+        response = await get_vendor_http_client().get(
+            agent_card_url,
+            headers={"Cache-Control": "no-cache"},
+            timeout=5
+        )
+    except httpx.HTTPError as e:
+        print(f"    ✗ Vendor not reachable: {str(e) or type(e).__name__}")
         print(f"    → Make sure vendor server is running:")
         print(f"       python vendor/vendor_server.py")
+        _trip_breaker(vendor_agent, "connectivity check failed")
+        return False
+
+    if response.status_code != 200:
+        print(f"    ✗ Vendor returned status: {response.status_code}")
+        _trip_breaker(vendor_agent, f"agent card status {response.status_code}")
         return False
+
+    print(f"    ✓ Vendor is reachable")
+    print(f"    ✓ Agent card retrieved successfully")
+    return True
+
+
+def _trip_breaker(vendor_agent: RemoteA2aAgent, reason: str) -> None:
+    vendor_url = getattr(vendor_agent, '_vendor_url', None)
+    if vendor_url:
+        get_circuit_breaker(vendor_url).trip(reason)
+
+
+async def _invoke(vendor_url: str, payload: dict, timeout: Optional[float]) -> dict:
+    """
+    POST one A2A request to one vendor endpoint, through its circuit breaker
+    and adaptive concurrency limiter.
+    """
+    breaker = get_circuit_breaker(vendor_url)
+    if not breaker.allow_request():
+        raise VendorUnavailableError(vendor_url, breaker.retry_after())
+
+    limiter = get_concurrency_limiter(vendor_url)
+    try:
+        acquired_at = await limiter.acquire()
+    except BaseException:
+        breaker.release()
+        raise
+
+    start = time.perf_counter()
+    try:
+        result, cached = await _post(vendor_url, payload, timeout, breaker)
+    except VendorRequestError:
+        limiter.release(acquired_at)
+        raise
+    except (VendorError, httpx.HTTPError):
+        # 429, 5xx, timeouts and failed translations: back off
+        limiter.release(acquired_at, dropped=True)
+        raise
+    except BaseException:
+        limiter.release(acquired_at)
+        raise
+    if cached:
+        # Served from the vendor's translation cache: no load signal
+        limiter.release(acquired_at)
+        return result
+    # Latency is compared per 1,000 characters of source text
+    size = len(payload["parameters"]["text"]) / 1000
+    limiter.release(acquired_at, latency=time.perf_counter() - start, size=size)
+    return result
+
+
+async def _post(
+    vendor_url: str,
+    payload: dict,
+    timeout: Optional[float],
+    breaker: CircuitBreaker
+) -> Tuple[dict, bool]:
+    """POST the request; return the A2A result and whether the vendor served it from its cache."""
+    client = get_vendor_http_client()
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    encoding = None
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        card = get_agent_card_cache().cached_card(f"{vendor_url}{AGENT_CARD_WELL_KNOWN_PATH}")
+        encoding = choose_request_encoding(card)
+    start = time.perf_counter()
+    try:
+        response = await client.post(
+            f"{vendor_url}/invoke",
+            content=compress_body(body, encoding) if encoding else body,
+            headers={**headers, "Content-Encoding": encoding} if encoding else headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+        if response.status_code == 415 and encoding:
+            # The vendor stopped accepting the advertised encoding (e.g., a
+            # redeploy behind a stale cached card): resend uncompressed
+            response = await client.post(
+                f"{vendor_url}/invoke",
+                content=body,
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+            )
+    except httpx.HTTPError as e:
+        breaker.record_failure(str(e) or type(e).__name__)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+
+    if response.status_code != 200:
+        message = f"Vendor returned status {response.status_code}: {response.text[:200]}"
+        # 4xx means our request was rejected, not that the vendor is unhealthy
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure(f"status {response.status_code}")
+            raise VendorError(message)
+        breaker.record_success(time.perf_counter() - start)
+        raise VendorRequestError(message)
+
+    try:
+        body = response.json()
+    except ValueError as e:
+        breaker.record_failure("invalid response body")
+        raise VendorError(f"Vendor returned an invalid response: {e}") from e
+
+    if body.get("status") != "success":
+        breaker.record_failure("translation failed")
+        raise VendorError(f"Vendor translation failed: {body.get('error')}")
+
+    breaker.record_success(time.perf_counter() - start)
+    cached = response.headers.get("X-Translation-Cache", "").lower() == "hit"
+    return body["result"], cached
+
+
+@timed("vendor.translate_document")
+async def translate_via_vendor(
+    text: str,
+    source_language: str,
+    target_language: str,
+    document_type: str = "general",
+    vendor_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+    hedge: Optional[bool] = None
+) -> dict:
+    """
+    Call the vendor's translate_document capability directly over HTTP.
+
+    This is the code-orchestrated counterpart of delegating to the
+    RemoteA2aAgent: it posts an A2A request to the vendor's /invoke endpoint
+    without an ADK session, so batch runners can call the vendor from plain
+    coroutines. Requests share the pooled vendor HTTP client, so concurrent
+    calls reuse warm connections.
+
+    Without vendor_url, the call is routed across the vendor replicas
+    (VENDOR_ENDPOINTS) by the vendor router and fails over to another replica
+    if it fails. Each endpoint has its own circuit breaker: while it is open,
+    calls to it fail immediately with VendorUnavailableError. With hedging,
+    a call slower than the recent-latency percentile is duplicated to a
+    second replica and the slower request is cancelled (see
+    tools.vendor_router).
+
+    Concurrent calls with the same masked text, languages and document type
+    share one in-flight vendor call (tools.single_flight), unless
+    VENDOR_COALESCE is disabled.
+
+    The text MUST already be PII-filtered - this is the A2A boundary.
+
+    Args:
+        text: Masked document text
+        source_language: Source language code (e.g., "es")
+        target_language: Target language code (e.g., "en")
+        document_type: Type of document (birth_certificate, passport, general)
+        vendor_url: Call only this vendor base URL (default: route across
+            get_vendor_endpoints())
+        timeout: Request timeout in seconds (default: the client's timeouts,
+            see VENDOR_TIMEOUT_SECONDS)
+        hedge: Hedge slow calls across replicas (default: VENDOR_HEDGE env)
+
+    Returns:
+        dict: A2A result (translated_text, word_count, confidence, ...)
+
+    Raises:
+        VendorUnavailableError: If every endpoint's circuit breaker is open
+        VendorRequestError: If the vendor rejects the request (no failover)
+        VendorError: If the vendor returns an error response
+        httpx.HTTPError: If the vendor cannot be reached
+    """
+    payload = {
+        "capability": "translate_document",
+        "parameters": {
+            "text": text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "document_type": document_type
+        }
+    }
+
+    if hedge is None:
+        hedge = os.getenv("VENDOR_HEDGE", "false").lower() in ("1", "true", "yes")
+
+    async def call() -> dict:
+        if vendor_url:
+            return await _invoke(vendor_url, payload, timeout)
+        return await get_vendor_router().call(
+            lambda url: _invoke(url, payload, timeout),
+            is_retryable=lambda e: not isinstance(e, VendorRequestError),
+            hedge=hedge,
+            size=len(text) / 1000
+        )
+
+    if os.getenv("VENDOR_COALESCE", "true").lower() not in ("1", "true", "yes"):
+        return await call()
+
+    key = request_key(text, source_language, target_language, document_type)
+    # Each caller gets its own copy: the runner pops fields from the result
+    return dict(await _translation_flights.do(key, call))
+
+
+def get_translation_flight_stats() -> dict:
+    """Return vendor call coalescing counters (calls, coalesced, in_flight)."""
+    return _translation_flights.stats()
@@ -0,0 +1,304 @@
+"""
+Vendor Router: Latency-aware routing across vendor replicas.
+
+With several docs-translator-a2a replicas, each translation call is routed
+to the replica that currently looks best, and fails over to another replica
+when the call fails:
+
+- Per endpoint, an exponentially weighted moving average (EWMA) of latency
+  per size unit (1,000 characters) and error rate, plus the number of calls
+  in flight. Normalizing by size keeps a replica that happened to get long
+  documents from looking slow
+- Power-of-two-choices: pick two random candidates and take the one with
+  the lower cost. This spreads load nearly as well as always picking the
+  best endpoint, without every client stampeding onto the same replica
+- Endpoints whose circuit breaker is open are only used when nothing else
+  is left (their calls fail fast with VendorUnavailableError)
+- On a retryable failure the call is retried on an endpoint not tried yet
+
+Hedged requests (opt-in): translation latency has a heavy tail, so a few
+slow calls dominate p99. With hedge=True, a call that has not answered
+within the hedge percentile of recent latencies is sent again to a second
+replica. Latency grows with document length, so latencies are kept per
+size unit (as in the concurrency limiter) and the hedge delay is scaled by the call's size: long documents are not hedged just for
+being long. The first success wins and the other request is cancelled.
+Hedges are capped at hedge_budget extra requests per call (e.g., 0.1 = at
+most 10% more load), and only start once enough latency samples exist.
+
+Configuration (environment):
+    VENDOR_ENDPOINTS         Comma-separated vendor base URLs
+                             (default: the single VENDOR_SERVER_HOST/PORT URL)
+    VENDOR_EWMA_ALPHA        Weight of the newest sample (default: 0.3)
+    VENDOR_HEDGE             Hedge translate_document calls (default: false)
+    VENDOR_HEDGE_PERCENTILE  Latency percentile that triggers a hedge (default: 95)
+    VENDOR_HEDGE_BUDGET      Max extra requests per call, 0-1 (default: 0.1)
+"""
+
+import math
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .circuit_breaker import OPEN, get_circuit_breaker
+from .concurrency_limiter import get_concurrency_limiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cost of a failed call, in seconds of latency (roughly a retry on another
+# replica after a slow failure)
+ERROR_PENALTY_SECONDS = 10.0
+
+
+class EndpointStats:
+    """
+    Moving averages for one vendor endpoint.
+    """
+
+    def __init__(self, url: str, alpha: float = 0.3):
+        self.url = url
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None  # seconds per size unit
+        self.error_ewma = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def breaker(self):
+        return get_circuit_breaker(self.url)
+
+    def cost(self) -> float:
+        """
+        Routing cost: expected latency plus an error penalty, scaled by load.
+
+        An endpoint without latency samples starts near zero, so new replicas
+        get tried; the 1 ms floor keeps in-flight load counting for them.
+        """
+        latency = self.latency_ewma if self.latency_ewma is not None else 0.0
+        expected = latency + ERROR_PENALTY_SECONDS * self.error_ewma + 0.001
+        return expected * (1 + self.in_flight)
+
+    def record(self, latency: Optional[float], ok: bool) -> None:
+        self.calls += 1
+        self.error_ewma += self.alpha * ((0.0 if ok else 1.0) - self.error_ewma)
+        if not ok:
+            self.failures += 1
+        if latency is not None:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma += self.alpha * (latency - self.latency_ewma)
+
+    def snapshot(self) -> Dict[str, Any]:
+        limiter = get_concurrency_limiter(self.url)
+        return {
+            "url": self.url,
+            "latency_ewma_ms": round((self.latency_ewma or 0.0) * 1000, 1),
+            "error_rate_ewma": round(self.error_ewma, 3),
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "breaker": self.breaker.state,
+            "concurrency_limit": limiter.limit,
+            "queue_depth": limiter.queue_depth,
+        }
+
+
+class VendorRouter:
+    """
+    Route calls across vendor endpoints with power-of-two-choices and failover.
+
+    Example:
+        router = VendorRouter(["https://a.example", "https://b.example"])
+        result = await router.call(lambda url: invoke(url, payload))
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        alpha: float = 0.3,
+        hedge_percentile: float = 95.0,
+        hedge_budget: float = 0.1,
+        hedge_min_samples: int = 20
+    ):
+        """
+        Args:
+            endpoints: Vendor base URLs
+            alpha: EWMA weight of the newest sample (0-1)
+            hedge_percentile: Recent-latency percentile after which a call is hedged
+            hedge_budget: Max hedged requests as a fraction of calls
+            hedge_min_samples: Latency samples needed before hedging starts
+        """
+        if not endpoints:
+            raise ValueError("VendorRouter needs at least one endpoint")
+        self.endpoints = [EndpointStats(url.rstrip("/"), alpha) for url in endpoints]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=500)  # recent successful latencies (s per size unit)
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> List[str]:
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def choose(self, exclude=()) -> Optional[EndpointStats]:
+        """
+        Pick an endpoint by power-of-two-choices.
+
+        Args:
+            exclude: URLs not to pick (already tried)
+
+        Returns:
+            EndpointStats, or None if every endpoint is excluded
+        """
+        with self._lock:
+            untried = [e for e in self.endpoints if e.url not in exclude]
+            available = [e for e in untried if e.breaker.state != OPEN]
+            candidates = available or untried
+            if not candidates:
+                return None
+            if len(candidates) == 1:
+                return candidates[0]
+            first, second = random.sample(candidates, 2)
+            return first if first.cost() <= second.cost() else second
+
+    def hedge_delay(self, size: float = 1.0) -> Optional[float]:
+        """
+        Return how long to wait before hedging a call.
+
+        Args:
+            size: Size units of the call (thousands of characters)
+
+        Returns:
+            Seconds (the hedge percentile of recent latencies per size unit,
+            times the call's size), or None while there are too few samples
+            to tell a slow call from a normal one
+        """
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = max(0, math.ceil(self.hedge_percentile / 100 * len(ordered)) - 1)
+        return ordered[index] * max(size, 1.0)
+
+    def _take_hedge_budget(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.hedge_budget * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    async def call(
+        self,
+        attempt: Callable[[str], Awaitable[T]],
+        is_retryable: Callable[[BaseException], bool] = lambda e: True,
+        hedge: bool = False,
+        size: float = 1.0
+    ) -> T:
+        """
+        Run attempt(url) on the best endpoint, failing over on errors.
+
+        Each endpoint is tried at most once per call.
+
+        Args:
+            attempt: Coroutine function taking an endpoint base URL
+            is_retryable: Whether an error should fail over to another endpoint
+            hedge: Send a duplicate to a second endpoint if the first one is
+                slower than the hedge percentile (within the hedge budget)
+            size: Size units of the call (thousands of characters), used to
+                normalize latency for hedging
+
+        Returns:
+            The first successful attempt's result
+
+        Raises:
+            The last attempt's exception if no endpoint succeeded
+        """
+        with self._lock:
+            self._calls += 1
+
+        async def run(endpoint: EndpointStats) -> T:
+            endpoint.in_flight += 1
+            try:
+                return await attempt(endpoint.url)
+            finally:
+                endpoint.in_flight -= 1
+
+        tried = set()
+        pending: Dict[asyncio.Task, tuple] = {}  # task -> (endpoint, start, is_hedge)
+        last_error: Optional[BaseException] = None
+        can_hedge = hedge and len(self.endpoints) > 1
+
+        def launch(endpoint: EndpointStats, is_hedge: bool = False) -> None:
+            tried.add(endpoint.url)
+            task = asyncio.ensure_future(run(endpoint))
+            pending[task] = (endpoint, time.perf_counter(), is_hedge)
+
+        try:
+            while True:
+                if not pending:
+                    endpoint = self.choose(exclude=tried)
+                    if endpoint is None:
+                        raise last_error
+                    launch(endpoint)
+
+                delay = self.hedge_delay(size) if can_hedge and len(pending) == 1 else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Slower than the hedge percentile: duplicate to another replica
+                    endpoint = self.choose(exclude=tried)
+                    if endpoint is not None and self._take_hedge_budget():
+                        logger.info(f"Hedging vendor call to {endpoint.url} after {delay:.2f}s")
+                        launch(endpoint, is_hedge=True)
+                    else:
+                        can_hedge = False
+                    continue
+
+                for task in done:
+                    endpoint, start, is_hedge = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        latency = (time.perf_counter() - start) / max(size, 1.0)
+                        endpoint.record(latency, ok=True)
+                        with self._lock:
+                            self._latencies.append(latency)
+                            self._hedge_wins += is_hedge
+                        return task.result()
+
+                    endpoint.record(None, ok=False)
+                    last_error = error
+                    if not is_retryable(error):
+                        raise error
+                    if len(tried) < len(self.endpoints) or pending:
+                        logger.warning(f"Vendor endpoint {endpoint.url} failed ({error}), failing over")
+        finally:
+            # Cancel the losing (or abandoned) requests
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return per-endpoint statistics and hedging counters for metrics."""
+        with self._lock:
+            calls, hedges, wins = self._calls, self._hedges, self._hedge_wins
+        return {
+            "endpoints": [endpoint.snapshot() for endpoint in self.endpoints],
+            "calls": calls,
+            "hedged_requests": hedges,
+            "hedge_wins": wins,
+            "hedge_delay_ms_per_unit": round((self.hedge_delay() or 0.0) * 1000, 1),
+        }